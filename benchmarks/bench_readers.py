@@ -0,0 +1,85 @@
+"""
+Сравнение скорости чтения файлов планов разными способами из plan_reader.READERS.
+Каждый способ читает только файлы своего формата: способы из EXTENSION_READERS - файлы с их расширениями,
+остальные - файлы xlsx. Ускорение считается относительно самого медленного способа для того же формата
+среди способов, прочитавших хотя бы один файл. Файлы, которые не удалось прочитать, считаются ошибками.
+
+Запуск из корня проекта: python -m benchmarks.bench_readers --repeat 3
+"""
+import argparse
+import glob
+import os
+import time
+
+from plan_parse import open_plan
+from plan_reader import EXTENSION_READERS, READERS
+
+# Расширение файлов для способов чтения, которых нет в EXTENSION_READERS
+DEFAULT_EXTENSION = '.xlsx'
+
+
+def reader_extensions(reader: str) -> tuple[str, ...]:
+    """Расширения файлов, которые читает способ чтения"""
+    extensions = tuple(extension for extension, name in EXTENSION_READERS.items() if name == reader)
+    return extensions or (DEFAULT_EXTENSION,)
+
+
+def time_reader(files: list[str], reader: str, repeat: int) -> tuple[float, int, list[str]]:
+    """
+    Возвращает лучшее время разбора всех файлов в секундах, количество прочитанных дисциплин
+    и ошибки файлов, которые не удалось прочитать
+    """
+    best = float('inf')
+    disciplines = 0
+    errors = []
+    for _ in range(repeat):
+        disciplines = 0
+        errors = []
+        start = time.perf_counter()
+        for file_path in files:
+            try:
+                disciplines += len(open_plan(file_path, reader, cache=None).disciplines)
+            except Exception as error:
+                errors.append(f'{file_path}: {type(error).__name__}: {error}')
+        best = min(best, time.perf_counter() - start)
+    return best, disciplines, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--plans', default='Plans', help='папка с файлами планов')
+    parser.add_argument('--repeat', type=int, default=3, help='сколько раз прочитать все файлы')
+    parser.add_argument('--readers', default=','.join(READERS), help='способы чтения через запятую')
+    parser.add_argument('--errors', action='store_true', help='вывести ошибки чтения файлов')
+    args = parser.parse_args()
+    unknown = [reader for reader in args.readers.split(',') if reader not in READERS]
+    if unknown:
+        parser.error(f"неизвестные способы чтения: {', '.join(unknown)}. Доступные способы: {', '.join(READERS)}")
+
+    all_files = sorted(glob.glob(os.path.join(args.plans, '**', '*'), recursive=True))
+    results = {}
+    for reader in args.readers.split(','):
+        extensions = reader_extensions(reader)
+        files = [file_path for file_path in all_files if file_path.lower().endswith(extensions)]
+        if files:
+            results[reader] = (extensions, len(files), *time_reader(files, reader, args.repeat))
+        else:
+            print(f"{reader:10} нет файлов {', '.join(extensions)}")
+
+    for reader, (extensions, count, seconds, disciplines, errors) in results.items():
+        # Способ, который не прочитал ни одного файла, быстро завершается с ошибками, и его время ничего не значит
+        if len(errors) < count:
+            slowest = max(result[2] for result in results.values()
+                          if result[0] == extensions and len(result[4]) < result[1])
+            speedup = f'x{slowest / seconds:.1f}'
+        else:
+            speedup = '-'
+        print(f"{reader:10} {', '.join(extensions):6} файлов: {count}, ошибок: {len(errors)}, {seconds:8.3f} с, "
+              f"{count / seconds:8.1f} файлов/с, дисциплин: {disciplines}, ускорение {speedup}")
+        if args.errors:
+            for error in errors:
+                print(f'    {error}')
+
+
+if __name__ == '__main__':
+    main()
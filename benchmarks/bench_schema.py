@@ -0,0 +1,105 @@
+"""
+Сравнение скорости соединения таблиц в All_data с индексами по внешним ключам и без них.
+
+Запуск из корня проекта: python -m benchmarks.bench_schema --copies 200
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from database import PlanDatabase
+from plan_import import find_plan_files
+from plan_parse import Plan, open_plan
+
+# Запросы, время выполнения которых сравнивается
+QUERIES = {
+    'all_data': 'SELECT COUNT(*) FROM (SELECT * FROM All_data)',
+    'one_plan': '''
+        SELECT COUNT(*) FROM Plan P
+             JOIN Discipline D ON P.id = D.plan_id
+             JOIN Semester S ON D.id = S.discipline_id
+             JOIN ControlForm CF ON S.control_form_id = CF.id
+        WHERE P.id = ?
+    ''',
+    'control_form': '''
+        SELECT CF.name, COUNT(*) FROM ControlForm CF
+             JOIN Semester S ON S.control_form_id = CF.id
+        GROUP BY CF.name
+    ''',
+}
+
+
+def load_plans(plans_dir: str) -> list[Plan]:
+    """Парсит все файлы с планами, которые удаётся обработать"""
+    plans = []
+    for file_path in find_plan_files(plans_dir):
+        try:
+            plans.append(open_plan(file_path))
+        except Exception:
+            pass
+    return plans
+
+
+def build_database(db_path: str, plans: list[Plan], copies: int):
+    """Создаёт БД, в которую каждый план вставлен copies раз"""
+    db = PlanDatabase(db_path, new_db=True, pragmas=PlanDatabase.BULK_PRAGMAS)
+    for _ in range(copies):
+        db.insert_plans(plans)
+    db.create_view()
+    db.close()
+
+
+def time_queries(db_path: str, repeat: int) -> dict[str, float]:
+    """Возвращает лучшее время выполнения каждого запроса в миллисекундах"""
+    conn = sqlite3.connect(db_path)
+    plan_count = conn.execute('SELECT COUNT(*) FROM Plan').fetchone()[0]
+    timings = {}
+    for name, sql in QUERIES.items():
+        params = (plan_count // 2,) if '?' in sql else ()
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best * 1000
+    conn.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--plans', default='Plans', help='папка с файлами планов')
+    parser.add_argument('--copies', type=int, default=100, help='сколько раз вставить каждый план')
+    parser.add_argument('--repeat', type=int, default=5, help='сколько раз выполнить каждый запрос')
+    args = parser.parse_args()
+
+    plans = load_plans(args.plans)
+    with tempfile.TemporaryDirectory() as tmp:
+        indexed = os.path.join(tmp, 'indexed.sqlite')
+        build_database(indexed, plans, args.copies)
+
+        # Та же БД, но без индексов, как в схеме версии 1
+        plain = os.path.join(tmp, 'plain.sqlite')
+        shutil.copy(indexed, plain)
+        conn = sqlite3.connect(plain)
+        for (index,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                                     "AND name NOT LIKE 'sqlite_autoindex%'").fetchall():
+            conn.execute(f'DROP INDEX {index}')
+        conn.commit()
+        semesters = conn.execute('SELECT COUNT(*) FROM Semester').fetchone()[0]
+        conn.close()
+
+        print(f'Планов: {len(plans) * args.copies}, строк в Semester: {semesters}')
+        without_indexes = time_queries(plain, args.repeat)
+        with_indexes = time_queries(indexed, args.repeat)
+        for name in QUERIES:
+            speedup = without_indexes[name] / with_indexes[name] if with_indexes[name] else float('inf')
+            print(f'{name:15} без индексов {without_indexes[name]:9.2f} мс, '
+                  f'с индексами {with_indexes[name]:9.2f} мс, ускорение x{speedup:.1f}')
+
+
+if __name__ == '__main__':
+    main()
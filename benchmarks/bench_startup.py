@@ -0,0 +1,114 @@
+"""
+Замер времени запуска приложения: импорт модулей окна, создание и первый показ MainWindow,
+а также запуск консольного интерфейса. Каждый замер выполняется в новом процессе,
+результат сравнивается с допустимым временем, и при превышении скрипт завершается с кодом 1.
+
+Запуск из корня проекта: python -m benchmarks.bench_startup --repeat 5 --window-budget 800
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Корень проекта, откуда импортируются модули приложения
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Допустимое время каждого замера в миллисекундах по умолчанию
+BUDGETS = {'window': 800.0, 'cli': 400.0}
+
+
+def child():
+    """Запуск окна в дочернем процессе. Время этапов выводится в stdout в JSON"""
+    start = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+
+    from interface.MainWindow import MainWindow
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    window = MainWindow()
+    created = time.perf_counter()
+    window.show()
+    app.processEvents()
+    shown = time.perf_counter()
+    print(json.dumps({
+        'import': (imported - start) * 1000,
+        'create': (created - imported) * 1000,
+        'window': (shown - start) * 1000,
+    }))
+
+
+def run_window(work_dir: str) -> dict[str, float]:
+    """Запускает окно в новом процессе и возвращает время этапов и всего процесса в миллисекундах"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # Без дисплея окно показывается во внеэкранном режиме
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_startup', '--child'], cwd=work_dir,
+                            env=env, capture_output=True, text=True, check=True).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings['process'] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def run_cli(work_dir: str) -> float:
+    """Время выполнения простой команды консольного интерфейса от запуска процесса до выхода"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, 'cli.py'), 'columns'], cwd=work_dir,
+                   capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='сколько раз запустить каждый замер')
+    parser.add_argument('--db', help='БД, с которой запускается окно (по умолчанию новая пустая БД)')
+    parser.add_argument('--window-budget', type=float, default=BUDGETS['window'],
+                        help='допустимое время от начала импорта до показа окна, мс')
+    parser.add_argument('--cli-budget', type=float, default=BUDGETS['cli'],
+                        help='допустимое время выполнения команды cli.py columns, мс')
+    parser.add_argument('--output', help='файл JSON для сохранения результатов')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    samples: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.db:
+            shutil.copy(args.db, os.path.join(work_dir, 'planDB.sqlite'))
+        for _ in range(args.repeat):
+            for name, value in run_window(work_dir).items():
+                samples.setdefault(name, []).append(value)
+            samples.setdefault('cli', []).append(run_cli(work_dir))
+
+    budgets = {'window': args.window_budget, 'cli': args.cli_budget}
+    results = {}
+    over_budget = []
+    for name, values in samples.items():
+        median = statistics.median(values)
+        results[name] = {'median': median, 'min': min(values), 'budget': budgets.get(name)}
+        status = ''
+        if name in budgets:
+            status = f'(лимит {budgets[name]:.0f} мс: ' + ('превышен)' if median > budgets[name] else 'ок)')
+            if median > budgets[name]:
+                over_budget.append(name)
+        print(f'{name:10} медиана {median:8.1f} мс, минимум {min(values):8.1f} мс {status}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'repeat': args.repeat, 'results': results}, file, ensure_ascii=False, indent=2)
+    if over_budget:
+        print(f"Превышено допустимое время: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Набор замеров скорости всей цепочки: разбор файлов планов, вставка в БД, запросы к All_data,
+экспорт и показ результата в таблице. Замеры выполняются на синтетических планах из generate_plans
+(или на файлах из папки --plans), результат сохраняется в JSON и может сравниваться с прошлым запуском.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_suite --files 20 --disciplines 200 --output results.json
+    python -m benchmarks.bench_suite --output new.json --compare results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.generate_plans import generate_plans
+from connection import ConnectionManager
+from database import PlanDatabase
+from discipline_match import DisciplineIndex
+from export import FORMATS, export_rows, iter_query_rows
+from plan_cache import PlanCache
+from plan_diff import diff_plans
+from plan_import import find_plan_files
+from plan_parse import Plan, open_plan
+from query_builder import COLUMNS, QueryFilter, build_query, column_types
+from search import build_search_query
+
+# Версия формата файла с результатами
+RESULTS_VERSION = 1
+
+
+def measure(func: Callable[[], int], repeat: int) -> dict[str, float]:
+    """
+    Выполняет func repeat раз. func возвращает количество обработанных элементов (файлов, строк).
+    Возвращает лучшее и среднее время в секундах и скорость по лучшему времени
+    """
+    times = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = func()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        'best': best,
+        'mean': sum(times) / len(times),
+        'items': items,
+        'per_second': items / best if best else 0.0,
+    }
+
+
+def parse_files(file_paths: list[str], cache: PlanCache | None) -> list[Plan]:
+    plans = []
+    for file_path in file_paths:
+        try:
+            plans.append(open_plan(file_path, cache=cache))
+        except Exception:
+            pass
+    return plans
+
+
+def build_database(db_path: str, plans: list[Plan], materialized: bool) -> int:
+    """Создаёт БД с переданными планами и возвращает количество строк в Semester"""
+    db = PlanDatabase(db_path, new_db=True, pragmas=PlanDatabase.BULK_PRAGMAS, materialized=materialized)
+    db.insert_plans(plans)
+    db.create_view()
+    count = db.conn.execute('SELECT COUNT(*) FROM Semester').fetchone()[0]
+    db.close()
+    return count
+
+
+def run_query(db_path: str, sql: str, params: list) -> int:
+    conn = sqlite3.connect(db_path)
+    count = len(conn.execute(sql, params).fetchall())
+    conn.close()
+    return count
+
+
+def run_export(db_path: str, file_path: str, sql: str, params: list) -> int:
+    conn = sqlite3.connect(db_path)
+    headers = [header for header, _, _ in COLUMNS]
+    count = export_rows(file_path, headers, iter_query_rows(conn, sql, params),
+                        types=column_types(list(range(len(COLUMNS)))))
+    conn.close()
+    return count
+
+
+def run_compare(db_path: str) -> int:
+    """Построение индекса одинаковых дисциплин и матрицы сравнения всех видов часов по всем планам"""
+    conn = sqlite3.connect(db_path)
+    index = DisciplineIndex(conn)
+    index.matrix()
+    conn.close()
+    return len(index.row_ids)
+
+
+def run_diff(plans: list[Plan]) -> int:
+    """Сравнение каждого плана со следующим, как при сравнении архива версий"""
+    for old, new in zip(plans, plans[1:]):
+        diff_plans(old, new)
+    return sum(len(plan.disciplines) for plan in plans)
+
+
+def run_validate(db_path: str) -> int:
+    """Проверка часов всех планов в БД, как при validate --revalidate. Количество - проверенные дисциплины"""
+    db = PlanDatabase(db_path)
+    db.validate()
+    count = db.conn.execute('SELECT COUNT(*) FROM Discipline').fetchone()[0]
+    db.close()
+    return count
+
+
+def run_render(db_path: str) -> int:
+    """Чтение всех ячеек через модель таблицы главного окна, как при прокрутке таблицы до конца"""
+    from PyQt6.QtCore import QCoreApplication
+
+    from interface.ResultTableModel import ResultTableModel
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    connections = ConnectionManager(db_path)
+    # Модель читает страницы по ключу строки, поэтому запрос строится с ключом, как в главном окне
+    sql, params = build_query(list(range(len(COLUMNS))), keys=True)
+    model = ResultTableModel(connections, sql, params, [header for header, _, _ in COLUMNS])
+    for row in range(model.rowCount()):
+        for col in range(model.columnCount()):
+            model.data(model.index(row, col))
+    count = model.rowCount()
+    del model
+    connections.close()
+    del app
+    return count
+
+
+def run_suite(file_paths: list[str], tmp: str, repeat: int) -> dict[str, dict[str, float]]:
+    """Выполняет все замеры и возвращает их результаты по именам"""
+    results: dict[str, dict[str, float]] = {}
+
+    # Разбор: без сохранённых результатов и с ними
+    results['parse'] = measure(lambda: len(parse_files(file_paths, None)), repeat)
+    cache = PlanCache(os.path.join(tmp, 'cache'))
+    plans = parse_files(file_paths, cache)
+    results['parse_cached'] = measure(lambda: len(parse_files(file_paths, cache)), repeat)
+
+    # Вставка в БД: количество строк Semester в секунду
+    db_path = os.path.join(tmp, 'bench.sqlite')
+    flat_path = os.path.join(tmp, 'bench_flat.sqlite')
+    results['ingest'] = measure(lambda: build_database(db_path, plans, False), repeat)
+    results['ingest_materialized'] = measure(lambda: build_database(flat_path, plans, True), repeat)
+
+    # Запросы: всё представление, все столбцы через построитель запросов и отбор по форме контроля
+    all_columns = list(range(len(COLUMNS)))
+    query_filter = QueryFilter(sem_from=2, sem_to=5, control_form='Экзамен')
+    queries = {
+        'query_all_data': ('SELECT * FROM All_data', [], db_path),
+        'query_builder': (*build_query(all_columns), db_path),
+        'query_filtered': (*build_query(all_columns, query_filter), db_path),
+        'query_flat': (*build_query(all_columns, flat=True), flat_path),
+        'query_flat_filtered': (*build_query(all_columns, query_filter, flat=True), flat_path),
+    }
+    search_sql, search_params = build_search_query('математика', limit=None)
+    queries['query_search'] = (search_sql, search_params, db_path)
+    for name, (sql, params, path) in queries.items():
+        results[name] = measure(lambda: run_query(path, sql, params), repeat)
+
+    # Экспорт всех строк в каждый доступный формат
+    sql, params = build_query(all_columns)
+    for file_format in FORMATS:
+        file_path = os.path.join(tmp, f'export.{file_format}')
+        try:
+            results[f'export_{file_format}'] = measure(lambda: run_export(db_path, file_path, sql, params), repeat)
+        except ValueError as error:
+            # Для parquet нужен необязательный пакет pyarrow
+            print(f'export_{file_format} пропущен: {error}', file=sys.stderr)
+
+    # Сопоставление дисциплин всех планов и матрица сравнения часов, если установлен numpy
+    try:
+        results['compare'] = measure(lambda: run_compare(db_path), repeat)
+    except ValueError as error:
+        print(f'compare пропущен: {error}', file=sys.stderr)
+
+    # Проверка часов всех планов правилами из validation
+    results['validate'] = measure(lambda: run_validate(db_path), repeat)
+
+    # Сравнение версий планов по дисциплинам
+    results['diff'] = measure(lambda: run_diff(plans), repeat)
+
+    # Показ в таблице главного окна, если установлен PyQt6
+    try:
+        results['render'] = measure(lambda: run_render(db_path), repeat)
+    except ImportError as error:
+        print(f'render пропущен: {error}', file=sys.stderr)
+
+    return results
+
+
+def environment() -> dict[str, str]:
+    """Сведения о машине и версиях, от которых зависят результаты"""
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: dict[str, dict[str, float]], old_path: str):
+    """Печатает изменение лучшего времени каждого замера относительно прошлого запуска"""
+    with open(old_path, encoding='utf-8') as file:
+        old = json.load(file)
+    print(f"\nСравнение с {old_path} ({old.get('date', '?')}):")
+    for name, result in results.items():
+        if name not in old['results']:
+            print(f'{name:22} нет в прошлом запуске')
+            continue
+        old_best = old['results'][name]['best']
+        change = (result['best'] / old_best - 1) * 100 if old_best else 0.0
+        print(f"{name:22} {old_best * 1000:10.2f} мс -> {result['best'] * 1000:10.2f} мс ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--plans', help='папка с настоящими файлами планов вместо сгенерированных')
+    parser.add_argument('--files', type=int, default=20, help='количество сгенерированных файлов')
+    parser.add_argument('--disciplines', type=int, default=100, help='количество дисциплин в каждом файле')
+    parser.add_argument('--semesters', type=int, default=8, help='количество семестров')
+    parser.add_argument('--seed', type=int, default=0, help='начальное значение генератора планов')
+    parser.add_argument('--repeat', type=int, default=3, help='сколько раз выполнить каждый замер')
+    parser.add_argument('--output', help='файл JSON для сохранения результатов')
+    parser.add_argument('--compare', help='файл JSON с результатами прошлого запуска для сравнения')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.plans:
+            file_paths = find_plan_files(args.plans)
+        else:
+            file_paths = generate_plans(os.path.join(tmp, 'plans'), args.files, args.disciplines,
+                                        args.semesters, args.seed)
+        results = run_suite(file_paths, tmp, args.repeat)
+
+    print(f'Файлов: {len(file_paths)}')
+    for name, result in results.items():
+        print(f"{name:22} {result['best'] * 1000:10.2f} мс, "
+              f"{result['items']:8} шт., {result['per_second']:12.1f} шт./с")
+
+    report = {
+        'version': RESULTS_VERSION,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'parameters': {
+            'plans': args.plans,
+            'files': len(file_paths),
+            'disciplines': None if args.plans else args.disciplines,
+            'semesters': None if args.plans else args.semesters,
+            'seed': None if args.plans else args.seed,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
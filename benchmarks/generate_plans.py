@@ -0,0 +1,160 @@
+"""
+Генератор синтетических файлов учебных планов .plx.xlsx с листами 'Титул' и 'План'
+в том расположении, которое ожидает Plan. Содержимое случайное, но зависит только от seed,
+поэтому при одинаковых параметрах получаются одинаковые планы.
+
+Запуск из корня проекта: python -m benchmarks.generate_plans out_dir --files 20 --disciplines 200 --semesters 8
+"""
+import argparse
+import os
+import random
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import coordinate_to_tuple
+
+from plan_parse import Plan
+
+# Столбцы с формами контроля в строке заголовков, в порядке Plan.CONTROL_FORM_COLS
+CONTROL_FORM_TITLES = ('Экза мен', 'Зачет', 'Зачет с оц.', 'КП', 'КР', 'Др')
+TOTAL_TITLES = ('Экспер тное', 'По плану', 'С преп.', 'ИП', 'СР', 'ПАтт', 'Обяз. часть', 'Вар. часть')
+SEMESTER_TITLES = ('Итого', 'Лек', 'Лаб', 'Пр', 'КРП', 'ИП', 'СР', 'Конс', 'ПАтт')
+# Номера семестров в столбцах форм контроля записываются цифрами подряд, поэтому семестров не больше 9
+MAX_SEMESTERS = 9
+
+NAMES = ('Математика', 'Физика', 'Информатика', 'История', 'Экономика', 'Философия', 'Иностранный язык',
+         'Программирование', 'Базы данных', 'Сети', 'Бухгалтерский учет', 'Статистика', 'Право', 'Менеджмент')
+SECTIONS = ('ОП', 'ПМ', 'ОГСЭ', 'ЕН')
+
+
+def title_rows(rng: random.Random, number: int) -> dict[str, str]:
+    """Значения ячеек титульного листа из Plan.TITLE_CELLS"""
+    name = f'Направление {number}'
+    return {
+        'D27': f'{rng.randint(1, 57):02}.02.{rng.randint(1, 20):02}',
+        # После слова 'Профиль' идут ещё 9 слов, и только затем название профиля
+        'D29': f'{name} \nПрофиль получаемого профессионального образования при реализации программы '
+               f'основного общего образования: профиль {number % 5}',
+        'D37': f'Кафедра {number % 7}',
+        'D38': f'Факультет {number % 3}',
+        'C40': f'Квалификация: квалификация {number % 4}',
+        'W40': str(2015 + number % 10),
+        'C42': 'Форма обучения: ' + rng.choice(('Очная', 'Заочная', 'Очно-заочная')),
+        'W42': f' № {rng.randint(100, 2000)} от 09.12.2016',
+        'C44': 'Уровень образования, необходимый для приема на обучение: основное общее образование',
+    }
+
+
+def discipline_row(rng: random.Random, ind: str, semesters: int) -> list:
+    """Строка дисциплины: формы контроля, общие часы и часы по семестрам. Числа хранятся строками, как в файлах .plx"""
+    first = rng.randint(1, semesters)
+    nums = list(range(first, min(semesters, first + rng.randint(0, 2)) + 1))
+    control_forms = [''] * len(CONTROL_FORM_TITLES)
+    semester_cols: list = [None] * (semesters * len(SEMESTER_TITLES))
+    sums = [0] * len(SEMESTER_TITLES)
+    for num in nums:
+        lek, lab, pr = rng.randint(10, 60), rng.choice((0, rng.randint(4, 30))), rng.randint(0, 40)
+        krp, ip, sr, cons, patt = rng.choice((0, 20)), rng.choice((0, 4)), rng.randint(0, 20), 0, rng.randint(0, 8)
+        hours = [lek + lab + pr + krp + ip + sr + cons + patt, lek, lab, pr, krp, ip, sr, cons, patt]
+        sums = [a + b for a, b in zip(sums, hours)]
+        start = (num - 1) * len(SEMESTER_TITLES)
+        semester_cols[start:start + len(hours)] = [str(value) if value else None for value in hours]
+        # Основная форма контроля и иногда курсовая работа в том же семестре
+        for col in {rng.randrange(3)} | ({4} if rng.random() < 0.1 else set()):
+            control_forms[col] += str(num)
+
+    total, lek, lab, pr, krp, ip, sr, cons, patt = sums
+    totals = [total, total, total - ip - sr, ip, sr, patt, total, None]
+    return (['+', ind, f'{rng.choice(NAMES)} {ind}'] + [value or None for value in control_forms]
+            + [str(value) if value else None for value in totals] + semester_cols)
+
+
+def generate_plan(file_path: str, disciplines: int = 60, semesters: int = 8, seed: int = 0, number: int = 0):
+    """
+    Записывает один файл плана с disciplines дисциплинами в semesters семестрах.
+    Дисциплины разбиты на разделы и группы, строки которых выделены жирным, как в настоящих планах
+    """
+    if not 1 <= semesters <= MAX_SEMESTERS:
+        raise ValueError(f'Количество семестров должно быть от 1 до {MAX_SEMESTERS}')
+    rng = random.Random(f'{seed}:{number}')
+    wb = openpyxl.Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    title = wb.create_sheet(Plan.TITLE_SHEET)
+    cells = {coordinate_to_tuple(coord): value for coord, value in title_rows(rng, number).items()}
+    for row_num in range(1, max(row for row, _ in cells) + 1):
+        row: list = [None] * max(col for _, col in cells)
+        for (cell_row, col), value in cells.items():
+            if cell_row == row_num:
+                row[col - 1] = value
+        title.append(row)
+
+    sheet = wb.create_sheet(Plan.PLAN_SHEET)
+    width = Plan.SEMESTERS_START_COL + semesters * len(SEMESTER_TITLES)
+    courses: list = [None] * width
+    terms: list = [None] * width
+    for num in range(1, semesters + 1):
+        col = Plan.SEMESTERS_START_COL + (num - 1) * len(SEMESTER_TITLES)
+        terms[col] = f'Семестр {num}'
+        if num % 2:
+            courses[col] = f'Курс {(num + 1) // 2}'
+    courses[:3] = ['-', '-', '-']
+    courses[3], courses[9], courses[15] = 'Форма контроля', 'Итого акад.часов', 'Объём ОП'
+    sheet.append(courses)
+    sheet.append(terms)
+    sheet.append(['Считать в плане', 'Индекс', 'Наименование', *CONTROL_FORM_TITLES, *TOTAL_TITLES]
+                 + list(SEMESTER_TITLES) * semesters)
+
+    def bold_row(values: list) -> list:
+        result = []
+        for value in values:
+            cell = WriteOnlyCell(sheet, value)
+            cell.font = bold
+            result.append(cell)
+        return result
+
+    # Строки 4 и 5 в настоящих планах - итоги по разделам, дисциплины начинаются с Plan.FIRST_ROW
+    sheet.append(bold_row(['ИТОГО']))
+    sheet.append(bold_row(['ИТОГО по циклам']))
+    written = 0
+    group = 0
+    while written < disciplines:
+        section = SECTIONS[group % len(SECTIONS)]
+        group += 1
+        sheet.append(bold_row([f'{section}.Раздел {group}']))
+        sheet.append(bold_row(['+', f'{section}.{group:02}', f'Группа дисциплин {group}']))
+        for item in range(1, min(rng.randint(5, 15), disciplines - written) + 1):
+            sheet.append(discipline_row(rng, f'{section}.{group:02}.{item:02}', semesters))
+            written += 1
+
+    wb.save(file_path)
+
+
+def generate_plans(out_dir: str, files: int = 10, disciplines: int = 60, semesters: int = 8,
+                   seed: int = 0) -> list[str]:
+    """Записывает files файлов планов в папку out_dir и возвращает пути к ним"""
+    os.makedirs(out_dir, exist_ok=True)
+    file_paths = []
+    for number in range(files):
+        file_path = os.path.join(out_dir, f'synthetic_{seed}_{number:04}.plx.xlsx')
+        generate_plan(file_path, disciplines, semesters, seed, number)
+        file_paths.append(file_path)
+    return file_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('out_dir', help='папка для сгенерированных файлов')
+    parser.add_argument('--files', type=int, default=10, help='количество файлов')
+    parser.add_argument('--disciplines', type=int, default=60, help='количество дисциплин в каждом файле')
+    parser.add_argument('--semesters', type=int, default=8, help=f'количество семестров (до {MAX_SEMESTERS})')
+    parser.add_argument('--seed', type=int, default=0, help='начальное значение генератора случайных чисел')
+    args = parser.parse_args()
+
+    file_paths = generate_plans(args.out_dir, args.files, args.disciplines, args.semesters, args.seed)
+    print(f'Создано файлов: {len(file_paths)} в папке {args.out_dir}')
+
+
+if __name__ == '__main__':
+    main()
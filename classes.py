@@ -1,5 +1,7 @@
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Iterator, Sequence
 
 
 class ControlForm(Enum):
@@ -13,7 +15,7 @@ class ControlForm(Enum):
     NO = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TotalHours:
     """Класс, в котором хранится общее количество часов за все семестры по одной дисциплне"""
     # Кол-во необходимых часов по экспертному мнению
@@ -30,14 +32,14 @@ class TotalHours:
     patt: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RequiredHours:
     """Класс с объёмом ОП"""
     important: int
     not_important: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Semester:
     """Класс, в котором хранится вся информация об одном семестре"""
     # Номер семестра
@@ -60,12 +62,23 @@ class Semester:
     cons: int
     # Количество часов выделенных на предпрофессиональную аттестацию
     patt: int
-    # Какая будет форма контроля
-    control_form: ControlForm
+    # Все формы контроля в семестре, например экзамен и курсовой проект
+    control_forms: list[ControlForm] = field(default_factory=list)
+
+    def __post_init__(self):
+        # Раньше последним полем была одна форма контроля: Semester(num, ..., ControlForm.EKZ) работает как прежде
+        if isinstance(self.control_forms, ControlForm):
+            self.control_forms = [] if self.control_forms is ControlForm.NO else [self.control_forms]
+
+    @property
+    def control_form(self) -> ControlForm:
+        """Основная форма контроля: первая из форм контроля семестра"""
+        return self.control_forms[0] if self.control_forms else ControlForm.NO
 
 
 class Discipline:
     """Класс, в котором хранится вся информация об одной дисциплине"""
+    __slots__ = ('in_plan', 'ind', 'name', 'total_hours', 'required', 'semesters')
 
     def __init__(self, in_plan: bool, ind: str, name: str,
                  total_hours: TotalHours, required: RequiredHours, semesters: list[Semester]):
@@ -85,3 +98,139 @@ class Discipline:
     def __str__(self):
         return (f'{self.in_plan} {self.ind} {self.name} {self.total_hours}'
                 f'{self.required} {self.semesters}')
+
+
+class PlanHours(Sequence[Discipline]):
+    """
+    Компактное хранение всех дисциплин одного плана в массивах чисел вместо отдельных объектов.
+    Часы семестров лежат в матрице дисциплины x семестры x виды часов, рядом - массив форм контроля.
+    Объекты Discipline и Semester создаются только при обращении к дисциплине, поэтому
+    план можно использовать как обычный список дисциплин
+    """
+    __slots__ = ('in_plan', 'inds', 'names', 'totals', 'hours', 'control_forms', 'semester_count')
+
+    # Виды часов в семестре, в порядке полей Semester
+    SEMESTER_FIELDS = ('total', 'lek', 'lab', 'pr', 'krp', 'ip', 'sr', 'cons', 'patt')
+    # Количество общих часов дисциплины: 6 из TotalHours и 2 из RequiredHours
+    TOTAL_FIELDS = 8
+    # Тип чисел в массивах часов и допустимые значения часов: четырёхбайтовые целые
+    HOURS_TYPE = 'i'
+    MAX_HOURS = 2 ** (8 * array(HOURS_TYPE).itemsize - 1) - 1
+    MIN_HOURS = -MAX_HOURS
+    # Значение вместо None в массивах часов, меньше любого допустимого значения
+    EMPTY = MIN_HOURS - 1
+    # Значение в массиве форм контроля для семестров, в которых дисциплины нет
+    NO_SEMESTER = -1
+
+    def __init__(self, disciplines: list[Discipline] = ()):
+        # Считать ли в плане
+        self.in_plan = array('b')
+        # Индексы и названия дисциплин
+        self.inds: list[str] = []
+        self.names: list[str] = []
+        # Общие часы и объём ОП: по TOTAL_FIELDS чисел на дисциплину
+        self.totals = array(self.HOURS_TYPE)
+        # Номер последнего семестра, по нему выделяется место под семестры каждой дисциплины
+        self.semester_count = max((semester.num for discipline in disciplines
+                                   for semester in discipline.semesters), default=0)
+        # Часы семестров: по semester_count * len(SEMESTER_FIELDS) чисел на дисциплину
+        self.hours = array(self.HOURS_TYPE)
+        # Формы контроля: по semester_count битовых масок на дисциплину (бит value - 1 для каждой формы),
+        # 0 - без формы контроля
+        self.control_forms = array('b')
+        for discipline in disciplines:
+            self.append(discipline)
+
+    def __pack(self, values) -> list[int]:
+        """Часы для массива: None заменяется на EMPTY, остальные значения должны быть целыми в допустимых пределах"""
+        packed = []
+        for value in values:
+            if value is None:
+                packed.append(self.EMPTY)
+            elif isinstance(value, int) and self.MIN_HOURS <= value <= self.MAX_HOURS:
+                packed.append(value)
+            else:
+                raise ValueError(f'Недопустимое количество часов: {value!r}, '
+                                 f'ожидается целое число от {self.MIN_HOURS} до {self.MAX_HOURS}')
+        return packed
+
+    def __unpack(self, values) -> list[int | None]:
+        return [None if value == self.EMPTY else value for value in values]
+
+    def append(self, discipline: Discipline):
+        """Добавляет дисциплину. Семестры с номером больше semester_count не поместятся в матрицу"""
+        width = len(self.SEMESTER_FIELDS)
+        self.in_plan.append(bool(discipline.in_plan))
+        self.inds.append(discipline.ind)
+        self.names.append(discipline.name)
+        total, required = discipline.total_hours, discipline.required
+        self.totals.extend(self.__pack((total.expert, total.plan, total.with_teacher, total.ip, total.sr, total.patt,
+                                        required.important, required.not_important)))
+        hours = [self.EMPTY] * (self.semester_count * width)
+        control_forms = [self.NO_SEMESTER] * self.semester_count
+        for semester in discipline.semesters:
+            if not 0 < semester.num <= self.semester_count:
+                raise ValueError(f'Номер семестра {semester.num} вне диапазона 1..{self.semester_count}')
+            start = (semester.num - 1) * width
+            hours[start:start + width] = self.__pack(getattr(semester, name) for name in self.SEMESTER_FIELDS)
+            control_forms[semester.num - 1] = sum(1 << (form.value - 1) for form in set(semester.control_forms)
+                                                  if form.value is not None)
+        self.hours.extend(hours)
+        self.control_forms.extend(control_forms)
+
+    def __len__(self) -> int:
+        return len(self.inds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.discipline(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Номер дисциплины вне диапазона')
+        return self.discipline(index)
+
+    def totals_row(self, index: int) -> list[int | None]:
+        """Общие часы дисциплины и объём ОП в порядке полей TotalHours и RequiredHours"""
+        return self.__unpack(self.totals[index * self.TOTAL_FIELDS:(index + 1) * self.TOTAL_FIELDS])
+
+    def count_semesters(self) -> int:
+        """Количество семестров всех дисциплин, то есть строк, которые попадут в таблицу Semester"""
+        return len(self.control_forms) - self.control_forms.count(self.NO_SEMESTER)
+
+    def semester_rows(self, index: int) -> Iterator[tuple]:
+        """
+        Возвращает семестры дисциплины без создания объектов: значения форм контроля по возрастанию,
+        номер семестра и часы в порядке SEMESTER_FIELDS
+        """
+        width = len(self.SEMESTER_FIELDS)
+        for sem in range(self.semester_count):
+            mask = self.control_forms[index * self.semester_count + sem]
+            if mask == self.NO_SEMESTER:
+                continue
+            control_forms = tuple(bit + 1 for bit in range(mask.bit_length()) if mask >> bit & 1)
+            start = (index * self.semester_count + sem) * width
+            yield (control_forms, sem + 1, *self.__unpack(self.hours[start:start + width]))
+
+    def discipline(self, index: int) -> Discipline:
+        """Создаёт объект Discipline с семестрами для дисциплины с номером index"""
+        totals = self.totals_row(index)
+        semesters = [Semester(num, *hours, [ControlForm(value) for value in control_forms])
+                     for control_forms, num, *hours in self.semester_rows(index)]
+        return Discipline(bool(self.in_plan[index]), self.inds[index], self.names[index],
+                          TotalHours(*totals[:6]), RequiredHours(*totals[6:]), semesters)
+
+
+@dataclass(slots=True)
+class SourceFile:
+    """Класс, в котором хранится информация о файле, из которого был загружен план"""
+    # Полный путь к файлу
+    path: str
+    # Размер файла в байтах
+    size: int
+    # Время последнего изменения файла
+    mtime: float
+    # Хэш содержимого файла
+    hash: str
+    # id плана в БД, загруженного из этого файла
+    plan_id: int | None = None
@@ -0,0 +1,402 @@
+"""
+Консольный интерфейс для работы с БД учебных планов без графического интерфейса.
+
+Примеры:
+    python cli.py --db planDB.sqlite import Plans --workers 4 --incremental
+    python cli.py scan Plans --duplicates
+    python cli.py columns
+    python cli.py --db planDB.sqlite search "информационные технологии"
+    python cli.py --db planDB.sqlite compare --folder Plans/9 --folder Plans/11 --hours lek
+    python cli.py diff Plans/11/Б_38.02.07_2021_12.osf.xls "Plans/9/Б_38.02.07_2021_123_обн -.plx.xlsx"
+    python cli.py diff --archive Plans --output changes.csv
+    python cli.py --db planDB.sqlite validate --rule semester_total --output findings.xlsx
+    python cli.py --db planDB.sqlite query --columns name,discipline,semester,control_form --sem-from 3
+    python cli.py --db planDB.sqlite export result.xlsx --columns name,cod,discipline --facultet "..."
+"""
+import argparse
+import os
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from connection import DEFAULT_BUSY_TIMEOUT, DEFAULT_CACHE_SIZE, DEFAULT_MMAP_SIZE, get_connections
+from database import PlanDatabase
+from discipline_match import HOUR_TYPES, MATCH_KEYS, DisciplineIndex, plans_in_folders
+from export import FORMATS, export_rows, iter_query_rows
+from query_builder import COLUMNS, QueryFilter, build_query, column_types
+from search import SEARCH_HEADERS, build_search_query
+from validation import FINDING_HEADERS, FINDING_TYPES, RULE_NAMES, build_findings_query, summarize_findings
+
+if TYPE_CHECKING:
+    # Разбор файлов нужен только командам import и scan и загружается в них
+    from plan_import import ImportResult
+
+
+def parse_columns(spec: str) -> list[int]:
+    """
+    Получение номеров столбцов из строки через запятую. Столбец можно указать номером
+    или именем из вывода команды columns
+    """
+    names = {column[2]: ind for ind, column in enumerate(COLUMNS)}
+    columns = []
+    for item in spec.split(','):
+        item = item.strip()
+        if item.isdigit() and int(item) < len(COLUMNS):
+            columns.append(int(item))
+        elif item in names:
+            columns.append(names[item])
+        else:
+            raise argparse.ArgumentTypeError(f'Неизвестный столбец: {item}')
+    return columns
+
+
+def selected_columns(args: argparse.Namespace) -> list[int]:
+    """Номера выбранных столбцов, без указания столбцов выбираются все"""
+    return args.columns or list(range(len(COLUMNS)))
+
+
+def get_query(args: argparse.Namespace, materialized: bool) -> tuple[list[str], str, list]:
+    """Построение запроса по выбранным столбцам и фильтрам из аргументов командной строки"""
+    columns = selected_columns(args)
+    query_filter = QueryFilter(
+        facultet=args.facultet,
+        start_year=args.year,
+        cod=args.cod,
+        sem_from=args.sem_from,
+        sem_to=args.sem_to,
+        control_form=args.control_form,
+    )
+    sql, params = build_query(columns, query_filter, materialized)
+    if args.limit is not None:
+        sql += f'\n    LIMIT {args.limit}'
+    return [COLUMNS[col][0] for col in columns], sql, params
+
+
+def print_result(result: 'ImportResult'):
+    if result.unchanged:
+        status = 'без изменений'
+    elif result.deleted:
+        status = 'удалён'
+    elif result.ok:
+        status = f'{result.plan.name} {result.plan.start_year}'
+    else:
+        status = f'ошибка: {result.error}'
+    print(f'{result.file_path}: {status}', file=sys.stderr)
+
+
+def command_import(args: argparse.Namespace) -> int:
+    from plan_import import PlanImporter
+
+    db = None
+    known = None
+    if args.dry_run:
+        # Пробный запуск только разбирает файлы: БД не открывается на запись, поэтому её схема не меняется.
+        # Для инкрементального запуска записи о файлах читаются через читающее соединение
+        known = {}
+        if args.incremental and not args.new_db and os.path.exists(args.db):
+            with get_connections(args.db).reader() as conn:
+                known = PlanDatabase.read_source_files(conn)
+    else:
+        db = PlanDatabase(args.db, new_db=args.new_db, pragmas=PlanDatabase.BULK_PRAGMAS,
+                          materialized=True if args.materialized else None)
+    importer = PlanImporter(db, workers=args.workers, dry_run=args.dry_run, use_cache=not args.no_cache,
+                            profile=args.profile, trace_memory=args.trace_memory)
+    start = time.perf_counter()
+    results = importer.import_directory(args.path, print_result, incremental=args.incremental, known=known)
+    if db is not None:
+        with importer.report.phase('create_view'):
+            db.create_view()
+        db.close()
+    if args.metrics:
+        importer.report.save(args.metrics)
+
+    errors = sum(not result.ok for result in results)
+    print(f'Обработано файлов: {len(results)}, ошибок: {errors}, '
+          f'время: {time.perf_counter() - start:.2f} с' + (' (пробный запуск)' if args.dry_run else ''),
+          file=sys.stderr)
+    return 1 if errors else 0
+
+
+# Атрибуты плана, которые выводит команда scan, и атрибуты, по которым ищутся повторяющиеся планы
+SCAN_FIELDS = ('cod', 'name', 'profile', 'start_year', 'edu_form')
+
+
+def command_scan(args: argparse.Namespace) -> int:
+    from plan_import import scan_plans
+
+    results = scan_plans(args.path, workers=args.workers, use_cache=not args.no_cache)
+    plans = [result for result in results if result.ok]
+    for result in results:
+        if not result.ok:
+            print(f'{result.file_path}: ошибка: {result.error}', file=sys.stderr)
+
+    if args.duplicates:
+        # Планы с одинаковыми атрибутами из SCAN_FIELDS выводятся группами, разделёнными пустой строкой
+        groups: dict[tuple, list['ImportResult']] = {}
+        for result in plans:
+            groups.setdefault(tuple(getattr(result.plan, name) for name in SCAN_FIELDS), []).append(result)
+        plans = []
+        for group in groups.values():
+            if len(group) > 1:
+                plans.extend(group)
+                plans.append(None)
+
+    print('\t'.join(('file', *SCAN_FIELDS)))
+    for result in plans:
+        if result is None:
+            print()
+            continue
+        values = (str(getattr(result.plan, name) or '').strip() for name in SCAN_FIELDS)
+        print('\t'.join((result.file_path, *values)))
+    return 0
+
+
+def command_columns(args: argparse.Namespace) -> int:
+    for ind, (header, _, name) in enumerate(COLUMNS):
+        print(f'{ind}\t{name}\t{header}')
+    return 0
+
+
+def open_query(args: argparse.Namespace) -> tuple[list[str], str, list]:
+    """
+    Переводит БД на текущую схему и строит запрос. Сам запрос выполняется через читающее соединение,
+    поэтому не мешает идущему импорту
+    """
+    db = PlanDatabase(args.db)
+    materialized = db.is_materialized()
+    db.close()
+    return get_query(args, materialized)
+
+
+def command_query(args: argparse.Namespace) -> int:
+    headers, sql, params = open_query(args)
+    print('\t'.join(headers))
+    with get_connections(args.db).reader() as conn:
+        for row in iter_query_rows(conn, sql, params):
+            print('\t'.join('' if value is None else str(value) for value in row))
+    return 0
+
+
+def command_export(args: argparse.Namespace) -> int:
+    headers, sql, params = open_query(args)
+    with get_connections(args.db).reader() as conn:
+        count = export_rows(args.output, headers, iter_query_rows(conn, sql, params),
+                            types=column_types(selected_columns(args)))
+    print(f'Записано строк: {count} в файл {args.output}', file=sys.stderr)
+    return 0
+
+
+def command_search(args: argparse.Namespace) -> int:
+    # Запрос строится до открытия БД, чтобы пустая строка не требовала обращения к ней
+    query = build_search_query(args.text, args.limit)
+    if query is None:
+        print('В строке поиска нет ни одного слова', file=sys.stderr)
+        return 1
+    PlanDatabase(args.db).close()
+    print('\t'.join(SEARCH_HEADERS))
+    with get_connections(args.db).reader() as conn:
+        for row in conn.execute(*query):
+            print('\t'.join('' if value is None else str(value) for value in row))
+    return 0
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    PlanDatabase(args.db).close()
+    with get_connections(args.db).reader() as conn:
+        plan_ids = list(args.plan or [])
+        if args.folder:
+            plan_ids += plans_in_folders(conn, args.folder)
+            if not plan_ids:
+                print('В БД нет планов из этих папок. Пути файлов сохраняются при импорте с ключом --incremental',
+                      file=sys.stderr)
+                return 1
+        try:
+            index = DisciplineIndex(conn, plan_ids or None, args.key)
+            rows = index.compare(args.hours, args.min_plans)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+
+    if args.limit is not None:
+        rows = rows[:args.limit]
+    headers = ['Дисциплина', 'Планов', 'Минимум', 'Максимум', 'Среднее', 'Разброс', *index.plan_labels()]
+    table = ((row['name'], row['plans'], row['min'], row['max'], round(row['mean'], 1), row['spread'],
+              *row['values']) for row in rows)
+    if args.output:
+        types = ['TEXT', 'INTEGER', *['REAL'] * (len(headers) - 2)]
+        count = export_rows(args.output, headers, table, types=types)
+        print(f'Записано строк: {count} в файл {args.output}', file=sys.stderr)
+        return 0
+    print('\t'.join(headers))
+    for row in table:
+        print('\t'.join('' if value is None else f'{value:g}' if isinstance(value, float) else str(value)
+                        for value in row))
+    return 0
+
+
+def command_diff(args: argparse.Namespace) -> int:
+    from plan_diff import DIFF_HEADERS, diff_archive, diff_files
+
+    if args.archive:
+        if len(args.paths) != 1:
+            print('С ключом --archive укажите одну папку с файлами планов', file=sys.stderr)
+            return 1
+        diffs = diff_archive(args.paths[0], workers=args.workers, use_cache=not args.no_cache)
+    else:
+        if len(args.paths) != 2:
+            print('Укажите два файла: старую и новую версию плана', file=sys.stderr)
+            return 1
+        try:
+            diffs = [diff_files(*args.paths, use_cache=not args.no_cache)]
+        except Exception as error:
+            print(f'Ошибка чтения плана: {type(error).__name__}: {error}', file=sys.stderr)
+            return 1
+
+    def rows():
+        for diff in diffs:
+            print(f'{diff.old_path} -> {diff.new_path}: {diff.summary()}', file=sys.stderr)
+            for row in diff.rows():
+                yield diff.old_path, diff.new_path, *row
+
+    headers = ['Старая версия', 'Новая версия', *DIFF_HEADERS]
+    if args.output:
+        count = export_rows(args.output, headers, rows())
+        print(f'Записано строк: {count} в файл {args.output}', file=sys.stderr)
+        return 0
+    print('\t'.join(headers))
+    for row in rows():
+        print('\t'.join('' if value is None else str(value) for value in row))
+    return 0
+
+
+def command_validate(args: argparse.Namespace) -> int:
+    db = PlanDatabase(args.db)
+    if args.revalidate:
+        # Нарушения новых планов записываются при импорте, полная проверка нужна только после изменения правил
+        start = time.perf_counter()
+        db.validate()
+        print(f'Все планы проверены за {time.perf_counter() - start:.2f} с', file=sys.stderr)
+    db.close()
+
+    sql, params = build_findings_query(args.rule, args.limit)
+    with get_connections(args.db).reader() as conn:
+        for rule, findings, plans in summarize_findings(conn):
+            print(f'{rule.name}: нарушений {findings} в {plans} планах - {rule.title}', file=sys.stderr)
+        if args.output:
+            count = export_rows(args.output, FINDING_HEADERS, iter_query_rows(conn, sql, params),
+                                types=FINDING_TYPES)
+            print(f'Записано строк: {count} в файл {args.output}', file=sys.stderr)
+            return 0
+        print('\t'.join(FINDING_HEADERS))
+        for row in conn.execute(sql, params):
+            print('\t'.join('' if value is None else str(value) for value in row))
+    return 0
+
+
+def add_query_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--columns', type=parse_columns,
+                        help='столбцы через запятую (номера или имена из команды columns)')
+    parser.add_argument('--facultet', help='факультет')
+    parser.add_argument('--year', type=int, help='год начала обучения')
+    parser.add_argument('--cod', help='начало кода специальности')
+    parser.add_argument('--sem-from', type=int, help='первый семестр')
+    parser.add_argument('--sem-to', type=int, help='последний семестр')
+    parser.add_argument('--control-form', help='форма контроля')
+    parser.add_argument('--limit', type=int, help='максимальное количество строк')
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='planDB.sqlite', help='путь к файлу БД')
+    parser.add_argument('--busy-timeout', type=float, default=DEFAULT_BUSY_TIMEOUT,
+                        help='сколько секунд ждать, пока другой процесс освободит БД')
+    parser.add_argument('--mmap-size', type=int, default=DEFAULT_MMAP_SIZE,
+                        help='размер области БД, читаемой через mmap, в байтах (0 - без mmap)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help='размер кэша страниц SQLite на соединение в КБ')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='импорт папки с файлами планов в БД')
+    import_parser.add_argument('path', help='папка с файлами планов')
+    import_parser.add_argument('--workers', type=int, help='количество процессов для парсинга')
+    import_parser.add_argument('--incremental', action='store_true',
+                               help='пропускать неизменённые файлы и удалять планы из удалённых файлов')
+    import_parser.add_argument('--dry-run', action='store_true', help='только распарсить файлы, не изменяя БД')
+    import_parser.add_argument('--new-db', action='store_true', help='удалить все данные из БД перед импортом')
+    import_parser.add_argument('--materialized', action='store_true',
+                               help='вести материализованную таблицу и агрегаты')
+    import_parser.add_argument('--no-cache', action='store_true',
+                               help='разбирать все файлы заново, не используя сохранённые результаты')
+    import_parser.add_argument('--metrics', help='файл JSON для отчёта о времени этапов по каждому файлу')
+    import_parser.add_argument('--profile', action='store_true', help='добавить в отчёт данные cProfile')
+    import_parser.add_argument('--trace-memory', action='store_true',
+                               help='добавить в отчёт пиковый объём памяти при разборе')
+    import_parser.set_defaults(handler=command_import)
+
+    scan_parser = subparsers.add_parser('scan', help='список планов в папке по их титульным листам')
+    scan_parser.add_argument('path', help='папка с файлами планов')
+    scan_parser.add_argument('--workers', type=int, default=1, help='количество процессов для чтения файлов')
+    scan_parser.add_argument('--duplicates', action='store_true',
+                             help=f"только планы с одинаковыми {', '.join(SCAN_FIELDS)}")
+    scan_parser.add_argument('--no-cache', action='store_true', help='не использовать сохранённые разобранные планы')
+    scan_parser.set_defaults(handler=command_scan)
+
+    columns_parser = subparsers.add_parser('columns', help='список столбцов, доступных для выбора')
+    columns_parser.set_defaults(handler=command_columns)
+
+    query_parser = subparsers.add_parser('query', help='вывод выбранных данных в консоль')
+    add_query_arguments(query_parser)
+    query_parser.set_defaults(handler=command_query)
+
+    search_parser = subparsers.add_parser('search', help='поиск дисциплин во всех планах по названию и индексу')
+    search_parser.add_argument('text', help='слова или начала слов, форма слова не важна')
+    search_parser.add_argument('--limit', type=int, default=50, help='максимальное количество строк')
+    search_parser.set_defaults(handler=command_search)
+
+    compare_parser = subparsers.add_parser('compare', help='сравнение часов одинаковых дисциплин разных планов')
+    compare_parser.add_argument('--plan', type=int, action='append', help='id плана, можно указать несколько раз')
+    compare_parser.add_argument('--folder', action='append',
+                                help='папка, из которой импортированы планы, можно указать несколько раз')
+    compare_parser.add_argument('--key', choices=MATCH_KEYS, default='name',
+                                help='как сопоставлять дисциплины: по названию, индексу или по обоим')
+    compare_parser.add_argument('--hours', choices=HOUR_TYPES, default='total_hours_plan', help='вид часов')
+    compare_parser.add_argument('--min-plans', type=int, default=2,
+                                help='в скольких планах как минимум должна встречаться дисциплина')
+    compare_parser.add_argument('--limit', type=int, help='максимальное количество дисциплин')
+    compare_parser.add_argument('--output', help=f"файл для записи ({', '.join(FORMATS)}) вместо вывода в консоль")
+    compare_parser.set_defaults(handler=command_compare)
+
+    diff_parser = subparsers.add_parser('diff', help='различия версий плана: дисциплины, семестры, часы и формы контроля')
+    diff_parser.add_argument('paths', nargs='+', help='старая и новая версии плана или папка с ключом --archive')
+    diff_parser.add_argument('--archive', action='store_true',
+                             help='сравнить соседние версии всех планов в папке (версии одного плана - файлы '
+                                  'с одинаковыми кодом, профилем, базой, годом начала и формой обучения)')
+    diff_parser.add_argument('--workers', type=int, default=1, help='количество процессов для чтения файлов')
+    diff_parser.add_argument('--no-cache', action='store_true', help='не использовать сохранённые разобранные планы')
+    diff_parser.add_argument('--output', help=f"файл для записи ({', '.join(FORMATS)}) вместо вывода в консоль")
+    diff_parser.set_defaults(handler=command_diff)
+
+    validate_parser = subparsers.add_parser('validate', help='нарушения правил проверки часов дисциплин и семестров')
+    validate_parser.add_argument('--rule', choices=RULE_NAMES, help='только нарушения одного правила')
+    validate_parser.add_argument('--revalidate', action='store_true', help='заново проверить все планы в БД')
+    validate_parser.add_argument('--limit', type=int, help='максимальное количество строк')
+    validate_parser.add_argument('--output', help=f"файл для записи ({', '.join(FORMATS)}) вместо вывода в консоль")
+    validate_parser.set_defaults(handler=command_validate)
+
+    export_parser = subparsers.add_parser('export', help='экспорт выбранных данных в файл')
+    export_parser.add_argument('output', help=f"файл для записи ({', '.join(FORMATS)})")
+    add_query_arguments(export_parser)
+    export_parser.set_defaults(handler=command_export)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    # Настройки соединений задаются до первого обращения к БД
+    get_connections(args.db, busy_timeout=args.busy_timeout, mmap_size=args.mmap_size, cache_size=args.cache_size)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
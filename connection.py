@@ -0,0 +1,128 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# Время ожидания блокировки БД другим соединением по умолчанию, в секундах
+DEFAULT_BUSY_TIMEOUT = 10.0
+# Размер области файла БД, которая читается через mmap, по умолчанию, в байтах
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+# Размер кэша страниц каждого соединения по умолчанию, в КБ
+DEFAULT_CACHE_SIZE = 64 * 1024
+# Количество читающих соединений, которые держатся открытыми
+DEFAULT_READERS = 4
+
+
+class ConnectionManager:
+    """
+    Соединения с одной БД: пишущие и пул читающих. БД переводится в режим WAL,
+    в котором читающие соединения не блокируются пишущим, поэтому просмотр и экспорт
+    результатов работают во время импорта. Писать в каждый момент может только одно соединение:
+    остальные желающие писать ждут окончания его транзакции, а не получают ошибку database is locked
+    """
+
+    # db_path - путь к файлу БД
+    # busy_timeout - сколько секунд ждать, пока другое соединение освободит БД
+    # mmap_size - размер области файла БД для чтения через mmap в байтах, 0 - без mmap
+    # cache_size - размер кэша страниц каждого соединения в КБ
+    # readers - сколько читающих соединений держать открытыми
+    def __init__(self, db_path: str, busy_timeout: float = DEFAULT_BUSY_TIMEOUT, mmap_size: int = DEFAULT_MMAP_SIZE,
+                 cache_size: int = DEFAULT_CACHE_SIZE, readers: int = DEFAULT_READERS):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=readers)
+        # Право на запись. Блокировка повторно входимая, так как запись может вызывать другую запись того же потока
+        self.writer_lock = threading.RLock()
+
+    def pragmas(self) -> dict[str, str]:
+        """Настройки, которые применяются к каждому соединению"""
+        return {
+            'busy_timeout': str(int(self.busy_timeout * 1000)),
+            'mmap_size': str(self.mmap_size),
+            # Отрицательное значение - размер в КБ, а не в страницах
+            'cache_size': str(-self.cache_size),
+        }
+
+    def connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Открывает новое соединение с настройками менеджера"""
+        # Читающие соединения переиспользуются разными потоками, но каждое - только одним потоком за раз
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=not read_only)
+        for name, value in self.pragmas().items():
+            conn.execute(f'PRAGMA {name} = {value};')
+        if read_only:
+            conn.execute('PRAGMA query_only = ON;')
+        else:
+            # Режим журнала хранится в файле БД, поэтому его достаточно включать пишущему соединению
+            conn.execute('PRAGMA journal_mode = WAL;')
+            conn.execute('PRAGMA synchronous = NORMAL;')
+        return conn
+
+    @contextmanager
+    def write_lock(self) -> Iterator[None]:
+        """
+        Право на запись на время одной транзакции. Если сейчас пишет другое соединение,
+        ждёт окончания его транзакции не дольше busy_timeout
+        """
+        if not self.writer_lock.acquire(timeout=self.busy_timeout):
+            raise sqlite3.OperationalError('database is locked: в БД уже идёт запись')
+        try:
+            yield
+        finally:
+            self.writer_lock.release()
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Пишущее соединение с правом на запись на время блока"""
+        with self.write_lock():
+            conn = self.connect()
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Читающее соединение из пула на время блока. Если свободных нет, открывается новое"""
+        try:
+            conn = self.readers.get_nowait()
+        except queue.Empty:
+            conn = self.connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            # Незавершённая транзакция чтения удерживала бы старый снимок БД и мешала контрольной точке WAL
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self.readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        """Закрывает все свободные читающие соединения"""
+        while True:
+            try:
+                self.readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# Менеджеры соединений по абсолютным путям к БД, общие для всех частей приложения в одном процессе
+_managers: dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connections(db_path: str, **options) -> ConnectionManager:
+    """
+    Возвращает общий менеджер соединений с БД db_path, создавая его при первом обращении.
+    options (busy_timeout, mmap_size, cache_size, readers) применяются только при создании
+    """
+    key = os.path.abspath(db_path)
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = ConnectionManager(db_path, **options)
+        return _managers[key]
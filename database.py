@@ -1,40 +1,149 @@
+import functools
 import sqlite3
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
-from classes import Discipline, Semester
-from plan_parse import Plan
+from classes import Discipline, PlanHours, Semester, SourceFile
+from connection import ConnectionManager, get_connections
+from query_builder import COLUMNS, CONTROL_FORMS, FLAT_TABLE, FROM_CLAUSE
+from search import SEARCH_COLUMNS, SEARCH_TABLE, build_search_query, normalize
+from validation import RULE_NAMES, VALIDATION_TABLE, check_disciplines
+
+if TYPE_CHECKING:
+    # Модуль разбора файлов нужен только для подсказок типов, поэтому при запуске не загружается
+    from plan_parse import Plan
+
+
+def _in_transaction(method: Callable) -> Callable:
+    """Метод PlanDatabase, который пишет в БД: выполняется внутри PlanDatabase.transaction"""
+    @functools.wraps(method)
+    def wrapper(self: 'PlanDatabase', *args, **kwargs):
+        with self.transaction():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class PlanDatabase:
     """Класс, который создаёт БД и имеет методы, которые являются интерфейсами этой БД"""
 
-    def __init__(self, db_path='plan_database.db', new_db: bool = False):
-        self.conn = sqlite3.connect(db_path)
-        # Если флаг имеет значение True удаляются все таблица, создаются по новой и заполняются нужными данными
-        if new_db:
-            self.drop_tables()
-            self.create_tables()
-            self.insert_control_form()
-        # Проверят созданы ли все таблицы и создаёт их в противном случае
-        self.create_tables()
+    # Настройки SQLite для быстрой пакетной вставки
+    BULK_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL'}
+    # Версия схемы БД, хранится в PRAGMA user_version
+    SCHEMA_VERSION = 7
+    # Атрибуты плана, повторяющиеся значения которых хранятся в таблицах-справочниках
+    LOOKUP_TABLES = {'cafedra': 'Cafedra', 'facultet': 'Facultet', 'kvalik': 'Kvalik', 'edu_form': 'EduForm'}
+    # Виды часов в семестре, по которым считаются суммы в агрегатах
+    HOUR_COLUMNS = ('total', 'lek', 'lab', 'pr', 'krp', 'ip', 'sr', 'cons', 'patt')
+    # Виды часов дисциплины за всё время обучения
+    DISCIPLINE_HOUR_COLUMNS = ('total_hours_expert', 'total_hours_plan', 'total_hours_with_teacher',
+                               'total_hours_ip', 'total_hours_sr', 'total_hours_patt',
+                               'required_important_hours', 'required_not_important_hours')
+    # Материализованные таблицы, которые пересчитываются при вставке и удалении планов
+    MATERIALIZED_TABLES = (FLAT_TABLE, 'DisciplineAggregate', 'PlanAggregate',
+                           'PlanSemesterHours', 'PlanControlFormCount')
 
-    def create_tables(self):
-        """Создание всех таблиц в БД, если их нет"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS Plan(
+    # pragmas - настройки SQLite (journal_mode, synchronous и т.д.), которые применяются к соединению
+    # materialized - True создаёт материализованную таблицу и агрегаты, False удаляет их, None оставляет как есть
+    # connections - соединения с БД, у которых берётся право на запись, по умолчанию общие для db_path
+    def __init__(self, db_path='plan_database.db', new_db: bool = False, pragmas: dict[str, str] | None = None,
+                 materialized: bool | None = None, connections: ConnectionManager | None = None):
+        # Соединение своё у каждого объекта, а право на запись берётся только на время транзакции,
+        # поэтому несколько объектов PlanDatabase с одной БД пишут по очереди
+        self.connections = connections or get_connections(db_path)
+        self.conn = self.connections.connect()
+        # Глубина вложенных блоков transaction
+        self.__transaction_depth = 0
+        # Текст для поискового индекса готовится той же функцией, что и поисковая строка
+        self.conn.create_function('search_text', 2, normalize, deterministic=True)
+        # Время, затраченное на каждый этап последней пакетной вставки
+        self.last_timings: dict[str, float] = {}
+        try:
+            # Режим журнала и synchronous нельзя менять внутри транзакции, поэтому настройки применяются до неё
+            if pragmas:
+                self.set_pragmas(pragmas)
+            with self.transaction():
+                # Если флаг имеет значение True удаляются все таблица, создаются по новой и заполняются нужными данными
+                if new_db:
+                    self.drop_tables()
+                # Переводит БД со старой схемой на текущую
+                self.migrate()
+                # Проверят созданы ли все таблицы и создаёт их в противном случае
+                self.create_tables()
+                self.insert_control_form()
+                if materialized is True and not self.is_materialized():
+                    self.enable_materialized()
+                elif materialized is False:
+                    self.disable_materialized()
+        except Exception:
+            self.conn.close()
+            raise
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Запись в БД. Право на запись берётся на время блока, блоки могут быть вложенными. Транзакция начинается
+        во внешнем блоке и фиксируется только в конце него, а при ошибке в любом блоке откатывается целиком,
+        поэтому методы, которые пишут в БД, сами не вызывают commit и rollback
+        """
+        with self.connections.write_lock():
+            self.__transaction_depth += 1
+            try:
+                # Транзакция начинается явно: иначе создание и удаление таблиц выполнялись бы вне её.
+                # IMMEDIATE сразу берёт блокировку записи SQLite, поэтому другой процесс не пишет между
+                # чтением следующих id (__next_id) и вставкой строк с ними, а ждёт окончания транзакции
+                if self.__transaction_depth == 1 and not self.conn.in_transaction:
+                    self.conn.execute('BEGIN IMMEDIATE')
+                yield self.conn
+                if self.__transaction_depth == 1 and self.conn.in_transaction:
+                    self.conn.commit()
+            except BaseException:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                raise
+            finally:
+                self.__transaction_depth -= 1
+
+    def set_pragmas(self, pragmas: dict[str, str]):
+        """Применяет переданные настройки SQLite к соединению. Вызывается вне transaction"""
+        with self.connections.write_lock():
+            for name, value in pragmas.items():
+                self.conn.execute(f'PRAGMA {name} = {value};')
+
+    def __create_plan_table(self, cursor: sqlite3.Cursor, table: str = 'Plan'):
+        """Создание таблицы Plan, атрибуты из справочников хранятся как ссылки на них"""
+        cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {table}(
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         name TEXT,
-                        cafedra TEXT,
-                        facultet TEXT,
+                        cafedra_id INTEGER,
+                        facultet_id INTEGER,
                         profile TEXT,
                         cod TEXT,
-                        kvalik TEXT,
-                        edu_form TEXT,
+                        kvalik_id INTEGER,
+                        edu_form_id INTEGER,
                         start_year INT,
                         standart TEXT,
-                        baza TEXT
+                        baza TEXT,
+                        FOREIGN KEY (cafedra_id) REFERENCES Cafedra (id),
+                        FOREIGN KEY (facultet_id) REFERENCES Facultet (id),
+                        FOREIGN KEY (kvalik_id) REFERENCES Kvalik (id),
+                        FOREIGN KEY (edu_form_id) REFERENCES EduForm (id)
             )
         ''')
+
+    @_in_transaction
+    def create_tables(self):
+        """Создание всех таблиц и индексов в БД, если их нет"""
+        cursor = self.conn.cursor()
+        for table in self.LOOKUP_TABLES.values():
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE
+                )
+            ''')
+        self.__create_plan_table(cursor)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS Discipline (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -78,37 +187,562 @@ class PlanDatabase:
                 FOREIGN KEY (control_form_id) REFERENCES ControlForm (id)
             )
         ''')
-        self.conn.commit()
+        # Все формы контроля семестра. В Semester.control_form_id остаётся основная (первая) форма
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS SemesterControlForm (
+                semester_id INTEGER,
+                control_form_id INTEGER,
+                PRIMARY KEY (semester_id, control_form_id),
+                FOREIGN KEY (semester_id) REFERENCES Semester (id),
+                FOREIGN KEY (control_form_id) REFERENCES ControlForm (id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS SourceFile (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                hash TEXT,
+                plan_id INTEGER,
+                FOREIGN KEY (plan_id) REFERENCES Plan (id)
+            )
+        ''')
+        self.create_indexes(cursor)
+        search_columns = ', '.join(column for column, _ in SEARCH_COLUMNS)
+        cursor.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5({search_columns})')
+        # Нарушения правил проверки часов из validation.RULES
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {VALIDATION_TABLE} (
+                plan_id INTEGER,
+                discipline_id INTEGER,
+                semester_num INTEGER,
+                rule TEXT,
+                expected INTEGER,
+                actual INTEGER,
+                FOREIGN KEY (plan_id) REFERENCES Plan (id),
+                FOREIGN KEY (discipline_id) REFERENCES Discipline (id)
+            )
+        ''')
+        # Индекс нужен и для удаления нарушений дисциплины, и для вывода нарушений по порядку планов
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {VALIDATION_TABLE}_plan_id '
+                       f'ON {VALIDATION_TABLE} (plan_id, discipline_id, semester_num)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {VALIDATION_TABLE}_discipline_id '
+                       f'ON {VALIDATION_TABLE} (discipline_id)')
+        cursor.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    @staticmethod
+    def create_indexes(cursor: sqlite3.Cursor):
+        """Создание индексов по внешним ключам, по которым соединяются таблицы"""
+        cursor.execute('CREATE INDEX IF NOT EXISTS Discipline_plan_id ON Discipline (plan_id)')
+        # Индекс покрывает соединение с ControlForm, поэтому для него не нужно читать строку семестра
+        cursor.execute('CREATE INDEX IF NOT EXISTS Semester_discipline_id ON Semester (discipline_id, control_form_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS Semester_control_form_id ON Semester (control_form_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS SemesterControlForm_control_form_id '
+                       'ON SemesterControlForm (control_form_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS SourceFile_plan_id ON SourceFile (plan_id)')
 
+    @_in_transaction
+    def migrate(self):
+        """Переводит БД со схемы предыдущих версий на текущую"""
+        cursor = self.conn.cursor()
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+        self.__migrate_lookup_tables()
+        if version < 3:
+            self.__migrate_control_forms()
+        if version < 4:
+            # Поисковый индекс появился в версии 4 и заполняется по уже загруженным планам
+            self.create_tables()
+            self.refresh_search()
+        if version < 5:
+            # Проверка часов появилась в версии 5 и проходит по уже загруженным планам
+            self.create_tables()
+            self.validate()
+        elif version < 6:
+            # В версии 6 убрано правило проверки часов дисциплины, его нарушения больше не показываются
+            self.conn.execute(f'DELETE FROM {VALIDATION_TABLE} WHERE rule NOT IN ({", ".join("?" * len(RULE_NAMES))})',
+                              RULE_NAMES)
+        if version < 7 and self.is_materialized():
+            # Таблица результата читается страницами по ключу строки, для этого нужен индекс по семестрам
+            self.create_flat_indexes(self.conn.cursor())
+
+    def __migrate_control_forms(self):
+        """
+        Переход на схему версии 3, в которой у семестра может быть несколько форм контроля:
+        текущие формы контроля семестров копируются в SemesterControlForm
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'Semester'")
+        if not cursor.fetchone()[0]:
+            return
+        materialized = self.is_materialized()
+        self.create_tables()
+        cursor.execute('''
+            INSERT OR IGNORE INTO SemesterControlForm (semester_id, control_form_id)
+            SELECT id, control_form_id FROM Semester WHERE control_form_id IS NOT NULL
+        ''')
+        # В материализованной таблице появился столбец semester_id, поэтому она создаётся заново
+        if materialized:
+            self.disable_materialized()
+            self.enable_materialized()
+        self.create_view()
+
+    def __migrate_lookup_tables(self):
+        """
+        Переход со схемы версии 1, в которой кафедра, факультет, квалификация и форма обучения
+        хранились текстом в каждой строке Plan, на схему со справочниками и индексами.
+        Выполняется в транзакции миграции, поэтому при ошибке остаётся старая схема
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('PRAGMA table_info(Plan)')
+        columns = [row[1] for row in cursor.fetchall()]
+        if 'facultet' not in columns:
+            return
+
+        # Представление ссылается на таблицу Plan и мешает её пересозданию
+        cursor.execute('DROP VIEW IF EXISTS All_data')
+        for column, table in self.LOOKUP_TABLES.items():
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE
+                )
+            ''')
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO {table} (name)
+                SELECT DISTINCT {column} FROM Plan WHERE {column} IS NOT NULL
+            ''')
+        self.__create_plan_table(cursor, 'Plan_new')
+        cursor.execute('''
+            INSERT INTO Plan_new (
+                id, name, cafedra_id, facultet_id, profile, cod,
+                kvalik_id, edu_form_id, start_year, standart, baza
+            )
+            SELECT P.id, P.name, C.id, F.id, P.profile, P.cod, K.id, E.id, P.start_year, P.standart, P.baza
+            FROM Plan P
+                 LEFT JOIN Cafedra C ON C.name = P.cafedra
+                 LEFT JOIN Facultet F ON F.name = P.facultet
+                 LEFT JOIN Kvalik K ON K.name = P.kvalik
+                 LEFT JOIN EduForm E ON E.name = P.edu_form
+        ''')
+        cursor.execute('DROP TABLE Plan')
+        # Другие представления, ссылающиеся на Plan, не проверяются при переименовании
+        cursor.execute('PRAGMA legacy_alter_table = ON')
+        cursor.execute('ALTER TABLE Plan_new RENAME TO Plan')
+        cursor.execute('PRAGMA legacy_alter_table = OFF')
+        self.create_tables()
+        self.create_view()
+
+    @_in_transaction
     def insert_control_form(self):
-        """Вставляет в таблицу ControlForm все существующие формы контроля"""
+        """Вставляет в таблицу ControlForm все существующие формы контроля, если их там ещё нет"""
         cursor = self.conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM ControlForm')
+        if cursor.fetchone()[0]:
+            return
         cursor.execute('''
             INSERT INTO ControlForm (name)
             VALUES("Экзамен"), ("Зачёт"), ("Зачёт с оценкой"), 
             ("Курсовая практика"), ("Контрольная работа"), ("Другое")
             ''')
-        self.conn.commit()
 
-    def insert_plan(self, plan: Plan):
+    def insert_plan(self, plan: 'Plan'):
         """Вставляет все данные из объекта класса Plan в БД"""
+        self.insert_plans([plan])
+
+    @staticmethod
+    def __lookup_id(cursor: sqlite3.Cursor, table: str, value: str | None) -> int | None:
+        """Возвращает id значения в справочнике, добавляя его туда, если его там ещё нет"""
+        if value is None:
+            return None
+        cursor.execute(f'INSERT OR IGNORE INTO {table} (name) VALUES (?)', (value,))
+        cursor.execute(f'SELECT id FROM {table} WHERE name = ?', (value,))
+        return cursor.fetchone()[0]
+
+    def __next_id(self, table: str) -> int:
+        """
+        Возвращает id, который получит следующая запись в таблице с AUTOINCREMENT.
+        Вызывается внутри transaction: до её конца другие соединения, в том числе других процессов, не пишут в БД
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+        max_id = cursor.fetchone()[0]
+        cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+        seq = cursor.fetchone()
+        return max(max_id, seq[0] if seq else 0) + 1
+
+    def insert_plans(self, plans: Iterable['Plan'],
+                     source_files: Iterable[SourceFile] | None = None) -> dict[str, float]:
+        """
+        Вставляет все данные из нескольких объектов класса Plan в БД одной транзакцией: либо все планы, либо ни один.
+        Строки каждой таблицы вставляются через executemany, id дисциплин и семестров назначаются заранее,
+        чтобы семестры и их формы контроля можно было вставить без обращения к lastrowid.
+        source_files - файлы, из которых загружены планы, в том же порядке. Если у файла указан
+        plan_id, то старый план удаляется, а новый получает его id.
+        Возвращает время в секундах, затраченное на каждый этап
+        """
+        timings = dict.fromkeys(('prepare', 'plan', 'discipline', 'semester', 'search', 'validate', 'materialize',
+                                 'commit'), 0.0)
+        start = time.perf_counter()
+        plans = list(plans)
+        source_files = list(source_files) if source_files is not None else [None] * len(plans)
+        cursor = self.conn.cursor()
+        with self.transaction():
+            # Старые версии заменяемых планов удаляются в той же транзакции
+            self.delete_plans([source.plan_id for source in source_files
+                               if source is not None and source.plan_id is not None])
+            next_plan_id = self.__next_id('Plan')
+            discipline_id = self.__next_id('Discipline')
+            semester_id = self.__next_id('Semester')
+            plan_ids = []
+            plan_rows = []
+            discipline_rows = []
+            semester_rows = []
+            control_form_rows = []
+            source_rows = []
+            for plan, source in zip(plans, source_files):
+                if source is not None and source.plan_id is not None:
+                    plan_id = source.plan_id
+                else:
+                    plan_id = next_plan_id
+                    next_plan_id += 1
+                plan_ids.append(plan_id)
+                if source is not None:
+                    source.plan_id = plan_id
+                    source_rows.append((source.path, source.size, source.mtime, source.hash, plan_id))
+                plan_rows.append((
+                    plan_id, plan.name,
+                    self.__lookup_id(cursor, 'Facultet', plan.facultet),
+                    self.__lookup_id(cursor, 'Cafedra', plan.cafedra),
+                    plan.profile, plan.cod,
+                    self.__lookup_id(cursor, 'Kvalik', plan.kvalik),
+                    self.__lookup_id(cursor, 'EduForm', plan.edu_form),
+                    plan.start_year, plan.standart, plan.baza
+                ))
+                # Строки берутся прямо из массивов, без создания объектов Discipline и Semester
+                disciplines = plan.disciplines
+                if not isinstance(disciplines, PlanHours):
+                    disciplines = PlanHours(disciplines)
+                for index in range(len(disciplines)):
+                    discipline_rows.append((
+                        discipline_id, bool(disciplines.in_plan[index]), disciplines.inds[index],
+                        disciplines.names[index], plan_id, *disciplines.totals_row(index)
+                    ))
+                    for control_forms, *semester in disciplines.semester_rows(index):
+                        # Основной формой контроля считается первая
+                        main_form = control_forms[0] if control_forms else None
+                        semester_rows.append((semester_id, discipline_id, main_form, *semester))
+                        control_form_rows.extend((semester_id, form) for form in control_forms)
+                        semester_id += 1
+                    discipline_id += 1
+            timings['prepare'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cursor.executemany('''
+                INSERT INTO Plan(
+                     id, name, facultet_id, cafedra_id, profile, cod, kvalik_id,
+                     edu_form_id, start_year, standart, baza
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', plan_rows)
+            timings['plan'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cursor.executemany('''
+                INSERT INTO Discipline (
+                    id, in_plan, ind, name, plan_id,
+                    total_hours_expert, total_hours_plan, total_hours_with_teacher,
+                    total_hours_ip, total_hours_sr, total_hours_patt,
+                    required_important_hours, required_not_important_hours
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', discipline_rows)
+            timings['discipline'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cursor.executemany('''
+                INSERT INTO Semester (
+                    id, discipline_id, control_form_id, num, total, lek, lab, pr, krp, ip, sr, cons, patt
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', semester_rows)
+            cursor.executemany('''
+                INSERT INTO SemesterControlForm (semester_id, control_form_id) VALUES (?, ?)
+            ''', control_form_rows)
+            timings['semester'] = time.perf_counter() - start
+
+            cursor.executemany('''
+                INSERT OR REPLACE INTO SourceFile (path, size, mtime, hash, plan_id)
+                VALUES (?, ?, ?, ?, ?)
+            ''', source_rows)
+
+            start = time.perf_counter()
+            self.refresh_search(plan_ids)
+            timings['search'] = time.perf_counter() - start
+
+            # Проверяются только вставленные планы, нарушения остальных планов не пересчитываются
+            start = time.perf_counter()
+            self.validate(plan_ids)
+            timings['validate'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if self.is_materialized():
+                self.refresh_materialized(plan_ids)
+            timings['materialize'] = time.perf_counter() - start
+
+            # Транзакция фиксируется при выходе из блока, если он внешний
+            start = time.perf_counter()
+        timings['commit'] = time.perf_counter() - start
+
+        self.last_timings = timings
+        return timings
+
+    @_in_transaction
+    def delete_plans(self, plan_ids: Iterable[int]):
+        """Удаляет из БД планы с переданными id вместе с их дисциплинами, семестрами и записями о файлах"""
+        ids = [(plan_id,) for plan_id in plan_ids]
+        if not ids:
+            return
+        cursor = self.conn.cursor()
+        if self.is_materialized():
+            for table in self.MATERIALIZED_TABLES:
+                cursor.executemany(f'DELETE FROM {table} WHERE plan_id = ?', ids)
+        cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN (SELECT id FROM Discipline WHERE plan_id = ?)',
+                           ids)
+        cursor.executemany(f'DELETE FROM {VALIDATION_TABLE} WHERE plan_id = ?', ids)
+        cursor.executemany('''
+            DELETE FROM SemesterControlForm
+            WHERE semester_id IN (SELECT S.id FROM Semester S
+                                  JOIN Discipline D ON D.id = S.discipline_id
+                                  WHERE D.plan_id = ?)
+        ''', ids)
+        cursor.executemany('''
+            DELETE FROM Semester
+            WHERE discipline_id IN (SELECT id FROM Discipline WHERE plan_id = ?)
+        ''', ids)
+        cursor.executemany('DELETE FROM Discipline WHERE plan_id = ?', ids)
+        cursor.executemany('DELETE FROM SourceFile WHERE plan_id = ?', ids)
+        cursor.executemany('DELETE FROM Plan WHERE id = ?', ids)
+
+    def get_source_files(self) -> dict[str, SourceFile]:
+        """Возвращает записи о всех файлах, из которых были загружены планы, по их путям"""
+        return self.read_source_files(self.conn)
+
+    @staticmethod
+    def read_source_files(conn: sqlite3.Connection) -> dict[str, SourceFile]:
+        """
+        Записи о файлах планов через любое соединение, в том числе читающее, без перевода БД на текущую схему.
+        В БД старых версий таблицы SourceFile нет, и тогда записей нет
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'SourceFile'")
+        if not cursor.fetchone()[0]:
+            return {}
+        cursor.execute('SELECT path, size, mtime, hash, plan_id FROM SourceFile')
+        return {row[0]: SourceFile(*row) for row in cursor.fetchall()}
+
+    @_in_transaction
+    def update_source_files(self, source_files: Iterable[SourceFile]):
+        """Обновляет размер и время изменения файлов, содержимое которых не поменялось"""
+        cursor = self.conn.cursor()
+        cursor.executemany('''
+            UPDATE SourceFile SET size = ?, mtime = ? WHERE path = ?
+        ''', [(source.size, source.mtime, source.path) for source in source_files])
+
+    def count_untracked_plans(self) -> int:
+        """Возвращает количество планов, для которых нет записи о файле, из которого они загружены"""
         cursor = self.conn.cursor()
         cursor.execute('''
-            INSERT INTO Plan(
-                 name, facultet, cafedra, profile, cod, kvalik,
-                 edu_form, start_year, standart, baza
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            plan.name, plan.facultet, plan.cafedra, plan.profile, plan.cod,
-            plan.kvalik, plan.edu_form, plan.start_year,
-            plan.standart, plan.baza
-        ))
-        plan_id = cursor.lastrowid
-        # Перебирает все дисциплины в плане и вставляет их в БД
-        for discipline in plan.disciplines:
-            self.insert_discipline(int(plan_id), discipline)
-        self.conn.commit()
+            SELECT COUNT(*) FROM Plan
+            WHERE id NOT IN (SELECT plan_id FROM SourceFile WHERE plan_id IS NOT NULL)
+        ''')
+        return cursor.fetchone()[0]
+
+    def is_materialized(self) -> bool:
+        """Проверяет, есть ли в БД материализованная таблица и агрегаты"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (FLAT_TABLE,))
+        return bool(cursor.fetchone()[0])
+
+    @_in_transaction
+    def enable_materialized(self):
+        """
+        Создаёт материализованную таблицу со всеми соединёнными данными и таблицы с агрегатами
+        и заполняет их по всем планам. Дальше они пересчитываются при каждой вставке и удалении планов
+        """
+        cursor = self.conn.cursor()
+        flat_columns = ', '.join(column[2] for column in COLUMNS)
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {FLAT_TABLE} '
+                       f'(plan_id INTEGER, discipline_id INTEGER, semester_id INTEGER, {flat_columns})')
+        self.create_flat_indexes(cursor)
+        hours = ', '.join(f'{column} INTEGER' for column in self.HOUR_COLUMNS)
+        discipline_hours = ', '.join(f'{column} INTEGER' for column in self.DISCIPLINE_HOUR_COLUMNS)
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS DisciplineAggregate (
+                discipline_id INTEGER PRIMARY KEY,
+                plan_id INTEGER,
+                semesters INTEGER,
+                {hours}
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS DisciplineAggregate_plan_id ON DisciplineAggregate (plan_id)')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS PlanAggregate (
+                plan_id INTEGER PRIMARY KEY,
+                disciplines INTEGER,
+                semesters INTEGER,
+                {discipline_hours},
+                {hours}
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS PlanSemesterHours (
+                plan_id INTEGER,
+                num INTEGER,
+                {hours},
+                PRIMARY KEY (plan_id, num)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS PlanControlFormCount (
+                plan_id INTEGER,
+                control_form_id INTEGER,
+                count INTEGER,
+                PRIMARY KEY (plan_id, control_form_id)
+            )
+        ''')
+        self.refresh_materialized()
+
+    @staticmethod
+    def create_flat_indexes(cursor: sqlite3.Cursor):
+        """Индексы материализованной таблицы: для пересчёта по планам и для постраничного чтения по ключу строки"""
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {FLAT_TABLE}_plan_id ON {FLAT_TABLE} (plan_id)')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {FLAT_TABLE}_semester_id ON {FLAT_TABLE} (semester_id)')
+
+    @_in_transaction
+    def disable_materialized(self):
+        """Удаляет материализованную таблицу и таблицы с агрегатами"""
+        cursor = self.conn.cursor()
+        for table in self.MATERIALIZED_TABLES:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    @_in_transaction
+    def refresh_materialized(self, plan_ids: list[int] | None = None):
+        """
+        Пересчитывает материализованную таблицу и агрегаты для переданных планов, None - для всех планов.
+        Изменения не фиксируются, чтобы пересчёт шёл в одной транзакции со вставкой планов
+        """
+        cursor = self.conn.cursor()
+        if plan_ids is None:
+            condition, params = '', []
+        else:
+            if not plan_ids:
+                return
+            condition, params = f'IN ({", ".join("?" * len(plan_ids))})', list(plan_ids)
+
+        def plans_where(column: str) -> str:
+            return f'WHERE {column} {condition}' if condition else ''
+
+        for table in self.MATERIALIZED_TABLES:
+            cursor.execute(f'DELETE FROM {table} {plans_where("plan_id")}', params)
+
+        flat_columns = ', '.join(column[2] for column in COLUMNS)
+        flat_values = ', '.join(column[1] for column in COLUMNS)
+        cursor.execute(f'''
+            INSERT INTO {FLAT_TABLE} (plan_id, discipline_id, semester_id, {flat_columns})
+            SELECT P.id, D.id, S.id, {flat_values}{FROM_CLAUSE}
+            {plans_where('P.id')}
+        ''', params)
+
+        hours = ', '.join(self.HOUR_COLUMNS)
+        sum_hours = ', '.join(f'SUM(S.{column})' for column in self.HOUR_COLUMNS)
+        cursor.execute(f'''
+            INSERT INTO DisciplineAggregate (discipline_id, plan_id, semesters, {hours})
+            SELECT D.id, D.plan_id, COUNT(S.id), {sum_hours}
+            FROM Discipline D
+                 LEFT JOIN Semester S ON D.id = S.discipline_id
+            {plans_where('D.plan_id')}
+            GROUP BY D.id
+        ''', params)
+
+        discipline_hours = ', '.join(self.DISCIPLINE_HOUR_COLUMNS)
+        sum_discipline_hours = ', '.join(f'SUM(D.{column})' for column in self.DISCIPLINE_HOUR_COLUMNS)
+        sum_aggregate_hours = ', '.join(f'SUM(DA.{column})' for column in self.HOUR_COLUMNS)
+        cursor.execute(f'''
+            INSERT INTO PlanAggregate (plan_id, disciplines, semesters, {discipline_hours}, {hours})
+            SELECT P.id, COUNT(D.id), COALESCE(SUM(DA.semesters), 0), {sum_discipline_hours}, {sum_aggregate_hours}
+            FROM Plan P
+                 LEFT JOIN Discipline D ON P.id = D.plan_id
+                 LEFT JOIN DisciplineAggregate DA ON D.id = DA.discipline_id
+            {plans_where('P.id')}
+            GROUP BY P.id
+        ''', params)
+
+        cursor.execute(f'''
+            INSERT INTO PlanSemesterHours (plan_id, num, {hours})
+            SELECT D.plan_id, S.num, {sum_hours}
+            FROM Discipline D
+                 JOIN Semester S ON D.id = S.discipline_id
+            {plans_where('D.plan_id')}
+            GROUP BY D.plan_id, S.num
+        ''', params)
+
+        cursor.execute(f'''
+            INSERT INTO PlanControlFormCount (plan_id, control_form_id, count)
+            SELECT D.plan_id, SCF.control_form_id, COUNT(*)
+            FROM Discipline D
+                 JOIN Semester S ON D.id = S.discipline_id
+                 JOIN SemesterControlForm SCF ON S.id = SCF.semester_id
+            {plans_where('D.plan_id')}
+            GROUP BY D.plan_id, SCF.control_form_id
+        ''', params)
 
+    @_in_transaction
+    def refresh_search(self, plan_ids: list[int] | None = None):
+        """
+        Пересчитывает поисковый индекс для дисциплин переданных планов, None - для всех планов.
+        Изменения не фиксируются, чтобы индекс обновлялся в одной транзакции со вставкой планов
+        """
+        if plan_ids is None:
+            self.__index_disciplines('', [])
+        elif plan_ids:
+            self.__index_disciplines(f'WHERE D.plan_id IN ({", ".join("?" * len(plan_ids))})', list(plan_ids))
+
+    def __index_disciplines(self, where: str, params: list):
+        """Записывает в поисковый индекс дисциплины, отобранные условием where, вместо их старых записей"""
+        cursor = self.conn.cursor()
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN (SELECT D.id FROM Discipline D {where})', params)
+        # Названия хранятся в индексе основами слов, индексы дисциплин - целиком
+        cursor.execute(f'''
+            INSERT INTO {SEARCH_TABLE} (rowid, name, ind, plan_name, profile)
+            SELECT D.id, search_text(D.name, 1), search_text(D.ind, 0),
+                   search_text(P.name, 1), search_text(P.profile, 1)
+            FROM Discipline D
+                 JOIN Plan P ON P.id = D.plan_id
+            {where}
+        ''', params)
+
+    @_in_transaction
+    def validate(self, plan_ids: list[int] | None = None):
+        """
+        Заново проверяет часы дисциплин переданных планов, None - всех планов.
+        Изменения не фиксируются, чтобы проверка шла в одной транзакции со вставкой планов
+        """
+        cursor = self.conn.cursor()
+        if plan_ids is None:
+            check_disciplines(cursor, '1', [])
+        elif plan_ids:
+            check_disciplines(cursor, f'D.plan_id IN ({", ".join("?" * len(plan_ids))})', list(plan_ids))
+
+    def search_disciplines(self, text: str, limit: int = 200) -> list[tuple]:
+        """Поиск дисциплин всех планов по названию, индексу, направлению и профилю, самые подходящие первыми"""
+        query = build_search_query(text, limit)
+        if query is None:
+            return []
+        return self.conn.execute(*query).fetchall()
+
+    def close(self):
+        """Закрывает соединение с БД"""
+        self.conn.close()
+
+    @_in_transaction
     def insert_discipline(self, plan_id: int, discipline: Discipline):
         """Вставляет все данные из объекта класса Discipline в БД"""
         cursor = self.conn.cursor()
@@ -126,11 +760,13 @@ class PlanDatabase:
             discipline.required.important, discipline.required.not_important
         ))
         discipline_id = cursor.lastrowid
+        self.__index_disciplines('WHERE D.id = ?', [discipline_id])
         # Перебирает все семестры в дисциплине и вставляет их в БД
         for semester in discipline.semesters:
             self.insert_semester(discipline_id, semester)
-        self.conn.commit()
+        check_disciplines(cursor, 'D.id = ?', [discipline_id])
 
+    @_in_transaction
     def insert_semester(self, discipline_id: int, semester: Semester):
         """Вставляет все данные из объекта класса Semester в БД"""
         cursor = self.conn.cursor()
@@ -144,27 +780,35 @@ class PlanDatabase:
             semester.krp, semester.ip, semester.sr,
             semester.cons, semester.patt
         ))
-        self.conn.commit()
+        cursor.executemany('''
+            INSERT OR IGNORE INTO SemesterControlForm (semester_id, control_form_id) VALUES (?, ?)
+        ''', [(cursor.lastrowid, form.value) for form in semester.control_forms if form.value is not None])
 
+    @_in_transaction
     def create_view(self):
         cursor = self.conn.cursor()
         cursor.execute('''drop view if exists All_data;''')
-        cursor.execute('''
+        cursor.execute(f'''
         create view All_data as
-        select P.name Направление, P.cafedra Кафедра, P.facultet Факультет, P.profile Профиль,
-           P.cod Код_специальности, P.kvalik Квалификация, P.edu_form Форма_обучения,
+        select P.name Направление, C.name Кафедра, F.name Факультет, P.profile Профиль,
+           P.cod Код_специальности, K.name Квалификация, E.name Форма_обучения,
            P.start_year Год_начала, P.standart Стандарт_ФГОС, P.baza База,
            D.in_plan В_плане, D.ind Индекс_дисциплины, D.name Дисциплина,
            D.total_hours_expert Экспертное, D.total_hours_plan По_плану, D.total_hours_with_teacher С_препод,
            D.total_hours_ip ИП, D.total_hours_sr СР, D.total_hours_patt ПАтт,
            D.required_important_hours `Обяз. часть`, D.required_not_important_hours `Вар. часть`,
            S.num Семестр, S.total Всего, S.lek Лек, S.lab Лаб, S.pr Пр, S.krp Крп, S.ip ИП,
-           S.sr СР, S.cons Конс, S.patt ПАтт, CF.name Форма_контроля
+           S.sr СР, S.cons Конс, S.patt ПАтт, {CONTROL_FORMS} Форма_контроля
         from Plan P
+             left join main.Cafedra C on P.cafedra_id = C.id
+             left join main.Facultet F on P.facultet_id = F.id
+             left join main.Kvalik K on P.kvalik_id = K.id
+             left join main.EduForm E on P.edu_form_id = E.id
              join main.Discipline D on P.id = D.plan_id
              join main.Semester S on D.id = S.discipline_id
              join main.ControlForm CF on S.control_form_id = CF.id;''')
 
+    @_in_transaction
     def drop_tables(self):
         """Удаляет все имеющиеся в БД таблицы"""
         cursor = self.conn.cursor()
@@ -180,5 +824,11 @@ class PlanDatabase:
         cursor.execute('''
             drop table if exists Semester;
             ''')
-
-        self.conn.commit()
+        cursor.execute('''
+            drop table if exists SourceFile;
+            ''')
+        cursor.execute('''
+            drop table if exists SemesterControlForm;
+            ''')
+        for table in (*self.LOOKUP_TABLES.values(), *self.MATERIALIZED_TABLES, SEARCH_TABLE, VALIDATION_TABLE):
+            cursor.execute(f'drop table if exists {table};')
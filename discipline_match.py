@@ -0,0 +1,232 @@
+import os
+import re
+import sqlite3
+
+from database import PlanDatabase
+from search import stem
+
+# Способы сопоставления дисциплин разных планов: по названию, по индексу или по тому и другому
+MATCH_KEYS = ('name', 'ind', 'name_ind')
+# Виды часов в матрице сравнения: часы дисциплины из плана и суммы часов по её семестрам
+HOUR_TYPES = PlanDatabase.DISCIPLINE_HOUR_COLUMNS + PlanDatabase.HOUR_COLUMNS
+# Служебные слова, которые не влияют на сопоставление названий
+STOP_WORDS = frozenset(('и', 'в', 'во', 'на', 'с', 'со', 'по', 'для', 'к', 'о', 'об', 'от', 'из', 'а'))
+
+WORD = re.compile(r'\w+')
+
+
+def normalize_name(name: str | None) -> str:
+    """
+    Ключ названия дисциплины для сопоставления: основы слов без служебных слов, поэтому регистр
+    и форма слов не важны. Из названий вида 'Физическая культура / Адаптивная физическая культура'
+    берётся первый вариант. Пояснения в скобках остаются: 'Производственная практика (преддипломная)'
+    и 'Производственная практика (по профилю специальности)' - разные дисциплины
+    """
+    if not name:
+        return ''
+    name = name.split('/')[0].lower().replace('ё', 'е')
+    return ' '.join(stem(word) for word in WORD.findall(name) if word not in STOP_WORDS)
+
+
+def normalize_ind(ind: str | None) -> str:
+    """Ключ индекса дисциплины: верхний регистр без пробелов, номера из двух цифр ('огсэ.1' -> 'ОГСЭ.01')"""
+    if not ind:
+        return ''
+    parts = ind.upper().replace('Ё', 'Е').replace(' ', '').split('.')
+    return '.'.join(part.zfill(2) if part.isdigit() else part for part in parts)
+
+
+def discipline_key(name: str | None, ind: str | None, key: str = 'name') -> str:
+    """Ключ, по которому дисциплины разных планов считаются одной и той же дисциплиной"""
+    if key == 'name':
+        return normalize_name(name)
+    if key == 'ind':
+        return normalize_ind(ind)
+    if key == 'name_ind':
+        return f'{normalize_ind(ind)} {normalize_name(name)}'
+    raise ValueError(f"Неизвестный способ сопоставления: {key}. Доступные способы: {', '.join(MATCH_KEYS)}")
+
+
+def plans_in_folders(conn: sqlite3.Connection, folders: list[str]) -> list[int]:
+    """
+    id планов, загруженных из файлов в переданных папках (и их подпапках).
+    Пути файлов сохраняются только при инкрементальном импорте
+    """
+    prefixes = tuple(os.path.join(os.path.abspath(folder), '') for folder in folders)
+    rows = conn.execute('SELECT path, plan_id FROM SourceFile WHERE plan_id IS NOT NULL').fetchall()
+    return sorted({plan_id for path, plan_id in rows if os.path.abspath(path).startswith(prefixes)})
+
+
+class DisciplineIndex:
+    """
+    Индекс одинаковых дисциплин разных планов. Дисциплины с одинаковым ключом (discipline_key)
+    объединяются в группы, а их часы собираются в массивы NumPy, по которым матрица сравнения
+    дисциплина x план x вид часов строится без циклов по дисциплинам
+    """
+
+    # conn - соединение с БД, достаточно читающего
+    # plan_ids - id сравниваемых планов, None - все планы
+    # key - способ сопоставления дисциплин из MATCH_KEYS
+    def __init__(self, conn: sqlite3.Connection, plan_ids: list[int] | None = None, key: str = 'name'):
+        try:
+            import numpy as np
+        except ImportError:
+            raise ValueError('Для сравнения планов установите пакет numpy: pip install numpy') from None
+        self.np = np
+
+        condition, params = '', []
+        if plan_ids is not None:
+            condition, params = f'WHERE P.id IN ({", ".join("?" * len(plan_ids))})', list(plan_ids)
+        # Сведения о планах: по ним подписываются столбцы матрицы
+        self.plans: list[tuple] = conn.execute(f'''
+            SELECT P.id, P.name, P.cod, P.start_year, P.baza FROM Plan P {condition}
+            ORDER BY P.cod, P.start_year, P.id
+        ''', params).fetchall()
+        self.plan_ids = [plan[0] for plan in self.plans]
+        plan_index = {plan_id: index for index, plan_id in enumerate(self.plan_ids)}
+
+        rows = conn.execute(self.__hours_query(conn, condition), params).fetchall()
+
+        # Разных пар название-индекс намного меньше, чем дисциплин, поэтому ключи считаются по парам,
+        # а каждая дисциплина хранит только номер своей пары
+        pair_index: dict[tuple[str, str], int] = {}
+        row_pairs = []
+        for _, _, name, ind, *_ in rows:
+            pair = (name or '', ind or '')
+            number = pair_index.get(pair)
+            if number is None:
+                number = pair_index[pair] = len(pair_index)
+            row_pairs.append(number)
+        self.pairs = list(pair_index)
+
+        # План, пара и часы каждой дисциплины
+        self.row_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.row_plans = np.array([plan_index[row[1]] for row in rows], dtype=np.int64)
+        self.row_pairs = np.array(row_pairs, dtype=np.int64)
+        # NULL в БД означает, что часов этого вида нет, и хранится как NaN
+        self.hours = np.array([row[4:] for row in rows], dtype=np.float64).reshape(len(rows), len(HOUR_TYPES))
+
+        self.keys: list[str] = []
+        self.names: list[str] = []
+        self.row_groups = np.zeros(0, dtype=np.int64)
+        self.group(key)
+
+    def group(self, key: str):
+        """
+        Объединяет дисциплины в группы по ключу из MATCH_KEYS. Часы заново не читаются,
+        поэтому способ сопоставления можно менять без обращения к БД
+        """
+        np = self.np
+        self.key = key
+        group_index: dict[str, int] = {}
+        pair_groups = np.empty(len(self.pairs), dtype=np.int64)
+        for number, (name, ind) in enumerate(self.pairs):
+            pair_groups[number] = group_index.setdefault(discipline_key(name, ind, key), len(group_index))
+        self.keys = list(group_index)
+        self.row_groups = pair_groups[self.row_pairs]
+
+        # Подпись группы - название, которое чаще всего встречается у её дисциплин
+        pair_counts = np.bincount(self.row_pairs, minlength=len(self.pairs))
+        best = [-1] * len(self.keys)
+        for number, group in enumerate(pair_groups):
+            if best[group] < 0 or pair_counts[number] > pair_counts[best[group]]:
+                best[group] = number
+        self.names = [self.pairs[number][0].strip() for number in best]
+
+    @staticmethod
+    def __hours_query(conn: sqlite3.Connection, condition: str) -> str:
+        """Запрос часов всех дисциплин выбранных планов, суммы по семестрам берутся из агрегатов, если они есть"""
+        discipline_hours = ', '.join(f'D.{column}' for column in PlanDatabase.DISCIPLINE_HOUR_COLUMNS)
+        materialized = conn.execute("SELECT COUNT(*) FROM sqlite_master "
+                                    "WHERE type = 'table' AND name = 'DisciplineAggregate'").fetchone()[0]
+        if materialized:
+            semester_hours = ', '.join(f'A.{column}' for column in PlanDatabase.HOUR_COLUMNS)
+            return f'''
+                SELECT D.id, D.plan_id, D.name, D.ind, {discipline_hours}, {semester_hours}
+                FROM Discipline D
+                     JOIN Plan P ON P.id = D.plan_id
+                     LEFT JOIN DisciplineAggregate A ON A.discipline_id = D.id
+                {condition}
+                ORDER BY D.id'''
+        semester_hours = ', '.join(f'SUM(S.{column})' for column in PlanDatabase.HOUR_COLUMNS)
+        return f'''
+            SELECT D.id, D.plan_id, D.name, D.ind, {discipline_hours}, {semester_hours}
+            FROM Discipline D
+                 JOIN Plan P ON P.id = D.plan_id
+                 LEFT JOIN Semester S ON S.discipline_id = D.id
+            {condition}
+            GROUP BY D.id
+            ORDER BY D.id'''
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def hour_indexes(self, hour_types: list[str] | None) -> list[int]:
+        """Номера видов часов в HOUR_TYPES, None - все виды"""
+        if hour_types is None:
+            return list(range(len(HOUR_TYPES)))
+        unknown = [hour_type for hour_type in hour_types if hour_type not in HOUR_TYPES]
+        if unknown:
+            raise ValueError(f"Неизвестные виды часов: {', '.join(unknown)}. Доступные виды: {', '.join(HOUR_TYPES)}")
+        return [HOUR_TYPES.index(hour_type) for hour_type in hour_types]
+
+    def counts(self):
+        """Матрица группа x план с количеством дисциплин группы в плане, 0 - дисциплины в плане нет"""
+        np = self.np
+        flat = self.row_groups * len(self.plans) + self.row_plans
+        counts = np.bincount(flat, minlength=len(self.keys) * len(self.plans))
+        return counts.reshape(len(self.keys), len(self.plans))
+
+    def matrix(self, hour_types: list[str] | None = None):
+        """
+        Матрица сравнения группа x план x вид часов. Часы нескольких дисциплин одной группы в одном плане
+        складываются без учёта пустых, как nansum. Если дисциплины группы в плане нет или у всех её дисциплин
+        часы этого вида пустые, значение равно NaN
+        """
+        np = self.np
+        shape = (len(self.keys), len(self.plans))
+        size = shape[0] * shape[1]
+        flat = self.row_groups * len(self.plans) + self.row_plans
+        # Суммы и количество заполненных значений по ячейкам группа x план считаются для каждого вида часов
+        columns = []
+        for column in self.hour_indexes(hour_types):
+            hours = self.hours[:, column]
+            filled = ~np.isnan(hours)
+            sums = np.bincount(flat, weights=np.where(filled, hours, 0.0), minlength=size)
+            sums[np.bincount(flat, weights=filled, minlength=size) == 0] = np.nan
+            columns.append(sums)
+        return np.stack(columns, axis=-1).reshape(*shape, -1)
+
+    def compare(self, hour_type: str = 'total_hours_plan', min_plans: int = 2) -> list[dict]:
+        """
+        Сравнение часов одного вида по группам, которые встречаются хотя бы в min_plans планах:
+        часы в каждом плане, минимум, максимум, среднее и разброс. Группы с наибольшим разбросом идут первыми
+        """
+        np = self.np
+        values = self.matrix([hour_type])[:, :, 0]
+        present = ~np.isnan(values)
+        plans_count = present.sum(axis=1)
+        selected = np.flatnonzero(plans_count >= min_plans)
+        if not len(selected):
+            return []
+        values = values[selected]
+        minimum = np.nanmin(values, axis=1)
+        maximum = np.nanmax(values, axis=1)
+        mean = np.nanmean(values, axis=1)
+        spread = maximum - minimum
+        order = np.lexsort((selected, -spread))
+        return [{
+            'name': self.names[selected[row]],
+            'key': self.keys[selected[row]],
+            'plans': int(plans_count[selected[row]]),
+            'min': float(minimum[row]),
+            'max': float(maximum[row]),
+            'mean': float(mean[row]),
+            'spread': float(spread[row]),
+            'values': [None if np.isnan(value) else float(value) for value in values[row]],
+        } for row in order]
+
+    def plan_labels(self) -> list[str]:
+        """Подписи планов для столбцов: код, направление, год и база"""
+        return [f"{cod or ''} {(name or '').strip()} {start_year or ''} ({(baza or '').strip()})".strip()
+                for _, name, cod, start_year, baza in self.plans]
@@ -0,0 +1,132 @@
+import csv
+import os
+import sqlite3
+from typing import Callable, Iterable, Iterator
+
+# Форматы файлов, в которые можно экспортировать таблицу
+FORMATS = ('xlsx', 'csv', 'parquet')
+# Через сколько строк сообщать о прогрессе и записывать очередную часть в parquet
+BATCH_SIZE = 5000
+# Типы столбцов parquet для объявленных типов столбцов SQLite: имя типа pyarrow и приведение значения.
+# Столбцы без объявленного типа сохраняются как строки
+PARQUET_TYPES: dict[str, tuple[str, Callable]] = {
+    'INTEGER': ('int64', int),
+    'REAL': ('float64', float),
+    'BOOL': ('bool_', bool),
+    'TEXT': ('string', str),
+}
+
+
+def get_format(file_path: str) -> str:
+    """Определение формата файла по его расширению"""
+    file_format = os.path.splitext(file_path)[1].lstrip('.').lower()
+    if file_format not in FORMATS:
+        raise ValueError(f"Неподдерживаемый формат файла: {file_path}. Доступные форматы: {', '.join(FORMATS)}")
+    return file_format
+
+
+def iter_query_rows(conn: sqlite3.Connection, sql: str, params: list) -> Iterator[tuple]:
+    """Построчно возвращает результат запроса, не загружая его целиком в память"""
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    while rows := cursor.fetchmany(1000):
+        yield from rows
+
+
+def unique_headers(headers: list[str]) -> list[str]:
+    """Делает заголовки уникальными, так как в parquet имена столбцов не должны повторяться"""
+    seen: dict[str, int] = {}
+    result = []
+    for header in headers:
+        seen[header] = seen.get(header, 0) + 1
+        result.append(header if seen[header] == 1 else f'{header}_{seen[header]}')
+    return result
+
+
+def _write_csv(file_path: str, headers: list[str], rows: Iterable, progress: Callable[[int], None],
+               types: list[str | None]) -> int:
+    count = 0
+    with open(file_path, 'w', newline='', encoding='utf-8-sig') as file:
+        writer = csv.writer(file, delimiter=';')
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if count % BATCH_SIZE == 0:
+                progress(count)
+    return count
+
+
+def _write_xlsx(file_path: str, headers: list[str], rows: Iterable, progress: Callable[[int], None],
+                types: list[str | None]) -> int:
+    import openpyxl
+
+    count = 0
+    # В режиме write_only строки сразу сериализуются и не хранятся в книге
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet()
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+        count += 1
+        if count % BATCH_SIZE == 0:
+            progress(count)
+    wb.save(file_path)
+    wb.close()
+    return count
+
+
+def _write_parquet(file_path: str, headers: list[str], rows: Iterable, progress: Callable[[int], None],
+                   types: list[str | None]) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError('Для экспорта в parquet установите пакет pyarrow: pip install pyarrow')
+
+    # Схема задаётся заранее по объявленным типам, а не по первым строкам: столбец, пустой в начале
+    # результата, и столбец с разными типами значений всё равно получают один тип во всех частях файла
+    converters = [PARQUET_TYPES.get((column_type or '').upper(), PARQUET_TYPES['TEXT']) for column_type in types]
+    schema = pa.schema([pa.field(name, getattr(pa, type_name)())
+                        for name, (type_name, _) in zip(unique_headers(headers), converters)])
+    count = 0
+
+    def write_batch(writer: pq.ParquetWriter, batch: list):
+        columns = zip(*batch) if batch else [()] * len(schema)
+        arrays = [pa.array([None if value is None else convert(value) for value in column], type=field.type)
+                  for column, (_, convert), field in zip(columns, converters, schema)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+    with pq.ParquetWriter(file_path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) == BATCH_SIZE:
+                write_batch(writer, batch)
+                batch = []
+                progress(count)
+        if batch or not count:
+            write_batch(writer, batch)
+    return count
+
+
+def export_rows(file_path: str, headers: list[str], rows: Iterable,
+                progress: Callable[[int], None] | None = None, types: list[str | None] | None = None) -> int:
+    """
+    Записывает заголовки и строки в файл xlsx, csv или parquet. Формат определяется по расширению.
+    Строки записываются по мере поступления, не накапливаясь в памяти, поэтому расход памяти
+    не зависит от размера результата. progress вызывается с количеством уже записанных строк.
+    types - объявленные типы SQLite столбцов (INTEGER, REAL, BOOL, TEXT) для схемы parquet,
+    None на месте типа или вместо списка - столбец сохраняется как строки.
+    Столбцы строки после столбцов headers (например, ключ строки для модели таблицы) не записываются.
+    Возвращает количество записанных строк
+    """
+    writers = {'csv': _write_csv, 'xlsx': _write_xlsx, 'parquet': _write_parquet}
+    width = len(headers)
+    rows = (row[:width] for row in rows)
+    types = list(types) if types is not None else [None] * len(headers)
+    count = writers[get_format(file_path)](file_path, headers, rows, progress or (lambda count: None), types)
+    if progress is not None:
+        progress(count)
+    return count
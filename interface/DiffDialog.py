@@ -0,0 +1,49 @@
+import os
+
+from PyQt6.QtWidgets import (QDialog, QDialogButtonBox, QFileDialog, QHeaderView, QLabel, QMessageBox,
+                             QTableWidget, QTableWidgetItem, QVBoxLayout)
+
+from export import export_rows
+from plan_diff import DIFF_HEADERS, PlanDiff
+
+
+class DiffDialog(QDialog):
+    """Окно с различиями двух версий плана: по строке на каждое изменённое поле"""
+
+    # diff - различия версий плана
+    def __init__(self, diff: PlanDiff, parent=None):
+        super().__init__(parent)
+        self.diff = diff
+        self.rows = list(diff.rows())
+        self.setWindowTitle('Сравнение версий плана')
+        self.resize(1000, 600)
+
+        layout = QVBoxLayout(self)
+        summary = QLabel(f'Было: {os.path.basename(diff.old_path)}\n'
+                         f'Стало: {os.path.basename(diff.new_path)}\n'
+                         f'Дисциплин: {diff.summary()}')
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        table = QTableWidget(len(self.rows), len(DIFF_HEADERS))
+        table.setHorizontalHeaderLabels(DIFF_HEADERS)
+        for row, values in enumerate(self.rows):
+            for col, value in enumerate(values):
+                table.setItem(row, col, QTableWidgetItem('' if value is None else str(value)))
+        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Close)
+        buttons.accepted.connect(self.save_report)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def save_report(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, 'Сохранить различия', 'changes.xlsx',
+                                                   'Файлы Excel (*.xlsx);;Файлы CSV (*.csv)')
+        if not file_name:
+            return
+        try:
+            export_rows(file_name, DIFF_HEADERS, self.rows)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, 'Ошибка', f'Не удалось сохранить файл:\n{error}')
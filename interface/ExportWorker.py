@@ -0,0 +1,39 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from connection import get_connections
+from export import export_rows, iter_query_rows
+
+
+class ExportWorker(QObject):
+    """
+    Объект, который выполняет экспорт результата запроса в файл в отдельном потоке.
+    Строки читаются из БД курсором и сразу пишутся в файл, не накапливаясь в памяти
+    """
+    # Количество записанных строк
+    progress = pyqtSignal(int)
+    # Путь к файлу и количество записанных строк
+    finished = pyqtSignal(str, int)
+    # Текст ошибки, из-за которой экспорт не удалось выполнить
+    failed = pyqtSignal(str)
+
+    # types - объявленные типы столбцов SQLite, по ним задаются типы столбцов parquet
+    def __init__(self, db_path: str, sql: str, params: list, headers: list[str], file_path: str,
+                 types: list[str] | None = None):
+        super().__init__()
+        self.db_path = db_path
+        self.sql = sql
+        self.params = params
+        self.headers = headers
+        self.types = types
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            # Читающее соединение видит снимок БД на начало экспорта и не ждёт окончания импорта
+            with get_connections(self.db_path).reader() as conn:
+                count = export_rows(self.file_path, self.headers, iter_query_rows(conn, self.sql, self.params),
+                                    self.progress.emit, self.types)
+        except Exception as error:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+            return
+        self.finished.emit(self.file_path, count)
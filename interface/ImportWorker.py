@@ -0,0 +1,64 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from database import PlanDatabase
+from metrics import MetricsReport
+from plan_import import PlanImporter, ImportResult
+
+
+class ImportWorker(QObject):
+    """
+    Объект, который выполняет импорт папки с планами в отдельном потоке.
+    Пишущее соединение с БД создаётся внутри потока, так как соединение sqlite3
+    нельзя использовать из другого потока. Окно в это время читает БД своими соединениями,
+    а право на запись поток берёт только на время вставки очередного плана
+    """
+    # Количество обработанных результатов, их общее количество и результат по очередному файлу
+    progress = pyqtSignal(int, int, object)
+    # Список результатов по всем файлам и флаг отмены импорта
+    finished = pyqtSignal(list, bool)
+    # Текст ошибки, из-за которой импорт не удалось выполнить
+    failed = pyqtSignal(str)
+
+    # db_path - путь к файлу БД
+    # path - папка с файлами планов
+    # new_db - удалить все планы из БД перед импортом, на это пользователь соглашается в окне
+    def __init__(self, db_path: str, path: str, new_db: bool = False):
+        super().__init__()
+        self.db_path = db_path
+        self.path = path
+        self.new_db = new_db
+        self.importer: PlanImporter | None = None
+        # Замеры импорта, заполняются после его окончания
+        self.report: MetricsReport | None = None
+        self.done = 0
+        self.cancelled = False
+
+    def cancel(self):
+        """Отменяет импорт после обработки текущего файла"""
+        self.cancelled = True
+        if self.importer is not None:
+            self.importer.cancel()
+
+    def run(self):
+        db: PlanDatabase | None = None
+        try:
+            db = PlanDatabase(self.db_path, new_db=self.new_db)
+            self.importer = PlanImporter(db)
+            if self.cancelled:
+                self.importer.cancel()
+            results = self.importer.import_directory(self.path, self.on_result, incremental=True)
+            with self.importer.report.phase('create_view'):
+                db.create_view()
+            self.report = self.importer.report
+        except Exception as error:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+            return
+        finally:
+            # Соединение закрывается и после ошибки
+            if db is not None:
+                db.close()
+        self.finished.emit(results, self.importer.cancelled)
+
+    def on_result(self, result: ImportResult):
+        self.done += 1
+        self.progress.emit(self.done, self.importer.total, result)
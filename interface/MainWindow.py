@@ -1,13 +1,26 @@
 import os
+import sqlite3
 import sys
+import time
+from typing import TYPE_CHECKING
 
-import openpyxl
-from PyQt6.QtSql import QSqlQuery, QSqlDatabase
-from PyQt6.QtWidgets import QMainWindow, QFileDialog, QApplication, QCheckBox, QTableWidgetItem, QMessageBox
+from PyQt6.QtCore import QThread, QTimer
+from PyQt6.QtWidgets import QMainWindow, QFileDialog, QApplication, QCheckBox, QMessageBox
 
+from connection import get_connections
 from database import PlanDatabase
+from interface.ResultTableModel import ResultTableModel
 from interface.UI_MainWindow import Ui_MainWindow
-from plan_parse import Plan
+from query_builder import FLAT_TABLE, QueryFilter, build_query, column_types
+from search import SEARCH_HEADERS, build_search_query
+from validation import FINDING_HEADERS, RULES, build_findings_query, count_findings
+
+if TYPE_CHECKING:
+    # Импорт, экспорт и замеры загружаются при первом использовании, чтобы окно открывалось быстрее
+    from interface.ExportWorker import ExportWorker
+    from interface.ImportWorker import ImportWorker
+    from metrics import MetricsReport
+    from plan_import import ImportResult
 
 
 class MainWindow(QMainWindow):
@@ -16,87 +29,245 @@ class MainWindow(QMainWindow):
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
 
-        self.result: list[list] = [[0]]
+        self.model: ResultTableModel | None = None
+        # Запрос показываемых столбцов таблицы без ключа строки, для экспорта
+        self.export_query: tuple[str, list] | None = None
+        self.search_model: ResultTableModel | None = None
+        self.findings_model: ResultTableModel | None = None
+        self.column_headers: list[str] = []
+        self.column_types: list[str] = []
+        self.path = ''
+        self.import_thread: QThread | None = None
+        self.import_worker: ImportWorker | None = None
+        self.export_thread: QThread | None = None
+        self.export_worker: ExportWorker | None = None
+        # Замеры последнего импорта и запросов после него
+        self.metrics_report: MetricsReport | None = None
 
         self.db_connect('planDB.sqlite')
-        # Получение результата запроса
-        self.query.exec(f'SELECT * FROM All_data;')
+        # Списки фильтров и таблица заполняются при первом открытии их вкладок, а не при запуске
+        self.filters_filled = False
 
         self.ui.tabWidget.setCurrentIndex(0)
 
         self.ui.infoLabel.setText("Если вы впервые открыли программу, то следуйте инструкции ниже:\n"
                              "1. Нажмите на кнопку 'Выбрать папку'\n"
                              "2. Выберите папку с файлами с учебным планом и нажмите 'Открыть'\n"
-                             "3. Нажмите на кнопку 'Обработать файлы'\n"
-                             "3. Нажмите 'OK' и ждите, ничего не нажимая, даже если вылезет ошибка\n"
+                             "3. Нажмите на кнопку 'Обработать файлы' и дождитесь окончания обработки.\n"
+                             "Обработку можно прервать кнопкой 'Отменить'\n"
                              "4. Всё готово!\n\n"
                              "Вы можете выбрать какая вам нужна информация во второй\n"
                              "вкладке и посмотреть результаты в третьей вкладке.\n"
-                             "Вы также можете экспортировать текущую таблицу в Excel\n"
+                             "В четвёртой вкладке можно найти дисциплину по названию во всех планах.\n"
+                             "В пятой вкладке показаны дисциплины, часы которых не сходятся между собой.\n"
+                             "Кнопка 'Сравнить версии плана' показывает, чем отличаются два файла одного плана.\n"
+                             "Вы также можете экспортировать текущую таблицу в Excel, CSV или Parquet\n"
                              "нажав на кнопку 'Экспортировать в Excel' на третьей вкладке и введите имя файла.")
 
+        self.ui.import_progress.hide()
+        self.ui.cancel_btn.hide()
+        self.ui.metrics_btn.setEnabled(False)
+
         self.ui.select_btn.clicked.connect(self.open_select_dialog)
         self.ui.proc_btn.clicked.connect(self.load_files_to_database)
-        self.ui.tabWidget.tabBarClicked.connect(self.refresh_table)
+        self.ui.cancel_btn.clicked.connect(self.cancel_import)
+        self.ui.metrics_btn.clicked.connect(self.show_metrics)
+        self.ui.diff_btn.clicked.connect(self.show_plan_diff)
+        self.ui.tabWidget.currentChanged.connect(self.on_tab_changed)
         self.ui.export_btn.clicked.connect(self.export_table_to_xlsx)
 
-    def db_connect(self, db_name: str = 'MyDatabase'):
-        self.db_con = QSqlDatabase.addDatabase('QSQLITE')
-        self.db_con.setDatabaseName(db_name)
-        self.query = QSqlQuery(self.db_con)
+        # Поиск выполняется после паузы в наборе текста, а не после каждой нажатой клавиши
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.search_disciplines)
+        self.ui.search_le.textChanged.connect(lambda: self.search_timer.start())
+        self.ui.search_le.returnPressed.connect(self.search_disciplines)
+
+        self.ui.rule_cb.addItem('Все правила', None)
+        for rule in RULES:
+            self.ui.rule_cb.addItem(rule.title, rule.name)
+        self.ui.rule_cb.currentIndexChanged.connect(self.show_findings)
+        self.ui.revalidate_btn.clicked.connect(self.revalidate)
 
-        if not self.db_con.open():
-            print(f"Database Error: {self.db_con.lastError().databaseText()}")
+    def db_connect(self, db_name: str = 'MyDatabase'):
+        # Создаём недостающие таблицы и переводим БД на текущую схему
+        try:
+            PlanDatabase(db_name).close()
+        except sqlite3.Error as error:
+            print(f"Database Error: {error}")
             sys.exit(1)
+        # Окно только читает БД, поэтому таблица и фильтры работают и во время импорта
+        self.db_path = db_name
+        self.connections = get_connections(db_name)
 
     def open_select_dialog(self):
         file_dialog = QFileDialog()
         self.path = file_dialog.getExistingDirectory(self, "Выбрать", "")
-        self.db = PlanDatabase('planDB.sqlite', new_db=True)
 
-    def create_view(self):
-        self.db.create_view()
-        self.query.exec(f'SELECT * FROM All_data;')
-        self.ui.proc_btn.setText('Обработать файлы')
+    def load_files_to_database(self):
+        if not self.path:
+            self.show_message("Выберите папку", "Сначала выберите папку с файлами!")
+            return
+        if self.import_thread is not None:
+            return
+        new_db = self.ask_recreate_database()
+        if new_db is None:
+            return
+
+        self.success_files: list[str] = []
+        self.error_files: list[str] = []
+        self.import_start = time.perf_counter()
+
+        self.ui.proc_btn.setText('Обработка...')
+        self.ui.proc_btn.setEnabled(False)
+        self.ui.select_btn.setEnabled(False)
+        self.ui.cancel_btn.setEnabled(True)
+        self.ui.cancel_btn.show()
+        self.ui.import_progress.setValue(0)
+        self.ui.import_progress.show()
+        self.ui.progress_label.setText('Поиск файлов...')
+
+        # Импорт идёт в отдельном потоке, чтобы интерфейс не зависал
+        self.import_thread = QThread(self)
+        from interface.ImportWorker import ImportWorker
+
+        self.import_worker = ImportWorker(self.db_path, self.path, new_db=new_db)
+        self.import_worker.moveToThread(self.import_thread)
+        self.import_thread.started.connect(self.import_worker.run)
+        self.import_worker.progress.connect(self.on_import_progress)
+        self.import_worker.finished.connect(self.on_import_finished)
+        self.import_worker.failed.connect(self.on_import_failed)
+        self.import_thread.start()
+
+    def ask_recreate_database(self) -> bool | None:
+        """
+        Планы, загруженные без информации о файлах, нельзя обновить из папки инкрементально.
+        Если они есть, пользователь выбирает: пересоздать БД или добавить файлы к этим планам.
+        Возвращает True, если БД нужно пересоздать, False - если нет, None - если импорт отменён
+        """
+        try:
+            db = PlanDatabase(self.db_path)
+            untracked = db.count_untracked_plans()
+            db.close()
+        except sqlite3.Error as error:
+            self.show_message('Ошибка', f"Не удалось открыть БД:\n{error}")
+            return None
+        if not untracked:
+            return False
 
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(QMessageBox.Icon.Question)
+        msg_box.setWindowTitle('Обработка файлов')
+        msg_box.setText(f"В БД есть планы без информации о файлах, из которых они загружены: {untracked}. "
+                        f"Их нельзя обновить из папки.")
+        msg_box.setInformativeText("Пересоздать БД - все загруженные планы будут удалены, и в БД останутся "
+                                   "только планы из выбранной папки.\nОставить планы - файлы из папки будут "
+                                   "добавлены к ним, одинаковые планы могут повториться.")
+        recreate_btn = msg_box.addButton('Пересоздать БД', QMessageBox.ButtonRole.DestructiveRole)
+        keep_btn = msg_box.addButton('Оставить планы', QMessageBox.ButtonRole.AcceptRole)
+        msg_box.addButton(QMessageBox.StandardButton.Cancel)
+        msg_box.setDefaultButton(keep_btn)
+        msg_box.exec()
+        if msg_box.clickedButton() is recreate_btn:
+            return True
+        if msg_box.clickedButton() is keep_btn:
+            return False
+        return None
+
+    def cancel_import(self):
+        if self.import_worker is not None:
+            # Флаг читается потоком импорта между файлами, поэтому метод вызывается напрямую, а не через сигнал
+            self.import_worker.cancel()
+            self.ui.cancel_btn.setEnabled(False)
+            self.ui.progress_label.setText('Отмена после обработки текущего файла...')
+
+    def on_import_progress(self, done: int, total: int, result: 'ImportResult'):
+        if result.unchanged:
+            status = 'без изменений'
+        elif result.deleted:
+            status = 'удалён'
+        elif result.ok:
+            status = 'добавлен'
+            self.success_files.append(f"{result.plan.name} {str(result.plan.start_year)}")
+            print(result.plan.name)
+        else:
+            status = 'ошибка'
+            print(result.error)
+            self.error_files.append(result.file_name)
+
+        elapsed = time.perf_counter() - self.import_start
+        speed = done / elapsed if elapsed else 0
+        eta = (total - done) / speed if speed else 0
+        self.ui.import_progress.setMaximum(max(total, 1))
+        self.ui.import_progress.setValue(done)
+        self.ui.progress_label.setText(f"{done} из {total}, {speed:.1f} файлов/с, осталось ~{eta:.0f} с\n"
+                                       f"{result.file_name}: {status}")
+
+    def stop_import_thread(self):
+        self.import_thread.quit()
+        self.import_thread.wait()
+        self.import_thread = None
+        self.import_worker = None
+
+        self.ui.proc_btn.setText('Обработать файлы')
+        self.ui.proc_btn.setEnabled(True)
+        self.ui.select_btn.setEnabled(True)
+        self.ui.cancel_btn.hide()
+        self.ui.import_progress.hide()
+
+    def on_import_finished(self, results: list['ImportResult'], cancelled: bool):
+        self.metrics_report = self.import_worker.report
+        self.ui.metrics_btn.setEnabled(self.metrics_report is not None)
+        self.stop_import_thread()
+        self.ui.progress_label.setText('')
+
+        self.report = (f"В базу данных добавлены планы:\n"
+                       + '\n'.join(self.success_files)
+                       + "\n\nЭти файлы не удалось обработать из-за неправильной структуры файла:\n"
+                       + '\n'.join(self.error_files))
+        if cancelled:
+            self.report = "Обработка отменена, оставшиеся файлы не обработаны.\n\n" + self.report
+
+        self.show_import_report()
+
+    def on_import_failed(self, error: str):
+        self.stop_import_thread()
+        self.ui.progress_label.setText('')
+        print(error)
+        self.show_message('Ошибка', f"Не удалось обработать файлы:\n{error}")
+
+    def show_import_report(self):
+        start = time.perf_counter()
+        self.fill_filters()
+        if self.metrics_report is not None:
+            self.metrics_report.phases['fill_filters'] = (time.perf_counter() - start) * 1000
         self.show_message('Обработка файлов окончена', self.report)
 
-    def load_files_to_database(self):
+    def show_metrics(self):
+        if self.metrics_report is not None:
+            from interface.MetricsDialog import MetricsDialog
+
+            MetricsDialog(self.metrics_report, self).exec()
+
+    def show_plan_diff(self):
+        file_names, _ = QFileDialog.getOpenFileNames(self, 'Выберите две версии плана', self.path or '',
+                                                     'Учебные планы (*.xlsx *.xls)')
+        if not file_names:
+            return
+        if len(file_names) != 2:
+            self.show_message('Сравнение версий плана', 'Выберите ровно два файла: старую и новую версию плана')
+            return
+        from interface.DiffDialog import DiffDialog
+        from plan_diff import diff_files, revision_order
+
+        old_path, new_path = sorted(file_names, key=revision_order)
         try:
-            success_files = []
-            error_files = []
-            if self.path:
-                self.ui.proc_btn.setText('Обработка...')
-                self.show_message('Внимание!', "После нажатия на кнопку 'ОК' - приложение зависнет!\n"
-                                        "Не закрывайте приложение, будет идти обработка файлов!")
-            for root, dirs, files in os.walk(self.path):
-                for file in files:
-                    # Если формат файла - xlsx
-                    if file.endswith('.xlsx'):
-                        # Получение полного пути к файлу
-                        file_path = os.path.join(root, file)
-                        # Пробуем через try except, на случай ошибки, распарсить файл
-                        try:
-                            # Парсим файл с планом
-                            plan = Plan(file_path)
-                            # Вставляем данные из файла в БД
-                            self.db.insert_plan(plan)
-                            success_files.append(f"{plan.name} {str(plan.start_year)}")
-                            print(plan.name)
-                        except Exception as error:
-                            print(f"{type(error).__name__}: {error}")
-                            error_files.append(file)
-
-            self.report = (f"В базу данных добавлены планы:\n"
-                           + '\n'.join(success_files)
-                           + "\n\nЭти файлы не удалось обработать из-за неправильной структуры файла:\n"
-                           + '\n'.join(error_files))
-
-            self.create_view()
-
-        except AttributeError as error:
-            print(f"{type(error).__name__}: {error}")
-            self.show_message("Выберите папку", "Сначала выберите папку с файлами!")
+            diff = diff_files(old_path, new_path)
+        except Exception as error:
+            self.show_message('Ошибка', f"Не удалось прочитать план:\n{type(error).__name__}: {error}")
+            return
+        DiffDialog(diff, self).exec()
 
     def show_message(self, title, message):
         msg_box = QMessageBox(self)
@@ -107,13 +278,8 @@ class MainWindow(QMainWindow):
 
     def get_need_attrs(self):
         # Получаем индексы и названия нужных атрибутов
-        # Добавляем в список result записи
         self.need_atr: {int: str} = {}
 
-        # Очищаем список от прошлого результата
-        if self.result:
-            self.result.clear()
-
         # Проверяем чекбоксы в первом столбце
         for ind, child_widget in enumerate(self.ui.planAttrsGB.children()):
             if isinstance(child_widget, QCheckBox) and child_widget.isChecked():
@@ -131,48 +297,119 @@ class MainWindow(QMainWindow):
                 ind = ind + len(self.ui.planAttrsGB.children()) + len(self.ui.disciplineAttrsGB.children()) - 2
                 self.need_atr[ind - 1] = child_widget.text()
 
-        # Проходимся по всем записям и вытаскиваем нужные данные
-        if self.query.first():
-            self.result.append([self.query.value(i) for i in self.need_atr.keys()])
-
-        while self.query.next():
-            self.result.append([self.query.value(i) for i in self.need_atr.keys()])
-
-        # print(len(self.result[0]), len(self.result))
+    def fill_combo_box(self, combo_box, sql: str):
+        # Заполняем выпадающий список значениями из БД, первым идёт пункт без фильтрации
+        current = combo_box.currentData()
+        combo_box.clear()
+        combo_box.addItem('Все', None)
+        with self.connections.reader() as conn:
+            for value, in conn.execute(sql):
+                combo_box.addItem('' if value is None else str(value), value)
+        index = combo_box.findData(current)
+        combo_box.setCurrentIndex(max(index, 0))
+
+    def on_tab_changed(self, index: int):
+        # Запросы к БД выполняются только для открытой вкладки: фильтры - на вкладках со столбцами
+        # и с результатом, а сама таблица - на вкладке с результатом
+        tab = self.ui.tabWidget.widget(index)
+        if tab in (self.ui.attrsTab, self.ui.tableTab) and not self.filters_filled:
+            self.fill_filters()
+        if tab is self.ui.tableTab:
+            self.refresh_table()
+        if tab is self.ui.validationTab:
+            self.show_findings()
+
+    def fill_filters(self):
+        self.filters_filled = True
+        self.fill_combo_box(self.ui.facultet_cb, 'SELECT name FROM Facultet ORDER BY name')
+        self.fill_combo_box(self.ui.start_year_cb, 'SELECT DISTINCT start_year FROM Plan ORDER BY start_year')
+        self.fill_combo_box(self.ui.control_form_cb, 'SELECT name FROM ControlForm ORDER BY id')
+
+    def get_query_filter(self) -> QueryFilter:
+        # Значение 0 в полях семестров означает, что ограничения нет
+        return QueryFilter(
+            facultet=self.ui.facultet_cb.currentData(),
+            start_year=self.ui.start_year_cb.currentData(),
+            cod=self.ui.cod_le.text().strip() or None,
+            sem_from=self.ui.sem_from_sb.value() or None,
+            sem_to=self.ui.sem_to_sb.value() or None,
+            control_form=self.ui.control_form_cb.currentData(),
+        )
 
-    def set_table_prop(self):
-        # Количество строк и столбцов
-        row = len(self.result)
-        # print(self.result)
+    def is_materialized(self) -> bool:
+        # Если в БД есть материализованная таблица, данные читаются из неё без соединения таблиц
+        with self.connections.reader() as conn:
+            cursor = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                  (FLAT_TABLE,))
+            return bool(cursor.fetchone()[0])
+
+    def set_table_model(self):
+        # В запросе выбираются только нужные столбцы и строки,
+        # а сами строки читаются моделью из БД страницами по ключу строки по мере прокрутки таблицы
+        columns = list(self.need_atr.keys())
+        self.column_headers = list(self.need_atr.values())
+        self.column_types = column_types(columns)
+        query_filter = self.get_query_filter()
+        materialized = self.is_materialized()
+        sql, params = build_query(columns, query_filter, materialized, keys=True)
+        # Экспортируются только показываемые столбцы, без ключа строки, по которому модель читает страницы
+        self.export_query = build_query(columns, query_filter, materialized)
+        start = time.perf_counter()
+        self.model = ResultTableModel(self.connections, sql, params, self.column_headers, self)
+        if self.metrics_report is not None:
+            # Время последнего запроса к All_data (подсчёт строк и первая страница) и количество строк
+            self.model.data(self.model.index(0, 0))
+            self.metrics_report.phases['query'] = (time.perf_counter() - start) * 1000
+            self.metrics_report.counters['query_rows'] = self.model.row_count
+        self.ui.tableView.setModel(self.model)
+        self.ui.tableView.horizontalHeader().setStretchLastSection(True)
+
+    def search_disciplines(self):
+        # Поиск по полнотекстовому индексу, найденные строки читаются моделью по мере прокрутки
+        self.search_timer.stop()
+        query = build_search_query(self.ui.search_le.text(), limit=None, keys=True)
+        if query is None:
+            self.search_model = None
+            self.ui.searchView.setModel(None)
+            self.ui.search_lbl.setText('')
+            return
+        sql, params = query
+        start = time.perf_counter()
+        self.search_model = ResultTableModel(self.connections, sql, params, SEARCH_HEADERS, self)
+        self.search_model.data(self.search_model.index(0, 0))
+        elapsed = (time.perf_counter() - start) * 1000
+        self.ui.searchView.setModel(self.search_model)
+        self.ui.searchView.horizontalHeader().setStretchLastSection(True)
+        self.ui.search_lbl.setText(f"Найдено дисциплин: {self.search_model.row_count} за {elapsed:.0f} мс")
+
+    def show_findings(self):
+        # Нарушения записываются при импорте, поэтому список только читается из БД
+        rule = self.ui.rule_cb.currentData()
+        sql, params = build_findings_query(rule, keys=True)
+        self.findings_model = ResultTableModel(self.connections, sql, params, FINDING_HEADERS, self)
+        self.ui.findingsView.setModel(self.findings_model)
+        self.ui.findingsView.horizontalHeader().setStretchLastSection(True)
+        with self.connections.reader() as conn:
+            findings, plans = count_findings(conn, rule)
+        self.ui.validation_lbl.setText(f"Нарушений: {findings}, планов с нарушениями: {plans}")
+
+    def revalidate(self):
+        # Полная проверка пишет в БД, поэтому не запускается во время импорта
+        if self.import_thread is not None:
+            self.show_message('Проверка', 'Дождитесь окончания обработки файлов')
+            return
         try:
-            col = len(self.result[0])
-        except IndexError:
-            col = 0
-        if not col:
-            row = 0
-        self.ui.tableWidget.setRowCount(row)
-        self.ui.tableWidget.setColumnCount(col)
-
-        # Заголовок
-        self.column_headers = self.need_atr.values()
-        self.ui.tableWidget.setHorizontalHeaderLabels(self.column_headers)
-        self.ui.tableWidget.horizontalHeader().setStretchLastSection(True)
-
-    def insert_values_to_table(self):
-        # Заполнение таблицы
-        for row, result in enumerate(self.result):
-            for column, value in enumerate(result):
-                item = QTableWidgetItem(str(value))
-                self.ui.tableWidget.setItem(row, column, item)
-
-        # Изменение размеров строк и столбцов
-        # self.ui.tableWidget.resizeColumnsToContents()
-        self.ui.tableWidget.resizeRowsToContents()
+            db = PlanDatabase(self.db_path)
+            db.validate()
+            db.close()
+        except sqlite3.Error as error:
+            self.show_message('Ошибка', f"Не удалось проверить планы:\n{error}")
+            return
+        self.show_findings()
 
     def refresh_table(self):
         self.get_need_attrs()
-        self.set_table_prop()
-        self.insert_values_to_table()
+        self.set_table_model()
 
     def get_new_file_name(self) -> str:
         file_dialog = QFileDialog(self)
@@ -183,41 +420,76 @@ class MainWindow(QMainWindow):
         executable_path = sys.argv[0]
         project_directory = os.path.dirname(os.path.abspath(executable_path))
 
+        # Фильтры диалога и расширения файлов для них
+        filters = {
+            "Файлы Excel (*.xlsx)": '.xlsx',
+            "Файлы CSV (*.csv)": '.csv',
+            "Файлы Parquet (*.parquet)": '.parquet',
+        }
+
         file_name: str
-        file_name, _ = file_dialog.getSaveFileName(
+        file_name, selected_filter = file_dialog.getSaveFileName(
             self,
             "Сохранить файл",
             project_directory,
-            "Файлы Excel (*.xlsx)",
+            ';;'.join(filters),
             # options=options
         )
 
         if file_name:
-            if file_name.endswith('.xlsx'):
+            extension = filters.get(selected_filter, '.xlsx')
+            if file_name.endswith(tuple(filters.values())):
                 return file_name
             else:
-                return file_name + '.xlsx'
+                return file_name + extension
         else:
             return 'Output.xlsx'
 
     def export_table_to_xlsx(self):
-        wb = openpyxl.Workbook()
-
-        sheet = wb.active
-
-        sheet.append(list(self.column_headers))
-
-        # Заполнение таблицы
-        for row in self.result:
-            sheet.append(row)
+        if self.export_thread is not None:
+            return
+        if self.model is None:
+            self.refresh_table()
 
         file_path = self.get_new_file_name()
-        wb.save(file_path)
-        wb.close()
-        file_name = file_path.split('/')[-1]
+        self.ui.export_btn.setEnabled(False)
+        self.statusBar().showMessage('Экспорт...')
+
+        # Экспорт идёт в отдельном потоке со своим читающим соединением с БД
+        self.export_thread = QThread(self)
+        from interface.ExportWorker import ExportWorker
+
+        sql, params = self.export_query
+        self.export_worker = ExportWorker(self.db_path, sql, params, self.column_headers, file_path, self.column_types)
+        self.export_worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_thread.start()
+
+    def on_export_progress(self, count: int):
+        self.statusBar().showMessage(f"Экспорт: записано {count} из {self.model.row_count} строк")
+
+    def stop_export_thread(self):
+        self.export_thread.quit()
+        self.export_thread.wait()
+        self.export_thread = None
+        self.export_worker = None
+        self.ui.export_btn.setEnabled(True)
+        self.statusBar().clearMessage()
+
+    def on_export_finished(self, file_path: str, count: int):
+        self.stop_export_thread()
+        file_name = os.path.basename(file_path)
         self.show_message("Файл сохранён", f"Файл {file_name} успешно сохранён"
                                            f" по пути {file_path}")
 
+    def on_export_failed(self, error: str):
+        self.stop_export_thread()
+        print(error)
+        self.show_message('Ошибка', f"Не удалось сохранить файл:\n{error}")
+
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
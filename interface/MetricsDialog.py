@@ -0,0 +1,60 @@
+from PyQt6.QtWidgets import (QDialog, QDialogButtonBox, QFileDialog, QHeaderView, QLabel, QTableWidget,
+                             QTableWidgetItem, QVBoxLayout)
+
+from metrics import MetricsReport
+
+
+class MetricsDialog(QDialog):
+    """Окно с отчётом о замерах последнего импорта: этапы всего импорта и таблица по каждому файлу"""
+
+    HEADERS = ('Файл', 'Статус', 'Дисциплин', 'Семестров', 'Разбор, мс', 'Вставка, мс', 'Всего, мс', 'Память, КБ')
+
+    # report - отчёт о замерах импорта
+    def __init__(self, report: MetricsReport, parent=None):
+        super().__init__(parent)
+        self.report = report
+        self.setWindowTitle('Замеры импорта')
+        self.resize(900, 500)
+
+        layout = QVBoxLayout(self)
+        summary = QLabel(self.summary_text())
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        table = QTableWidget(len(report.files), len(self.HEADERS))
+        table.setHorizontalHeaderLabels(self.HEADERS)
+        table.setSortingEnabled(False)
+        for row, metrics in enumerate(report.files):
+            parse = sum(ms for name, ms in metrics.phases.items() if name.startswith('parse.'))
+            insert = sum(ms for name, ms in metrics.phases.items() if name.startswith('insert.'))
+            memory = '' if metrics.peak_memory_kb is None else f'{metrics.peak_memory_kb:.0f}'
+            values = (metrics.file_path, metrics.status, metrics.disciplines, metrics.semesters,
+                      f'{parse:.1f}', f'{insert:.1f}', f'{metrics.total_ms:.1f}', memory)
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                # Числа сортируются как числа, а не как строки
+                item.setData(0, value if isinstance(value, int) else str(value))
+                table.setItem(row, col, item)
+        table.setSortingEnabled(True)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Close)
+        buttons.accepted.connect(self.save_report)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def summary_text(self) -> str:
+        """Счётчики, этапы всего импорта и суммарное время этапов по всем файлам"""
+        lines = [', '.join(f'{name}: {value}' for name, value in self.report.counters.items())]
+        if self.report.phases:
+            lines.append('Этапы: ' + ', '.join(f'{name} {ms:.1f} мс' for name, ms in self.report.phases.items()))
+        totals = self.report.phase_totals()
+        if totals:
+            lines.append('По всем файлам: ' + ', '.join(f'{name} {ms:.1f} мс' for name, ms in totals.items()))
+        return '\n'.join(lines)
+
+    def save_report(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, 'Сохранить отчёт', 'metrics.json', 'Файлы JSON (*.json)')
+        if file_name:
+            self.report.save(file_name)
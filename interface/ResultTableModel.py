@@ -0,0 +1,141 @@
+import sqlite3
+from collections import OrderedDict
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from connection import ConnectionManager
+
+
+class ResultTableModel(QAbstractTableModel):
+    """
+    Модель таблицы с результатом запроса к БД. Строки читаются из БД страницами
+    по мере прокрутки, а в памяти хранится только несколько последних страниц,
+    поэтому расход памяти не зависит от размера результата.
+
+    После столбцов headers запрос возвращает ключ строки - столбцы key0, key1, ... (см. query_builder.key_columns).
+    Строки показываются упорядоченными по ключу, а страница читается начиная с ключа последней строки
+    предыдущей страницы, а не через OFFSET: поэтому порядок строк не зависит от плана запроса,
+    а чтение дальней страницы не перебирает все строки перед ней
+    """
+
+    # Количество строк в одной странице
+    PAGE_SIZE = 500
+    # Сколько страниц держать в памяти одновременно
+    MAX_PAGES = 8
+
+    # connections - соединения с БД, запросы выполняются через читающие соединения
+    # sql - запрос, результат которого показывается в таблице, со столбцами ключа строки после столбцов headers
+    # params - значения параметров запроса
+    # headers - заголовки столбцов результата запроса
+    def __init__(self, connections: ConnectionManager, sql: str, params: list, headers: list[str], parent=None):
+        super().__init__(parent)
+        self.connections = connections
+        self.sql = sql
+        self.params = params
+        self.headers = headers
+        self.pages: OrderedDict[int, list[tuple]] = OrderedDict()
+        # Ключ последней строки каждой прочитанной страницы: с него начинается следующая страница
+        self.page_ends: dict[int, tuple] = {}
+        self.keys = self.__key_names() if headers else []
+        self.row_count = self.__count_rows() if headers else 0
+
+    def __exec(self, sql: str, params: list | tuple = ()) -> list[tuple]:
+        """
+        Выполнение запроса с параметрами модели и дополнительными параметрами через читающее соединение.
+        Читающие соединения не блокируются пишущим, поэтому таблица листается и во время импорта
+        """
+        try:
+            with self.connections.reader() as conn:
+                return conn.execute(sql, [*self.params, *params]).fetchall()
+        except sqlite3.Error as error:
+            print(f"Query Error: {error}")
+            return []
+
+    def __key_names(self) -> list[str]:
+        """Имена столбцов ключа строки: все столбцы запроса после столбцов headers"""
+        try:
+            with self.connections.reader() as conn:
+                description = conn.execute(f'SELECT * FROM ({self.sql}) LIMIT 0', self.params).description
+        except sqlite3.Error as error:
+            print(f"Query Error: {error}")
+            return []
+        keys = [column[0] for column in description[len(self.headers):]]
+        if not keys:
+            raise ValueError('Запрос для таблицы должен возвращать ключ строки после показываемых столбцов')
+        return keys
+
+    def __count_rows(self) -> int:
+        """Получение количества строк в результате запроса без чтения самих строк"""
+        rows = self.__exec(f'SELECT COUNT(*) FROM ({self.sql})')
+        return rows[0][0] if rows else 0
+
+    def __after(self, key: tuple | None) -> str:
+        """Условие на строки после строки с ключом key, None - с первой строки"""
+        if key is None:
+            return ''
+        return f"WHERE ({', '.join(self.keys)}) > ({', '.join('?' * len(key))})"
+
+    def __find_page_ends(self, page: int):
+        """
+        Поиск ключей последних строк страниц перед page, начиная с ближайшей прочитанной страницы.
+        Нужен только при переходе сразу к дальней странице, при прокрутке ключи уже известны
+        """
+        known = max((number for number in self.page_ends if number < page), default=None)
+        start = self.page_ends.get(known)
+        first = 0 if known is None else known + 1
+        keys = ', '.join(self.keys)
+        rows = self.__exec(f'''
+            SELECT {keys} FROM (
+                SELECT {keys}, ROW_NUMBER() OVER (ORDER BY {keys}) AS page_row
+                FROM ({self.sql}) {self.__after(start)}
+            )
+            WHERE page_row % {self.PAGE_SIZE} = 0
+            LIMIT {page - first}''', start or ())
+        for number, key in enumerate(rows, first):
+            self.page_ends[number] = key
+
+    def __get_page(self, page: int) -> list[tuple]:
+        """Получение страницы строк из кэша или из БД"""
+        if page in self.pages:
+            self.pages.move_to_end(page)
+            return self.pages[page]
+
+        if page > 0 and page - 1 not in self.page_ends:
+            self.__find_page_ends(page)
+        start = self.page_ends.get(page - 1)
+        if page > 0 and start is None:
+            return []
+        rows = self.__exec(f"SELECT * FROM ({self.sql}) {self.__after(start)} "
+                           f"ORDER BY {', '.join(self.keys)} LIMIT {self.PAGE_SIZE}", start or ())
+        if len(rows) == self.PAGE_SIZE:
+            self.page_ends[page] = rows[-1][len(self.headers):]
+
+        self.pages[page] = rows
+        # Удаляем страницы, которые дольше всего не запрашивались
+        if len(self.pages) > self.MAX_PAGES:
+            self.pages.popitem(last=False)
+        return rows
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        page, row = divmod(index.row(), self.PAGE_SIZE)
+        rows = self.__get_page(page)
+        if row >= len(rows):
+            return None
+        value = rows[row][index.column()]
+        # Пустые значения показываются пустой ячейкой, а не None
+        return '' if value is None else str(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return section + 1
@@ -40,6 +40,14 @@ class Ui_MainWindow(object):
         self.infoLabel.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         self.infoLabel.setObjectName("infoLabel")
         self.verticalLayout_2.addWidget(self.infoLabel)
+        self.import_progress = QtWidgets.QProgressBar(parent=self.infoTab)
+        self.import_progress.setProperty("value", 0)
+        self.import_progress.setObjectName("import_progress")
+        self.verticalLayout_2.addWidget(self.import_progress)
+        self.progress_label = QtWidgets.QLabel(parent=self.infoTab)
+        self.progress_label.setText("")
+        self.progress_label.setObjectName("progress_label")
+        self.verticalLayout_2.addWidget(self.progress_label)
         self.horizontalLayout = QtWidgets.QHBoxLayout()
         self.horizontalLayout.setObjectName("horizontalLayout")
         self.proc_btn = QtWidgets.QPushButton(parent=self.infoTab)
@@ -61,6 +69,33 @@ class Ui_MainWindow(object):
         self.select_btn.setLayoutDirection(QtCore.Qt.LayoutDirection.LeftToRight)
         self.select_btn.setObjectName("select_btn")
         self.horizontalLayout.addWidget(self.select_btn)
+        self.cancel_btn = QtWidgets.QPushButton(parent=self.infoTab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.cancel_btn.sizePolicy().hasHeightForWidth())
+        self.cancel_btn.setSizePolicy(sizePolicy)
+        self.cancel_btn.setMinimumSize(QtCore.QSize(150, 0))
+        self.cancel_btn.setObjectName("cancel_btn")
+        self.horizontalLayout.addWidget(self.cancel_btn)
+        self.metrics_btn = QtWidgets.QPushButton(parent=self.infoTab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.metrics_btn.sizePolicy().hasHeightForWidth())
+        self.metrics_btn.setSizePolicy(sizePolicy)
+        self.metrics_btn.setMinimumSize(QtCore.QSize(150, 0))
+        self.metrics_btn.setObjectName("metrics_btn")
+        self.horizontalLayout.addWidget(self.metrics_btn)
+        self.diff_btn = QtWidgets.QPushButton(parent=self.infoTab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.diff_btn.sizePolicy().hasHeightForWidth())
+        self.diff_btn.setSizePolicy(sizePolicy)
+        self.diff_btn.setMinimumSize(QtCore.QSize(150, 0))
+        self.diff_btn.setObjectName("diff_btn")
+        self.horizontalLayout.addWidget(self.diff_btn)
         self.verticalLayout_2.addLayout(self.horizontalLayout)
         self.tabWidget.addTab(self.infoTab, "")
         self.attrsTab = QtWidgets.QWidget()
@@ -184,20 +219,103 @@ class Ui_MainWindow(object):
         spacerItem2 = QtWidgets.QSpacerItem(20, 108, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
         self.verticalLayout_4.addItem(spacerItem2)
         self.horizontalLayout_2.addWidget(self.semesterAttrsGB)
+        self.filtersGB = QtWidgets.QGroupBox(parent=self.attrsTab)
+        self.filtersGB.setObjectName("filtersGB")
+        self.formLayout = QtWidgets.QFormLayout(self.filtersGB)
+        self.formLayout.setObjectName("formLayout")
+        self.facultet_lbl = QtWidgets.QLabel(parent=self.filtersGB)
+        self.facultet_lbl.setObjectName("facultet_lbl")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.ItemRole.LabelRole, self.facultet_lbl)
+        self.facultet_cb = QtWidgets.QComboBox(parent=self.filtersGB)
+        self.facultet_cb.setObjectName("facultet_cb")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.ItemRole.FieldRole, self.facultet_cb)
+        self.start_year_lbl = QtWidgets.QLabel(parent=self.filtersGB)
+        self.start_year_lbl.setObjectName("start_year_lbl")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.ItemRole.LabelRole, self.start_year_lbl)
+        self.start_year_cb = QtWidgets.QComboBox(parent=self.filtersGB)
+        self.start_year_cb.setObjectName("start_year_cb")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.ItemRole.FieldRole, self.start_year_cb)
+        self.cod_lbl = QtWidgets.QLabel(parent=self.filtersGB)
+        self.cod_lbl.setObjectName("cod_lbl")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.ItemRole.LabelRole, self.cod_lbl)
+        self.cod_le = QtWidgets.QLineEdit(parent=self.filtersGB)
+        self.cod_le.setObjectName("cod_le")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.ItemRole.FieldRole, self.cod_le)
+        self.sem_from_lbl = QtWidgets.QLabel(parent=self.filtersGB)
+        self.sem_from_lbl.setObjectName("sem_from_lbl")
+        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.LabelRole, self.sem_from_lbl)
+        self.sem_from_sb = QtWidgets.QSpinBox(parent=self.filtersGB)
+        self.sem_from_sb.setMaximum(12)
+        self.sem_from_sb.setObjectName("sem_from_sb")
+        self.formLayout.setWidget(3, QtWidgets.QFormLayout.ItemRole.FieldRole, self.sem_from_sb)
+        self.sem_to_lbl = QtWidgets.QLabel(parent=self.filtersGB)
+        self.sem_to_lbl.setObjectName("sem_to_lbl")
+        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.LabelRole, self.sem_to_lbl)
+        self.sem_to_sb = QtWidgets.QSpinBox(parent=self.filtersGB)
+        self.sem_to_sb.setMaximum(12)
+        self.sem_to_sb.setObjectName("sem_to_sb")
+        self.formLayout.setWidget(4, QtWidgets.QFormLayout.ItemRole.FieldRole, self.sem_to_sb)
+        self.control_form_lbl = QtWidgets.QLabel(parent=self.filtersGB)
+        self.control_form_lbl.setObjectName("control_form_lbl")
+        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.LabelRole, self.control_form_lbl)
+        self.control_form_cb = QtWidgets.QComboBox(parent=self.filtersGB)
+        self.control_form_cb.setObjectName("control_form_cb")
+        self.formLayout.setWidget(5, QtWidgets.QFormLayout.ItemRole.FieldRole, self.control_form_cb)
+        self.horizontalLayout_2.addWidget(self.filtersGB)
         self.tabWidget.addTab(self.attrsTab, "")
         self.tableTab = QtWidgets.QWidget()
         self.tableTab.setObjectName("tableTab")
         self.gridLayout = QtWidgets.QGridLayout(self.tableTab)
         self.gridLayout.setObjectName("gridLayout")
-        self.tableWidget = QtWidgets.QTableWidget(parent=self.tableTab)
-        self.tableWidget.setObjectName("tableWidget")
-        self.tableWidget.setColumnCount(0)
-        self.tableWidget.setRowCount(0)
-        self.gridLayout.addWidget(self.tableWidget, 0, 0, 1, 1)
+        self.tableView = QtWidgets.QTableView(parent=self.tableTab)
+        self.tableView.setObjectName("tableView")
+        self.gridLayout.addWidget(self.tableView, 0, 0, 1, 1)
         self.export_btn = QtWidgets.QPushButton(parent=self.tableTab)
         self.export_btn.setObjectName("export_btn")
         self.gridLayout.addWidget(self.export_btn, 1, 0, 1, 1)
         self.tabWidget.addTab(self.tableTab, "")
+        self.searchTab = QtWidgets.QWidget()
+        self.searchTab.setObjectName("searchTab")
+        self.verticalLayout_6 = QtWidgets.QVBoxLayout(self.searchTab)
+        self.verticalLayout_6.setObjectName("verticalLayout_6")
+        self.search_le = QtWidgets.QLineEdit(parent=self.searchTab)
+        self.search_le.setClearButtonEnabled(True)
+        self.search_le.setObjectName("search_le")
+        self.verticalLayout_6.addWidget(self.search_le)
+        self.search_lbl = QtWidgets.QLabel(parent=self.searchTab)
+        self.search_lbl.setText("")
+        self.search_lbl.setObjectName("search_lbl")
+        self.verticalLayout_6.addWidget(self.search_lbl)
+        self.searchView = QtWidgets.QTableView(parent=self.searchTab)
+        self.searchView.setObjectName("searchView")
+        self.verticalLayout_6.addWidget(self.searchView)
+        self.tabWidget.addTab(self.searchTab, "")
+        self.validationTab = QtWidgets.QWidget()
+        self.validationTab.setObjectName("validationTab")
+        self.verticalLayout_7 = QtWidgets.QVBoxLayout(self.validationTab)
+        self.verticalLayout_7.setObjectName("verticalLayout_7")
+        self.validationLayout = QtWidgets.QHBoxLayout()
+        self.validationLayout.setObjectName("validationLayout")
+        self.rule_cb = QtWidgets.QComboBox(parent=self.validationTab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.rule_cb.sizePolicy().hasHeightForWidth())
+        self.rule_cb.setSizePolicy(sizePolicy)
+        self.rule_cb.setObjectName("rule_cb")
+        self.validationLayout.addWidget(self.rule_cb)
+        self.revalidate_btn = QtWidgets.QPushButton(parent=self.validationTab)
+        self.revalidate_btn.setObjectName("revalidate_btn")
+        self.validationLayout.addWidget(self.revalidate_btn)
+        self.verticalLayout_7.addLayout(self.validationLayout)
+        self.validation_lbl = QtWidgets.QLabel(parent=self.validationTab)
+        self.validation_lbl.setText("")
+        self.validation_lbl.setObjectName("validation_lbl")
+        self.verticalLayout_7.addWidget(self.validation_lbl)
+        self.findingsView = QtWidgets.QTableView(parent=self.validationTab)
+        self.findingsView.setObjectName("findingsView")
+        self.verticalLayout_7.addWidget(self.findingsView)
+        self.tabWidget.addTab(self.validationTab, "")
         self.verticalLayout_5.addWidget(self.tabWidget)
         MainWindow.setCentralWidget(self.centralwidget)
         self.menubar = QtWidgets.QMenuBar(parent=MainWindow)
@@ -218,6 +336,9 @@ class Ui_MainWindow(object):
         self.infoLabel.setText(_translate("MainWindow", "text"))
         self.proc_btn.setText(_translate("MainWindow", "Обработать файлы"))
         self.select_btn.setText(_translate("MainWindow", "Выбрать папку"))
+        self.cancel_btn.setText(_translate("MainWindow", "Отменить"))
+        self.metrics_btn.setText(_translate("MainWindow", "Замеры импорта"))
+        self.diff_btn.setText(_translate("MainWindow", "Сравнить версии плана"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.infoTab), _translate("MainWindow", "Справка"))
         self.planAttrsGB.setTitle(_translate("MainWindow", "План"))
         self.napr_chb.setText(_translate("MainWindow", "Направление"))
@@ -254,6 +375,19 @@ class Ui_MainWindow(object):
         self.s_cons_h_chb.setText(_translate("MainWindow", "Конс"))
         self.s_patt_h_chb.setText(_translate("MainWindow", "ПАтт"))
         self.control_from_chb.setText(_translate("MainWindow", "Форма контроля"))
+        self.filtersGB.setTitle(_translate("MainWindow", "Фильтры"))
+        self.facultet_lbl.setText(_translate("MainWindow", "Факультет"))
+        self.start_year_lbl.setText(_translate("MainWindow", "Год начала"))
+        self.cod_lbl.setText(_translate("MainWindow", "Код специальности"))
+        self.sem_from_lbl.setText(_translate("MainWindow", "Семестр с"))
+        self.sem_from_sb.setSpecialValueText(_translate("MainWindow", "-"))
+        self.sem_to_lbl.setText(_translate("MainWindow", "Семестр по"))
+        self.sem_to_sb.setSpecialValueText(_translate("MainWindow", "-"))
+        self.control_form_lbl.setText(_translate("MainWindow", "Форма контроля"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.attrsTab), _translate("MainWindow", "Столбцы"))
         self.export_btn.setText(_translate("MainWindow", "Экспортировать в Excel"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tableTab), _translate("MainWindow", "Таблица"))
+        self.search_le.setPlaceholderText(_translate("MainWindow", "Название дисциплины, индекс, направление или профиль"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.searchTab), _translate("MainWindow", "Поиск"))
+        self.revalidate_btn.setText(_translate("MainWindow", "Проверить заново"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.validationTab), _translate("MainWindow", "Проверка"))
@@ -2,7 +2,6 @@ import sys
 
 from PyQt6.QtWidgets import QApplication
 
-from database import PlanDatabase
 from interface.MainWindow import MainWindow
 
 if __name__=='__main__':
@@ -0,0 +1,127 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class FileMetrics:
+    """Замеры обработки одного файла плана"""
+    # Путь к файлу
+    file_path: str
+    # Итог обработки: ok, error, cached
+    status: str = 'ok'
+    # Количество дисциплин и семестров в плане
+    disciplines: int = 0
+    semesters: int = 0
+    # Время каждого этапа в миллисекундах в порядке выполнения, например parse.open или insert.semester
+    phases: dict[str, float] = field(default_factory=dict)
+    # Пиковый объём памяти при разборе в КБ, None - память не отслеживалась
+    peak_memory_kb: float | None = None
+    # Самые затратные функции по данным cProfile, None - профилирование не выполнялось
+    profile: list[dict] | None = None
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.phases.values())
+
+    def add_timings(self, prefix: str, timings: dict[str, float]):
+        """Добавляет время этапов в секундах, например Plan.timings или PlanDatabase.last_timings"""
+        for name, seconds in timings.items():
+            self.phases[f'{prefix}.{name}'] = seconds * 1000
+
+
+@contextmanager
+def capture(metrics: FileMetrics, profile: bool = False, trace_memory: bool = False, top: int = 15):
+    """
+    Собирает пиковый объём памяти (tracemalloc) и самые затратные функции (cProfile)
+    за время выполнения блока и записывает их в metrics, даже если блок завершился ошибкой.
+    Без флагов ничего не делает, поэтому накладных расходов нет
+    """
+    profiler = cProfile.Profile() if profile else None
+    started_tracing = False
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            metrics.profile = profile_top(profiler, top)
+        if trace_memory:
+            metrics.peak_memory_kb = (tracemalloc.get_traced_memory()[1] - base) / 1024
+            if started_tracing:
+                tracemalloc.stop()
+
+
+def profile_top(profiler: cProfile.Profile, top: int) -> list[dict]:
+    """Функции с наибольшим суммарным временем вместе с вызванными ими функциями"""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (file_name, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f'{file_name}:{line}({function})',
+            'calls': calls,
+            'own_ms': own * 1000,
+            'cumulative_ms': cumulative * 1000,
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:top]
+
+
+@dataclass
+class MetricsReport:
+    """Отчёт о замерах за один импорт: по каждому файлу и по этапам всего импорта"""
+    # Замеры по файлам в порядке обработки
+    files: list[FileMetrics] = field(default_factory=list)
+    # Время этапов, которые относятся ко всему импорту (create_view, query), в миллисекундах
+    phases: dict[str, float] = field(default_factory=dict)
+    # Счётчики: количество файлов, пропущенных файлов, ошибок и т.д.
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замер времени блока как этапа всего импорта"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def add_file(self, metrics: FileMetrics):
+        self.files.append(metrics)
+        self.count('files')
+        self.count(metrics.status)
+
+    def phase_totals(self) -> dict[str, float]:
+        """Суммарное время каждого этапа по всем файлам в миллисекундах"""
+        totals: dict[str, float] = {}
+        for metrics in self.files:
+            for name, ms in metrics.phases.items():
+                totals[name] = totals.get(name, 0.0) + ms
+        return totals
+
+    def to_dict(self) -> dict:
+        return {
+            'phases': self.phases,
+            'counters': self.counters,
+            'totals': self.phase_totals(),
+            'files': [dict(asdict(metrics), total_ms=metrics.total_ms) for metrics in self.files],
+        }
+
+    def save(self, file_path: str):
+        """Сохраняет отчёт в JSON"""
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
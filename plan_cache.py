@@ -0,0 +1,139 @@
+import hashlib
+import os
+import pickle
+import zlib
+
+# Папка, в которой хранятся уже разобранные планы
+PLAN_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'umo_curriculum', 'plans')
+# Максимальный размер папки с разобранными планами по умолчанию
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# Расширение файлов с разобранными планами
+CACHE_EXTENSION = '.plan'
+# Переменная окружения: '0' (или off, no, false) отключает хранилище разобранных планов,
+# другое непустое значение - папка для него вместо PLAN_CACHE_DIR
+CACHE_ENV = 'UMO_CURRICULUM_PLAN_CACHE'
+
+
+def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """Считает хэш содержимого файла, читая его частями"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PlanCache:
+    """
+    Хранилище уже разобранных планов на диске. Запись ищется по хэшу содержимого файла,
+    классу плана и версии парсера, поэтому переименование файла не мешает её найти,
+    а изменение файла или парсера - использовать устаревшую.
+    План хранится как сжатый pickle его атрибутов: часы дисциплин лежат в массивах PlanHours,
+    поэтому запись занимает десятки килобайт и читается за миллисекунды.
+    Когда размер папки превышает max_size, удаляются давно не использованные записи
+    """
+
+    # cache_dir - папка для хранения разобранных планов
+    # max_size - максимальный суммарный размер записей в байтах
+    def __init__(self, cache_dir: str = PLAN_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def key(self, file_path: str, plan_class: str, version: int) -> str:
+        """Ключ записи для файла плана, разобранного классом plan_class парсером версии version"""
+        return f'{file_hash(file_path)}.{plan_class}.v{version}'
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_EXTENSION)
+
+    def load(self, key: str) -> dict | None:
+        """Возвращает сохранённые атрибуты плана или None, если записи нет или она повреждена"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.loads(zlib.decompress(file.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Повреждённая запись или запись от несовместимой версии классов разбирается заново
+            return None
+        try:
+            # Время изменения файла служит временем последнего использования записи
+            os.utime(path)
+        except OSError:
+            pass
+        return state
+
+    def store(self, key: str, state: dict):
+        """Сохраняет атрибуты плана и удаляет старые записи, если превышен размер папки"""
+        path = self.path(key)
+        # Запись через временный файл, чтобы параллельные процессы не прочитали недописанный файл
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                file.write(zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), 1))
+            os.replace(tmp_path, path)
+        except OSError:
+            # Без сохранения файл просто будет разобран заново при следующем открытии
+            return
+        self.evict()
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        """Все записи: время последнего использования, размер и путь"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(CACHE_EXTENSION):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        # Запись удалил другой процесс
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def size(self) -> int:
+        """Суммарный размер всех записей в байтах"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_size: int | None = None) -> int:
+        """
+        Удаляет давно не использованные записи, пока их суммарный размер больше max_size
+        (по умолчанию self.max_size). Возвращает количество удалённых записей
+        """
+        max_size = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_size:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+            total -= size
+        return removed
+
+    def clear(self) -> int:
+        """Удаляет все записи. Возвращает количество удалённых записей"""
+        return self.evict(0)
+
+
+def default_cache() -> PlanCache | None:
+    """Хранилище из настроек переменной окружения CACHE_ENV, None - если оно отключено"""
+    value = os.environ.get(CACHE_ENV, '').strip()
+    if value.lower() in ('0', 'off', 'no', 'false'):
+        return None
+    return PlanCache(value or PLAN_CACHE_DIR)
+
+
+# Хранилище, которое включают импорт, просмотр папки и сравнение версий планов (ключ use_cache).
+# Сами планы по умолчанию его не используют, чтобы не писать на диск без явного запроса
+DEFAULT_CACHE = default_cache()
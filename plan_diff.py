@@ -0,0 +1,242 @@
+import os
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from classes import PlanHours
+from database import PlanDatabase
+from discipline_match import normalize_ind, normalize_name
+from plan_parse import Plan, open_plan
+from query_builder import COLUMNS
+
+# Подписи полей в отчёте: те же, что у столбцов таблицы результата
+FIELD_LABELS = {name: header for header, _, name in COLUMNS}
+# Формы контроля в порядке их значений в ControlForm, как в таблице ControlForm
+CONTROL_FORM_NAMES = ('Экзамен', 'Зачёт', 'Зачёт с оценкой', 'Курсовая практика', 'Контрольная работа', 'Другое')
+# Подписи видов изменений
+STATUS_LABELS = {'added': 'добавлена', 'removed': 'удалена', 'changed': 'изменена'}
+SEMESTER_STATUS_LABELS = {'added': 'семестр добавлен', 'removed': 'семестр удалён'}
+# Столбцы строк отчёта из PlanDiff.rows
+DIFF_HEADERS = ['Изменение', 'Индекс дисциплины', 'Дисциплина', 'Семестр', 'Поле', 'Было', 'Стало']
+# Атрибуты титульного листа, по которым файлы архива считаются версиями одного плана
+REVISION_FIELDS = ('cod', 'profile', 'baza', 'start_year', 'edu_form')
+# Поля общих часов дисциплины в порядке PlanHours.totals_row
+TOTAL_FIELDS = PlanDatabase.DISCIPLINE_HOUR_COLUMNS
+
+
+@dataclass
+class FieldChange:
+    """Изменение одного поля: титула, дисциплины или семестра"""
+    field: str
+    old: object
+    new: object
+
+
+@dataclass
+class SemesterDiff:
+    """Изменение семестра дисциплины: семестр добавлен, удалён или в нём изменились часы и формы контроля"""
+    num: int
+    status: str
+    changes: list[FieldChange] = field(default_factory=list)
+
+
+@dataclass
+class DisciplineDiff:
+    """Изменение дисциплины. Для изменённой дисциплины ind и name берутся из новой версии плана"""
+    status: str
+    ind: str
+    name: str
+    changes: list[FieldChange] = field(default_factory=list)
+    semesters: list[SemesterDiff] = field(default_factory=list)
+
+
+@dataclass
+class PlanDiff:
+    """Все различия двух версий плана"""
+    old_path: str
+    new_path: str
+    title: list[FieldChange] = field(default_factory=list)
+    disciplines: list[DisciplineDiff] = field(default_factory=list)
+    # Количество дисциплин, которые есть в обеих версиях без изменений
+    unchanged: int = 0
+    # Ошибка чтения одной из версий, None - версии сравнены
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def count(self, status: str) -> int:
+        return sum(1 for discipline in self.disciplines if discipline.status == status)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.title and not self.disciplines
+
+    def summary(self) -> str:
+        if not self.ok:
+            return f'ошибка: {self.error}'
+        return (f"добавлено {self.count('added')}, удалено {self.count('removed')}, "
+                f"изменено {self.count('changed')}, без изменений {self.unchanged}")
+
+    def rows(self) -> Iterator[tuple]:
+        """Строки отчёта по столбцам DIFF_HEADERS: по строке на каждое изменённое поле"""
+        for change in self.title:
+            yield 'титул', '', '', '', FIELD_LABELS.get(change.field, change.field), change.old, change.new
+        for discipline in self.disciplines:
+            status = STATUS_LABELS[discipline.status]
+            if discipline.status != 'changed':
+                yield status, discipline.ind, discipline.name, '', '', '', ''
+                continue
+            for change in discipline.changes:
+                yield (status, discipline.ind, discipline.name, '', FIELD_LABELS.get(change.field, change.field),
+                       change.old, change.new)
+            for semester in discipline.semesters:
+                if semester.status != 'changed':
+                    yield (status, discipline.ind, discipline.name, semester.num,
+                           SEMESTER_STATUS_LABELS[semester.status], '', '')
+                for change in semester.changes:
+                    yield (status, discipline.ind, discipline.name, semester.num,
+                           FIELD_LABELS.get(change.field, change.field), change.old, change.new)
+
+
+def control_form_names(values: tuple[int, ...]) -> str:
+    return ', '.join(CONTROL_FORM_NAMES[value - 1] for value in values)
+
+
+def discipline_fingerprint(disciplines: PlanHours, index: int) -> tuple:
+    """Всё содержимое дисциплины одним кортежем: одинаковые дисциплины сравниваются без разбора по полям"""
+    return (bool(disciplines.in_plan[index]), disciplines.inds[index], disciplines.names[index],
+            tuple(disciplines.totals_row(index)), tuple(disciplines.semester_rows(index)))
+
+
+def match_disciplines(old: PlanHours, new: PlanHours) -> tuple[list[tuple[int, int]], list[int], list[int]]:
+    """
+    Сопоставляет дисциплины двух версий плана за линейное время через словари: сначала по индексу и названию,
+    затем только по индексу (дисциплину переименовали), затем только по названию (у дисциплины сменился индекс).
+    Возвращает пары номеров сопоставленных дисциплин, номера удалённых и номера добавленных дисциплин
+    """
+    old_keys = [(normalize_ind(ind), normalize_name(name)) for ind, name in zip(old.inds, old.names)]
+    new_keys = [(normalize_ind(ind), normalize_name(name)) for ind, name in zip(new.inds, new.names)]
+    pairs: list[tuple[int, int]] = []
+    old_left = list(range(len(old)))
+    new_left = list(range(len(new)))
+    for key in (lambda keys: keys, lambda keys: keys[0], lambda keys: keys[1]):
+        # Повторяющиеся ключи сопоставляются по порядку следования дисциплин
+        candidates: dict[object, list[int]] = {}
+        for index in reversed(new_left):
+            if key(new_keys[index]):
+                candidates.setdefault(key(new_keys[index]), []).append(index)
+        matched_new = set()
+        still_old = []
+        for index in old_left:
+            same = candidates.get(key(old_keys[index])) if key(old_keys[index]) else None
+            if same:
+                new_index = same.pop()
+                pairs.append((index, new_index))
+                matched_new.add(new_index)
+            else:
+                still_old.append(index)
+        old_left = still_old
+        new_left = [index for index in new_left if index not in matched_new]
+    return pairs, old_left, new_left
+
+
+def diff_semesters(old: PlanHours, old_index: int, new: PlanHours, new_index: int) -> list[SemesterDiff]:
+    """Различия семестров одной дисциплины в двух версиях плана"""
+    old_rows = {num: (forms, hours) for forms, num, *hours in old.semester_rows(old_index)}
+    new_rows = {num: (forms, hours) for forms, num, *hours in new.semester_rows(new_index)}
+    result = []
+    for num in sorted(old_rows.keys() | new_rows.keys()):
+        if num not in new_rows:
+            result.append(SemesterDiff(num, 'removed'))
+            continue
+        if num not in old_rows:
+            result.append(SemesterDiff(num, 'added'))
+            continue
+        (old_forms, old_hours), (new_forms, new_hours) = old_rows[num], new_rows[num]
+        changes = [FieldChange(name, old_value, new_value)
+                   for name, old_value, new_value in zip(PlanHours.SEMESTER_FIELDS, old_hours, new_hours)
+                   if old_value != new_value]
+        if old_forms != new_forms:
+            changes.append(FieldChange('control_form', control_form_names(old_forms), control_form_names(new_forms)))
+        if changes:
+            result.append(SemesterDiff(num, 'changed', changes))
+    return result
+
+
+def diff_plans(old: Plan, new: Plan, old_path: str | None = None, new_path: str | None = None) -> PlanDiff:
+    """Различия двух версий плана: титул, добавленные, удалённые и изменённые дисциплины с их семестрами"""
+    result = PlanDiff(old_path or getattr(old, 'file_path', ''), new_path or getattr(new, 'file_path', ''))
+    for name in Plan.TITLE_FIELDS:
+        old_value, new_value = getattr(old, name, None), getattr(new, name, None)
+        if old_value != new_value:
+            result.title.append(FieldChange(name, old_value, new_value))
+
+    old_disciplines, new_disciplines = old.disciplines, new.disciplines
+    if not isinstance(old_disciplines, PlanHours):
+        old_disciplines = PlanHours(old_disciplines)
+    if not isinstance(new_disciplines, PlanHours):
+        new_disciplines = PlanHours(new_disciplines)
+
+    pairs, removed, added = match_disciplines(old_disciplines, new_disciplines)
+    changed: list[tuple[int, DisciplineDiff]] = []
+    for old_index, new_index in pairs:
+        if discipline_fingerprint(old_disciplines, old_index) == discipline_fingerprint(new_disciplines, new_index):
+            result.unchanged += 1
+            continue
+        discipline = DisciplineDiff('changed', new_disciplines.inds[new_index], new_disciplines.names[new_index])
+        for name, old_value, new_value in (
+                ('in_plan', bool(old_disciplines.in_plan[old_index]), bool(new_disciplines.in_plan[new_index])),
+                ('ind', old_disciplines.inds[old_index], new_disciplines.inds[new_index]),
+                ('discipline', old_disciplines.names[old_index], new_disciplines.names[new_index]),
+                *zip(TOTAL_FIELDS, old_disciplines.totals_row(old_index), new_disciplines.totals_row(new_index))):
+            if old_value != new_value:
+                discipline.changes.append(FieldChange(name, old_value, new_value))
+        discipline.semesters = diff_semesters(old_disciplines, old_index, new_disciplines, new_index)
+        changed.append((new_index, discipline))
+
+    # Изменённые и добавленные дисциплины идут в порядке новой версии плана, удалённые - в конце
+    changed.extend((index, DisciplineDiff('added', new_disciplines.inds[index], new_disciplines.names[index]))
+                   for index in added)
+    changed.sort(key=lambda item: item[0])
+    result.disciplines = [discipline for _, discipline in changed]
+    result.disciplines.extend(DisciplineDiff('removed', old_disciplines.inds[index], old_disciplines.names[index])
+                              for index in removed)
+    return result
+
+
+def revision_order(file_path: str) -> tuple:
+    """Порядок версий одного плана: исходный файл раньше обновлённого (с '_обн' в имени)"""
+    name = os.path.basename(file_path)
+    return '_обн' in name, name, file_path
+
+
+def diff_files(old_path: str, new_path: str, use_cache: bool = True) -> PlanDiff:
+    """Различия планов из двух файлов"""
+    from plan_cache import DEFAULT_CACHE
+
+    cache = DEFAULT_CACHE if use_cache else None
+    return diff_plans(open_plan(old_path, cache=cache), open_plan(new_path, cache=cache), old_path, new_path)
+
+
+def diff_archive(path: str, workers: int | None = 1, use_cache: bool = True) -> Iterator[PlanDiff]:
+    """
+    Различия всех соседних версий каждого плана в папке. Файлы группируются по атрибутам титула
+    из REVISION_FIELDS через словарь, поэтому время растёт линейно с количеством файлов.
+    Сначала читаются только титульные листы, дисциплины разбираются только у планов, у которых есть версии
+    """
+    from plan_import import scan_plans
+
+    groups: dict[tuple, list[Plan]] = {}
+    for result in scan_plans(path, workers, use_cache):
+        if result.ok:
+            key = tuple(str(getattr(result.plan, name) or '').strip().lower() for name in REVISION_FIELDS)
+            groups.setdefault(key, []).append(result.plan)
+    for plans in groups.values():
+        plans.sort(key=lambda plan: revision_order(plan.file_path))
+        for old, new in zip(plans, plans[1:]):
+            # Дисциплины читаются только здесь, поэтому ошибки разбора файла появляются при сравнении
+            try:
+                yield diff_plans(old, new)
+            except Exception as error:
+                yield PlanDiff(old.file_path, new.file_path, error=f"{type(error).__name__}: {error}")
@@ -0,0 +1,252 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from classes import SourceFile
+from database import PlanDatabase
+from metrics import FileMetrics, MetricsReport, capture
+from plan_cache import DEFAULT_CACHE, file_hash
+from plan_parse import Plan, open_plan
+
+
+@dataclass
+class ImportResult:
+    """Результат обработки одного файла учебного плана"""
+    # Путь к файлу
+    file_path: str
+    # Обработанный план, если файл удалось распарсить
+    plan: Plan | None = None
+    # Текст ошибки, если файл обработать не удалось
+    error: str | None = None
+    # Информация о файле для инкрементального импорта
+    source: SourceFile | None = None
+    # Файл не изменился с прошлого импорта и был пропущен
+    unchanged: bool = False
+    # Файл был удалён, и загруженный из него план удалён из БД
+    deleted: bool = False
+    # Замеры разбора и вставки файла
+    metrics: FileMetrics | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def file_name(self) -> str:
+        return os.path.basename(self.file_path)
+
+
+def find_plan_files(path: str, extensions: tuple[str, ...] = ('.xlsx', '.xls')) -> list[str]:
+    """Рекурсивно собирает пути ко всем файлам учебных планов в папке"""
+    file_paths: list[str] = []
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            if file.endswith(extensions):
+                file_paths.append(os.path.join(root, file))
+    return sorted(file_paths)
+
+
+def read_source_file(file_path: str, known: SourceFile | None = None) -> SourceFile:
+    """
+    Собирает информацию о файле. Если размер и время изменения совпадают с известной записью,
+    хэш не пересчитывается
+    """
+    stat = os.stat(file_path)
+    if known is not None and known.size == stat.st_size and known.mtime == stat.st_mtime:
+        return SourceFile(file_path, stat.st_size, stat.st_mtime, known.hash, known.plan_id)
+    plan_id = known.plan_id if known is not None else None
+    return SourceFile(file_path, stat.st_size, stat.st_mtime, file_hash(file_path), plan_id)
+
+
+def parse_plan_file(file_path: str, use_cache: bool = True, profile: bool = False,
+                    trace_memory: bool = False) -> ImportResult:
+    """
+    Парсит один файл с планом. Функция находится на уровне модуля,
+    чтобы её можно было передать в процесс из пула.
+    use_cache - брать уже разобранный план из plan_cache и сохранять туда новые
+    profile, trace_memory - собрать данные cProfile и пиковый объём памяти при разборе
+    """
+    metrics = FileMetrics(file_path)
+    try:
+        with capture(metrics, profile, trace_memory):
+            plan = open_plan(file_path, cache=DEFAULT_CACHE if use_cache else None)
+    except Exception as error:
+        metrics.status = 'error'
+        return ImportResult(file_path, error=f"{type(error).__name__}: {error}", metrics=metrics)
+    metrics.add_timings('parse', plan.timings)
+    metrics.status = 'ok' if 'open' in plan.timings else 'cached'
+    metrics.disciplines = len(plan.disciplines)
+    metrics.semesters = plan.disciplines.count_semesters()
+    return ImportResult(file_path, plan=plan, metrics=metrics)
+
+
+def scan_plan_file(file_path: str, use_cache: bool = True) -> ImportResult:
+    """Читает только титульный лист файла. Дисциплины плана разбираются при первом обращении к ним"""
+    try:
+        return ImportResult(file_path, plan=open_plan(file_path, cache=DEFAULT_CACHE if use_cache else None,
+                                                      lazy=True))
+    except Exception as error:
+        return ImportResult(file_path, error=f"{type(error).__name__}: {error}")
+
+
+def map_plan_files(func: Callable[..., ImportResult], file_paths: list[str], workers: int | None,
+                   *args) -> Iterator[ImportResult]:
+    """
+    Вызывает func(file_path, *args) для каждого файла и возвращает результаты по мере их готовности.
+    workers - количество процессов, None - по количеству ядер, 1 - без пула процессов
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            yield func(file_path, *args)
+        return
+
+    # Процессы запускаются через spawn, так как fork из процесса с несколькими потоками (например, из GUI) небезопасен
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(file_paths)),
+                                   mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = [executor.submit(func, file_path, *args) for file_path in file_paths]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # При отмене импорта файлы, которые ещё не начали обрабатываться, пропускаются
+        executor.shutdown(cancel_futures=True)
+
+
+def scan_plans(path: str, workers: int | None = 1, use_cache: bool = True) -> list[ImportResult]:
+    """
+    Быстро собирает информацию с титульных листов всех файлов планов в папке, не разбирая дисциплины.
+    Результаты отсортированы по путям к файлам
+    """
+    results = map_plan_files(scan_plan_file, find_plan_files(path), workers, use_cache)
+    return sorted(results, key=lambda result: result.file_path)
+
+
+class PlanImporter:
+    """
+    Класс, который парсит файлы с планами в пуле процессов и записывает
+    результаты в БД. Запись ведётся только из текущего процесса, так как
+    у SQLite может быть только один писатель
+    """
+
+    # db - база данных, в которую записываются планы, None - при пробном запуске без открытия БД
+    # workers - количество процессов для парсинга, None - по количеству ядер, 1 - без пула процессов
+    # dry_run - только парсить файлы, ничего не изменяя в БД
+    # use_cache - брать уже разобранные планы из plan_cache
+    # profile, trace_memory - собирать данные cProfile и пиковый объём памяти по каждому файлу
+    def __init__(self, db: PlanDatabase | None, workers: int | None = None, dry_run: bool = False,
+                 use_cache: bool = True, profile: bool = False, trace_memory: bool = False):
+        self.db = db
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.dry_run = dry_run
+        self.use_cache = use_cache
+        self.profile = profile
+        self.trace_memory = trace_memory
+        # Замеры последнего импорта
+        self.report = MetricsReport()
+        # Количество результатов, которое вернёт текущий импорт
+        self.total = 0
+        # Флаг отмены импорта, проверяется между файлами
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Отменяет текущий импорт. Уже вставленные планы остаются в БД, так как
+        каждый план записывается своей транзакцией, а оставшиеся файлы не обрабатываются
+        """
+        self.cancelled = True
+
+    def parse_files(self, file_paths: Iterable[str]) -> Iterable[ImportResult]:
+        """Парсит файлы и возвращает результаты по мере их готовности"""
+        return map_plan_files(parse_plan_file, list(file_paths), self.workers,
+                              self.use_cache, self.profile, self.trace_memory)
+
+    def import_files(self, file_paths: Iterable[str],
+                     callback: Callable[[ImportResult], None] | None = None,
+                     sources: dict[str, SourceFile] | None = None) -> list[ImportResult]:
+        """
+        Парсит файлы, вставляет успешно обработанные планы в БД и возвращает результаты по каждому файлу.
+        sources - информация о файлах по их путям, которая записывается в БД вместе с планами
+        """
+        file_paths = list(file_paths)
+        self.total = len(file_paths)
+        self.report = MetricsReport()
+        return self.__import_files(file_paths, callback, sources)
+
+    def __import_files(self, file_paths: list[str], callback: Callable[[ImportResult], None] | None,
+                       sources: dict[str, SourceFile] | None) -> list[ImportResult]:
+        results: list[ImportResult] = []
+        for result in self.parse_files(file_paths):
+            if self.cancelled:
+                break
+            if result.ok and not self.dry_run:
+                try:
+                    source = sources.get(result.file_path) if sources else None
+                    self.db.insert_plans([result.plan], [source] if source else None)
+                    result.source = source
+                    result.metrics.add_timings('insert', self.db.last_timings)
+                except Exception as error:
+                    result.error = f"{type(error).__name__}: {error}"
+                    result.metrics.status = 'error'
+            self.report.add_file(result.metrics)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+        return results
+
+    def import_directory(self, path: str,
+                         callback: Callable[[ImportResult], None] | None = None,
+                         incremental: bool = False,
+                         known: dict[str, SourceFile] | None = None) -> list[ImportResult]:
+        """
+        Импортирует в БД все файлы с планами из папки.
+        При инкрементальном импорте файлы, содержимое которых не изменилось, пропускаются,
+        изменённые файлы заменяют свои планы в БД, а планы из удалённых файлов удаляются.
+        known - записи о файлах планов для пробного запуска без БД, None - прочитать их из БД
+        """
+        if not incremental:
+            return self.import_files(find_plan_files(path), callback)
+
+        self.report = MetricsReport()
+        path = os.path.abspath(path)
+        known = self.db.get_source_files() if known is None else known
+        file_paths = find_plan_files(path)
+        # Планы, файлы которых пропали из папки
+        deleted = [source for file_path, source in known.items()
+                   if os.path.commonpath([path, file_path]) == path and not os.path.exists(file_path)]
+        self.total = len(file_paths) + len(deleted)
+
+        results: list[ImportResult] = []
+        changed: dict[str, SourceFile] = {}
+        touched: list[SourceFile] = []
+        # Сравнение хэшей файлов с записями в БД
+        with self.report.phase('scan'):
+            for file_path in file_paths:
+                if self.cancelled:
+                    return results
+                old = known.get(file_path)
+                source = read_source_file(file_path, old)
+                if old is not None and old.hash == source.hash:
+                    if (old.size, old.mtime) != (source.size, source.mtime):
+                        touched.append(source)
+                    result = ImportResult(file_path, source=source, unchanged=True)
+                    self.report.count('unchanged')
+                else:
+                    changed[file_path] = source
+                    continue
+                results.append(result)
+                if callback is not None:
+                    callback(result)
+        if not self.dry_run:
+            self.db.update_source_files(touched)
+            self.db.delete_plans([source.plan_id for source in deleted if source.plan_id is not None])
+        self.report.count('deleted', len(deleted))
+        for source in deleted:
+            result = ImportResult(source.path, source=source, deleted=True)
+            results.append(result)
+            if callback is not None:
+                callback(result)
+
+        return results + self.__import_files(list(changed), callback, changed)
@@ -1,9 +1,10 @@
-import openpyxl
-from openpyxl.cell.cell import Cell
-from openpyxl.workbook import Workbook
-from openpyxl.worksheet.worksheet import Worksheet
+import os
+import re
+import time
 
-from classes import ControlForm, TotalHours, RequiredHours, Semester, Discipline
+from classes import ControlForm, TotalHours, RequiredHours, Semester, Discipline, PlanHours
+from plan_cache import PlanCache
+from plan_reader import PlanReader, coordinate_to_tuple, open_reader
 
 
 class Plan:
@@ -12,32 +13,171 @@ class Plan:
     Имеет методы для обработки этого файла и их сохранения в объекты класса
     """
 
+    # Ячейки титульного листа, из которых берётся информация о плане
+    TITLE_CELLS = ('D27', 'D29', 'D37', 'D38', 'C40', 'W40', 'C42', 'W42', 'C44')
+    # Количество столбцов в строке дисциплины до начала столбцов с семестрами
+    SEMESTERS_START_COL = 17
+    # Количество столбцов с часами на один семестр
+    SEMESTER_WIDTH = 9
+    # Столбцы с общими часами и с объёмом ОП, если их не удалось найти по заголовкам
+    TOTAL_COLS = {'expert': 9, 'plan': 10, 'with_teacher': 11, 'ip': 12, 'sr': 13, 'patt': 14}
+    REQUIRED_COLS = {'important': 15, 'not_important': 16}
+    # Порядок видов часов внутри семестра, если его не удалось найти по заголовкам
+    SEMESTER_COLUMNS = ('total', 'lek', 'lab', 'pr', 'krp', 'ip', 'cons', 'sr', 'patt')
+    # Виды часов в порядке полей Semester
+    SEMESTER_FIELDS = ('total', 'lek', 'lab', 'pr', 'krp', 'ip', 'sr', 'cons', 'patt')
+    # Заголовки столбцов с общими часами, с объёмом ОП и с часами семестра без пробелов.
+    # В старых планах часы с преподавателем называются обязательной нагрузкой
+    TOTAL_HEADERS = {
+        'Экспертное': 'expert',
+        'Поплану': 'plan',
+        'Спреп.': 'with_teacher',
+        'Обяз.нагр.': 'with_teacher',
+        'ИП': 'ip',
+        'СР': 'sr',
+        'ПАтт': 'patt',
+    }
+    REQUIRED_HEADERS = {'Обяз.часть': 'important', 'Вар.часть': 'not_important'}
+    SEMESTER_HEADERS = {
+        'Итого': 'total',
+        'Лек': 'lek',
+        'Лаб': 'lab',
+        'Пр': 'pr',
+        'КРП': 'krp',
+        'ИП': 'ip',
+        'Конс': 'cons',
+        'СР': 'sr',
+        'ПАтт': 'patt',
+    }
+    # Строка с заголовками столбцов и первая строка с дисциплинами на листе плана
+    HEADER_ROW = 3
+    FIRST_ROW = 6
+    # Столбцы с формами контроля: экзамен, зачёт, зачёт с оценкой, курсовой проект, курсовая работа и другие
+    CONTROL_FORM_COLS = (
+        (3, ControlForm.EKZ),
+        (4, ControlForm.ZACH),
+        (5, ControlForm.ZACH0),
+        (6, ControlForm.KP),
+        (7, ControlForm.KR),
+        (8, ControlForm.DR),
+    )
+    # Заголовки столбцов с формами контроля без пробелов
+    CONTROL_FORM_HEADERS = {
+        'Экзамен': ControlForm.EKZ,
+        'Зачет': ControlForm.ZACH,
+        'Зачетсоц.': ControlForm.ZACH0,
+        'КП': ControlForm.KP,
+        'КР': ControlForm.KR,
+        'Др': ControlForm.DR,
+    }
+
+    # Названия листов с титулом и с планом
+    TITLE_SHEET = 'Титул'
+    PLAN_SHEET = 'План'
+
+    # Версия парсера. Увеличивается при любом изменении результата разбора или атрибутов плана,
+    # чтобы не использовать планы, сохранённые в plan_cache прошлой версией
+    PARSER_VERSION = 4
+    # Атрибуты с титульного листа
+    TITLE_FIELDS = ('name', 'cafedra', 'facultet', 'profile', 'cod', 'kvalik', 'edu_form',
+                    'start_year', 'standart', 'baza')
+    # Атрибуты, которые относятся к конкретному открытию файла и не сохраняются в plan_cache
+    TRANSIENT_FIELDS = ('reader', 'timings', 'file_path', 'reader_name', 'cache', 'cache_key')
+
     # file_path - путь к файлу учебного плана
-    def __init__(self, file_path: str):
-        # Открываем файл и получаем объект листа с планом
-        self.plan_worksheet = self.__open_worksheet_in_file(file_path)
-        # Получение информации с титульного листа документа
-        self.get_title_info()
-        # Получение информации про все дисциплины из файла
-        self.disciplines: list[Discipline] = self.get_disciplines()
-
-    def __open_worksheet_in_file(self, file_path: str) -> Worksheet:
-        """Открывает файл по его пути и возвращает лист с планом"""
-        # Загрузка файла Excel
-        self.workbook: Workbook = openpyxl.load_workbook(file_path)
-        # Получение листа по имени
-        return self.workbook['План']
+    # reader - способ чтения файла из plan_reader.READERS, по умолчанию выбирается по расширению файла
+    # cache - хранилище разобранных планов, например plan_cache.DEFAULT_CACHE, None - всегда разбирать файл заново
+    # lazy - сразу читать только титульный лист, а дисциплины разобрать при первом обращении к ним
+    def __init__(self, file_path: str, reader: str | None = None, cache: PlanCache | None = None,
+                 lazy: bool = False):
+        # Путь к файлу и способ чтения нужны, чтобы дочитать дисциплины при ленивой загрузке
+        self.file_path = file_path
+        self.reader_name = reader
+        self.cache = cache
+        self.cache_key: str | None = None
+        self.reader: PlanReader | None = None
+        # Дисциплины, None - ещё не разобраны
+        self._disciplines: PlanHours | None = None
+        # Время, затраченное на каждый этап разбора файла, в секундах
+        self.timings: dict[str, float] = {}
+
+        if cache is not None:
+            start = time.perf_counter()
+            self.cache_key = cache.key(file_path, type(self).__name__, self.PARSER_VERSION)
+            state = cache.load(self.cache_key)
+            self.timings['cache_load'] = time.perf_counter() - start
+            if state is not None:
+                self.__dict__.update(state)
+                return
+
+        self.__read_file(read_title=True, read_disciplines=not lazy)
+
+    def __read_file(self, read_title: bool, read_disciplines: bool):
+        """Чтение нужных листов файла. Полностью разобранный план сохраняется в plan_cache"""
+        # Открываем файл, читать листы будем построчно
+        start = time.perf_counter()
+        self.reader = open_reader(self.file_path, self.reader_name)
+        self.timings['open'] = self.timings.get('open', 0.0) + time.perf_counter() - start
+        try:
+            if read_title:
+                # Получение информации с титульного листа документа
+                start = time.perf_counter()
+                self.get_title_info()
+                self.timings['title'] = time.perf_counter() - start
+            if read_disciplines:
+                # Получение информации про все дисциплины из файла
+                start = time.perf_counter()
+                disciplines = self.get_disciplines()
+                self.timings['disciplines'] = time.perf_counter() - start
+                # Дисциплины хранятся в компактном виде, а объекты Discipline создаются при обращении к ним
+                start = time.perf_counter()
+                self._disciplines = PlanHours(disciplines)
+                self.timings['pack'] = time.perf_counter() - start
+        finally:
+            self.reader.close()
+            self.reader = None
+
+        if read_disciplines and self.cache is not None:
+            start = time.perf_counter()
+            self.cache.store(self.cache_key, {name: value for name, value in self.__dict__.items()
+                                              if name not in self.TRANSIENT_FIELDS})
+            self.timings['cache_store'] = time.perf_counter() - start
+
+    @property
+    def disciplines(self) -> PlanHours:
+        """Дисциплины плана. При ленивой загрузке лист с дисциплинами читается при первом обращении"""
+        if self._disciplines is None:
+            self.__read_file(read_title=False, read_disciplines=True)
+        return self._disciplines
+
+    @property
+    def is_loaded(self) -> bool:
+        """Разобраны ли уже дисциплины"""
+        return self._disciplines is not None
+
+    def title_info(self) -> dict[str, object]:
+        """Атрибуты плана с титульного листа по именам из TITLE_FIELDS"""
+        return {name: getattr(self, name) for name in self.TITLE_FIELDS}
+
+    def __getstate__(self) -> dict:
+        """
+        Объект чтения файла не сериализуется, поэтому при передаче плана между процессами он отбрасывается.
+        Не разобранные дисциплины дочитываются из файла уже в том процессе, где к ним обратились
+        """
+        state = self.__dict__.copy()
+        state.pop('reader', None)
+        return state
 
     @staticmethod
-    def __is_bold(cell: Cell) -> bool:
-        """Проверка ячейки на жирность шрифта"""
-        return cell.font.bold
+    def __is_bold(bold: int, col: int) -> bool:
+        """Проверка ячейки в столбце col на жирность шрифта по битовой маске строки"""
+        return bool(bold >> col & 1)
 
     @staticmethod
     def __check_value_and_split(value: str | None) -> list[int] | None:
         """Проверка значения на None и разделение его посимвольно, с превращением в числа"""
         if value:
-            return [int(x) for x in value]
+            return [int(x) for x in str(value)]
         else:
             return None
 
@@ -49,88 +189,118 @@ class Plan:
         else:
             return None
 
-    def __get_control_form(self, row: list[str], sem_num: int) -> ControlForm:
-        """Получение информации о том, какая именно форма контроля у дисциплины в переданной строке"""
-        sem = None
-        col = 3
-        while sem is None and col < 9:
-            sem = self.__check_value_and_split(row[col])
-            col += 1
-
-        if sem is not None and sem_num in sem:
-            match col:
-                case 3:
-                    return ControlForm.EKZ
-                case 4:
-                    return ControlForm.ZACH
-                case 5:
-                    return ControlForm.ZACH0
-                case 6:
-                    return ControlForm.KP
-                case 7:
-                    return ControlForm.KR
-                case 8:
-                    return ControlForm.DR
-                case _:
-                    return ControlForm.NO
-        else:
-            return ControlForm.NO
+    def __get_control_forms(self, row: list[str],
+                            control_form_cols: tuple[tuple[int, ControlForm], ...]) -> dict[int, list[ControlForm]]:
+        """
+        Получение форм контроля дисциплины по номерам семестров за один проход по столбцам форм контроля.
+        В одном семестре может быть несколько форм, например экзамен и курсовой проект
+        """
+        control_forms: dict[int, list[ControlForm]] = {}
+        for col, control_form in control_form_cols:
+            # Строки xlsx не дополняются до ширины листа: строка может закончиться раньше столбцов форм контроля
+            if col is None or col >= len(row):
+                continue
+            for sem_num in set(self.__check_value_and_split(row[col]) or ()):
+                control_forms.setdefault(sem_num, []).append(control_form)
+        return control_forms
 
-    def __get_semesters_from_row(self, row: list[str]) -> list[Semester]:
+    def __get_semesters_from_row(self, row: list[str], columns: dict) -> list[Semester]:
         """Получение информации про семестры и часы в переданной строке"""
         semesters: list[Semester] = []
-        sem_row = row[17:]
-
-        for i in range(0, len(sem_row) - 2, 9):
-            if sem_row[i]:
-                num = i // 9 + 1
-                total = self.__check_int(sem_row[i])
-                lek = self.__check_int(sem_row[i + 1])
-                lab = self.__check_int(sem_row[i + 2])
-                pr = self.__check_int(sem_row[i + 3])
-                krp = self.__check_int(sem_row[i + 4])
-                ip = self.__check_int(sem_row[i + 5])
-                sr = self.__check_int(sem_row[i + 6])
-                cons = self.__check_int(sem_row[i + 7])
-                patt = self.__check_int(sem_row[i + 8])
-                control = self.__get_control_form(row, num)
-                semesters.append(Semester(num, total, lek, lab, pr, krp, ip, sr, cons, patt, control))
+        control_forms = self.__get_control_forms(row, columns['control_forms'])
+
+        for num, cols in enumerate(columns['semesters'], 1):
+            if cols[0] < len(row) and row[cols[0]]:
+                # Столбцы идут в порядке полей Semester, None - вида часов нет в плане
+                hours = [self.__check_int(row[col]) if col is not None and col < len(row) else None for col in cols]
+                semesters.append(Semester(num, *hours, control_forms.get(num, [])))
 
         return semesters
 
-    def get_total_hours(self, row: list[str]) -> TotalHours:
+    def __find_columns(self, header: list) -> dict:
+        """
+        Поиск столбцов строки дисциплины по заголовкам. В части файлов нет столбца КП или столбцов ИП и ПАтт,
+        а виды часов внутри семестра идут в разном порядке, поэтому все столбцы после формы контроля
+        определяются по своим заголовкам. Если заголовков нет, используется обычное расположение столбцов
+        """
+        titles = [''.join(str(value or '').split()) for value in header]
+        control_form_cols = tuple((col, self.CONTROL_FORM_HEADERS[titles[col]])
+                                  for col in range(3, min(len(titles), 3 + len(self.CONTROL_FORM_COLS)))
+                                  if titles[col] in self.CONTROL_FORM_HEADERS) or self.CONTROL_FORM_COLS
+        if 'Итого' not in titles:
+            return {
+                'control_forms': control_form_cols,
+                'total': self.TOTAL_COLS,
+                'required': self.REQUIRED_COLS,
+                'semesters': [self.__semester_cols(dict(zip(self.SEMESTER_COLUMNS, range(col, len(titles)))))
+                              for col in range(self.SEMESTERS_START_COL, len(titles), self.SEMESTER_WIDTH)],
+            }
+
+        semesters_start = titles.index('Итого')
+        total_cols: dict[str, int] = {}
+        required_cols: dict[str, int] = {}
+        for col in range(control_form_cols[-1][0] + 1, semesters_start):
+            if titles[col] in self.TOTAL_HEADERS:
+                total_cols.setdefault(self.TOTAL_HEADERS[titles[col]], col)
+            elif titles[col] in self.REQUIRED_HEADERS:
+                required_cols.setdefault(self.REQUIRED_HEADERS[titles[col]], col)
+
+        semesters: list[dict[str, int]] = []
+        for col in range(semesters_start, len(titles)):
+            if titles[col] == 'Итого':
+                semesters.append({})
+            if titles[col] in self.SEMESTER_HEADERS:
+                semesters[-1].setdefault(self.SEMESTER_HEADERS[titles[col]], col)
+
+        return {'control_forms': control_form_cols, 'total': total_cols, 'required': required_cols,
+                'semesters': [self.__semester_cols(fields) for fields in semesters]}
+
+    def __semester_cols(self, fields: dict[str, int]) -> tuple[int | None, ...]:
+        """Столбцы видов часов семестра в порядке полей Semester"""
+        return tuple(fields.get(name) for name in self.SEMESTER_FIELDS)
+
+    def __get_by_cols(self, row: list[str], cols: dict[str, int], name: str) -> int | None:
+        """Число из столбца с часами name, None - если такого столбца в плане нет"""
+        col = cols.get(name)
+        return self.__check_int(row[col]) if col is not None and col < len(row) else None
+
+    def get_total_hours(self, row: list[str], cols: dict[str, int] | None = None) -> TotalHours:
         """Получение общего количества академических часов в переданной строке"""
-        expert = self.__check_int(row[9])
-        plan = self.__check_int(row[10])
-        with_teacher = self.__check_int(row[11])
-        ip = self.__check_int(row[12])
-        sr = self.__check_int(row[13])
-        patt = self.__check_int(row[14])
+        cols = self.TOTAL_COLS if cols is None else cols
+        expert = self.__get_by_cols(row, cols, 'expert')
+        plan = self.__get_by_cols(row, cols, 'plan')
+        with_teacher = self.__get_by_cols(row, cols, 'with_teacher')
+        ip = self.__get_by_cols(row, cols, 'ip')
+        sr = self.__get_by_cols(row, cols, 'sr')
+        patt = self.__get_by_cols(row, cols, 'patt')
 
         return TotalHours(expert, plan, with_teacher, ip, sr, patt)
 
-    def get_required(self, row: list[str]) -> RequiredHours:
+    def get_required(self, row: list[str], cols: dict[str, int] | None = None) -> RequiredHours:
         """Получение объёма ОП в переданной строке"""
-        important = self.__check_int(row[15])
-        not_important = self.__check_int(row[16])
+        cols = self.REQUIRED_COLS if cols is None else cols
+        important = self.__get_by_cols(row, cols, 'important')
+        not_important = self.__get_by_cols(row, cols, 'not_important')
 
         return RequiredHours(important, not_important)
 
     def get_disciplines(self) -> list[Discipline]:
         """Получение всех дисциплин в файле и информации про них"""
-        row: tuple[Cell]
         disciplines: list[Discipline] = []
-        for row in self.plan_worksheet.iter_rows(min_row=6, max_row=self.plan_worksheet.max_row):
-            if self.__is_bold(row[2]) or row[2].value is None:
+        columns = self.__find_columns([])
+        for row_num, (row, bold) in enumerate(self.reader.iter_rows(self.PLAN_SHEET, min_row=self.HEADER_ROW),
+                                              self.HEADER_ROW):
+            if row_num == self.HEADER_ROW:
+                columns = self.__find_columns(row)
+            if row_num < self.FIRST_ROW or len(row) < 3 or self.__is_bold(bold, 2) or row[2] is None:
                 continue
-            row: list[str] = [cell.value for cell in row]
 
             # Получение общего кол-ва часов
-            total_hours = self.get_total_hours(row)
+            total_hours = self.get_total_hours(row, columns['total'])
             # Получение обязательной программы
-            required = self.get_required(row)
+            required = self.get_required(row, columns['required'])
             # Получение семестров, в которых будут формы контроля
-            semesters = self.__get_semesters_from_row(row)
+            semesters = self.__get_semesters_from_row(row, columns)
 
             # Получение индекса, названия и статуса дисциплины
             in_plan = True if row[0] == '+' else False
@@ -140,20 +310,167 @@ class Plan:
 
         return disciplines
 
+    @classmethod
+    def read_cells(cls, reader: PlanReader, sheet_name: str, coordinates: tuple[str, ...]) -> dict[str, object]:
+        """
+        Получение значений нужных ячеек листа за один проход по его строкам.
+        Лист читается потоково, поэтому все нужные ячейки собираются за одно чтение
+        """
+        positions = {coordinate_to_tuple(coord): coord for coord in coordinates}
+        min_row = min(row for row, _ in positions)
+        max_row = max(row for row, _ in positions)
+        values: dict[str, object] = dict.fromkeys(coordinates)
+        for row_num, (row, _) in enumerate(reader.iter_rows(sheet_name, min_row=min_row, max_row=max_row), min_row):
+            for col_num, value in enumerate(row, 1):
+                coord = positions.get((row_num, col_num))
+                if coord is not None:
+                    values[coord] = value
+        return values
+
     def get_title_info(self):
         """Получение информации с титульного листа в файле"""
-        title_worksheet = self.workbook['Титул']
-        cell_value_list = title_worksheet['D29'].value.split()
+        title = self.read_cells(self.reader, self.TITLE_SHEET, self.TITLE_CELLS)
+        cell_value_list = title['D29'].split()
         if '_x000d_' in cell_value_list:
             cell_value_list.remove('_x000d_')
         ind = cell_value_list.index('Профиль')
         self.name = ' '.join(cell_value_list[:ind])
-        self.cafedra = title_worksheet['D37'].value
-        self.facultet = title_worksheet['D38'].value
+        self.cafedra = title['D37']
+        self.facultet = title['D38']
         self.profile = ' '.join(cell_value_list[ind + 10:])
-        self.cod = title_worksheet['D27'].value
-        self.kvalik = title_worksheet['C40'].value.split(':')[1]
-        self.edu_form = title_worksheet['C42'].value.split(':')[1]
-        self.start_year = int(title_worksheet['W40'].value) if title_worksheet['W40'].value else 0
-        self.standart = title_worksheet['W42'].value
-        self.baza = title_worksheet['C44'].value.split(':')[1]
+        self.cod = title['D27']
+        self.kvalik = title['C40'].split(':')[1]
+        self.edu_form = title['C42'].split(':')[1]
+        self.start_year = int(title['W40']) if title['W40'] else 0
+        self.standart = title['W42']
+        self.baza = title['C44'].split(':')[1]
+
+
+class OsfPlan(Plan):
+    """
+    Учебный план из файла старого формата .osf.xls. Листы называются так же, как в файлах .plx.xlsx,
+    но расположение данных на них другое, поэтому титул и дисциплины читаются по своим столбцам
+    """
+
+    # Ячейки титульного листа, из которых берётся информация о плане
+    TITLE_CELLS = ('A14', 'G14', 'P16', 'G19', 'G27', 'AS27', 'U29', 'N32', 'U32')
+    # Первая строка с дисциплинами на листе плана
+    FIRST_ROW = 8
+    # Столбцы с формами контроля: экзамены, зачёты, диф. зачёты, курсовые проекты,
+    # курсовые работы, контрольные работы и другие
+    CONTROL_FORM_COLS = (
+        (3, ControlForm.EKZ),
+        (4, ControlForm.ZACH),
+        (5, ControlForm.ZACH0),
+        (6, ControlForm.KP),
+        (7, ControlForm.KR),
+        (8, ControlForm.DR),
+        (9, ControlForm.DR),
+    )
+    # Первый столбец с часами по семестрам и количество столбцов на один семестр
+    SEMESTERS_START_COL = 21
+    SEMESTER_WIDTH = 11
+    # Индексы циклов и профессиональных модулей: это строки с суммой по вложенным дисциплинам.
+    # В файлах .plx.xlsx они выделены жирным шрифтом, а в .osf.xls ничем не выделены
+    GROUP_INDEX = re.compile(r'[А-Я]+|ПМ\.\d+')
+    # Практики, индекс которых похож на индекс цикла
+    NOT_GROUP_INDEXES = ('ПДП',)
+
+    @staticmethod
+    def __to_int(value) -> int | None:
+        """Превращение значения в число. В строках практик вместо часов бывают подписи 'час' и 'нед'"""
+        if isinstance(value, float):
+            return int(value)
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+        return value if isinstance(value, int) else None
+
+    @staticmethod
+    def __split_semesters(value) -> set[int]:
+        """Номера семестров из ячейки формы контроля: '34' - семестры 3 и 4, '1-3' - семестры с 1 по 3"""
+        if isinstance(value, float):
+            value = str(int(value))
+        semesters: set[int] = set()
+        for part in re.findall(r'\d-\d|\d', str(value or '')):
+            first, last = part[0], part[-1]
+            semesters.update(range(int(first), int(last) + 1))
+        return semesters
+
+    def __get_control_forms(self, row: list) -> dict[int, list[ControlForm]]:
+        """Получение форм контроля дисциплины по номерам семестров за один проход по столбцам форм контроля"""
+        control_forms: dict[int, list[ControlForm]] = {}
+        for col, control_form in self.CONTROL_FORM_COLS:
+            for sem_num in self.__split_semesters(row[col]):
+                forms = control_forms.setdefault(sem_num, [])
+                # Контрольные работы и другие формы контроля попадают в одну форму
+                if control_form not in forms:
+                    forms.append(control_form)
+        return control_forms
+
+    def __get_semesters_from_row(self, row: list) -> list[Semester]:
+        """Получение часов по семестрам. На семестр приходится 11 столбцов: максимальная нагрузка,
+        самостоятельная работа, консультации, обязательная нагрузка, лекции, практические,
+        лабораторные, семинары, курсовое проектирование, промежуточная аттестация и индивидуальный проект"""
+        semesters: list[Semester] = []
+        control_forms = self.__get_control_forms(row)
+        for num, col in enumerate(range(self.SEMESTERS_START_COL, len(row), self.SEMESTER_WIDTH), 1):
+            hours = [self.__to_int(value) for value in row[col:col + self.SEMESTER_WIDTH]]
+            hours += [None] * (self.SEMESTER_WIDTH - len(hours))
+            total, sr, cons, _, lek, pr, lab, _, krp, patt, ip = hours
+            if total:
+                semesters.append(Semester(num, total, lek, lab, pr, krp, ip, sr, cons, patt,
+                                          control_forms.get(num, [])))
+        return semesters
+
+    def __is_discipline(self, ind, name) -> bool:
+        """Проверка, что в строке дисциплина, а не цикл, модуль, итоговая или пустая строка"""
+        if not isinstance(ind, str) or not ind or not name or ind.endswith('*'):
+            return False
+        return ind in self.NOT_GROUP_INDEXES or not self.GROUP_INDEX.fullmatch(ind)
+
+    def get_disciplines(self) -> list[Discipline]:
+        """Получение всех дисциплин в файле и информации про них"""
+        disciplines: list[Discipline] = []
+        for row, _ in self.reader.iter_rows(self.PLAN_SHEET, min_row=self.FIRST_ROW):
+            if len(row) < 3 or not self.__is_discipline(row[1], row[2]):
+                continue
+            if len(row) < self.SEMESTERS_START_COL:
+                row += [None] * (self.SEMESTERS_START_COL - len(row))
+
+            # Столбцы с общим количеством часов: максимальная нагрузка, самостоятельная работа,
+            # обязательная нагрузка, промежуточная аттестация и индивидуальный проект.
+            # Экспертной оценки и объёма обязательной и вариативной частей в этом формате нет
+            total_hours = TotalHours(None, self.__to_int(row[10]), self.__to_int(row[13]),
+                                     self.__to_int(row[20]), self.__to_int(row[11]), self.__to_int(row[19]))
+            required = RequiredHours(None, None)
+            semesters = self.__get_semesters_from_row(row)
+            # Столбца "Считать в плане" нет, в файл попадают только дисциплины плана
+            disciplines.append(Discipline(True, row[1], row[2].strip(), total_hours, required, semesters))
+
+        return disciplines
+
+    def get_title_info(self):
+        """Получение информации с титульного листа в файле"""
+        title = self.read_cells(self.reader, self.TITLE_SHEET, self.TITLE_CELLS)
+        self.name = title['G14']
+        # Кафедры и факультета на титульном листе этого формата нет
+        self.cafedra = None
+        self.facultet = None
+        self.profile = (title['U29'] or '').strip()
+        self.cod = title['A14']
+        # Значения с пробелом в начале, как после разделения по ':' в файлах .plx.xlsx,
+        # чтобы планы обоих форматов попадали в одни и те же записи справочников
+        self.kvalik = f" {title['G19']}"
+        self.edu_form = f" {title['G27']}"
+        self.start_year = self.__to_int(title['AS27']) or 0
+        number = self.__to_int(title['U32']) or title['U32']
+        self.standart = f" № {number} от {title['N32']}"
+        self.baza = f" {title['P16']}"
+
+
+def open_plan(file_path: str, reader: str | None = None, cache: PlanCache | None = None,
+              lazy: bool = False) -> Plan:
+    """Открывает файл учебного плана любого поддерживаемого формата"""
+    if os.path.splitext(file_path)[1].lower() == '.xls':
+        return OsfPlan(file_path, reader, cache, lazy)
+    return Plan(file_path, reader, cache, lazy)
@@ -0,0 +1,589 @@
+import hashlib
+import os
+import pickle
+import struct
+import zipfile
+from typing import Callable, Iterator
+from xml.etree.ElementTree import iterparse, fromstring
+
+# Пространства имён XML внутри файла xlsx
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+ROW_TAG = f'{{{MAIN_NS}}}row'
+CELL_TAG = f'{{{MAIN_NS}}}c'
+VALUE_TAG = f'{{{MAIN_NS}}}v'
+FORMULA_TAG = f'{{{MAIN_NS}}}f'
+INLINE_STRING_TAG = f'{{{MAIN_NS}}}is'
+TEXT_TAG = f'{{{MAIN_NS}}}t'
+RUN_TAG = f'{{{MAIN_NS}}}r'
+SHARED_STRING_TAG = f'{{{MAIN_NS}}}si'
+
+# Строка листа: значения ячеек и битовая маска жирности (бит i - ячейка в столбце i)
+Row = tuple[list, int]
+
+
+def coordinate_to_tuple(coordinate: str) -> tuple[int, int]:
+    """
+    Номера строки и столбца (с единицы) по адресу ячейки, например AB12 -> (12, 28), как в openpyxl.
+    Своя реализация, чтобы не импортировать openpyxl, который загружается долго
+    """
+    letters = coordinate.rstrip('0123456789')
+    col = 0
+    for char in letters.upper():
+        col = col * 26 + ord(char) - 64
+    return int(coordinate[len(letters):]), col
+
+
+class PlanReader:
+    """
+    Базовый класс для чтения листов файла с планом. Plan нужны только значения ячеек
+    и жирность шрифта, поэтому строки возвращаются как список значений и битовая маска жирности
+    """
+
+    def iter_rows(self, sheet_name: str, min_row: int = 1, max_row: int | None = None) -> Iterator[Row]:
+        """Последовательно возвращает строки листа с min_row по max_row включительно"""
+        raise NotImplementedError
+
+    def close(self):
+        """Закрывает файл"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class OpenpyxlReader(PlanReader):
+    """Чтение файла через openpyxl"""
+
+    # read_only - потоковое чтение файла: строки читаются по одной, без построения всех ячеек книги в памяти
+    def __init__(self, file_path: str, read_only: bool = True):
+        import openpyxl
+
+        self.workbook = openpyxl.load_workbook(file_path, read_only=read_only)
+
+    def iter_rows(self, sheet_name: str, min_row: int = 1, max_row: int | None = None) -> Iterator[Row]:
+        worksheet = self.workbook[sheet_name]
+        if max_row is None:
+            max_row = worksheet.max_row
+        for row in worksheet.iter_rows(min_row=min_row, max_row=max_row):
+            bold = 0
+            for ind, cell in enumerate(row):
+                # У пустых ячеек в потоковом режиме нет шрифта
+                if cell.font and cell.font.bold:
+                    bold |= 1 << ind
+            yield [cell.value for cell in row], bold
+
+    def close(self):
+        self.workbook.close()
+
+
+class XlsxReader(PlanReader):
+    """
+    Чтение файла xlsx без сторонних библиотек: архив открывается через zipfile, а XML листа,
+    общих строк и таблица шрифтов из стилей разбираются потоково через iterparse.
+    Объекты ячеек и стилей не создаются, поэтому чтение в разы быстрее, чем через openpyxl
+    """
+
+    def __init__(self, file_path: str):
+        self.zip = zipfile.ZipFile(file_path)
+        self.sheet_paths, shared_strings_path, styles_path = self.__read_workbook()
+        # Общие строки разбираются по мере обращения к ним, см. __shared_string
+        self.shared_strings: list[str] = []
+        self.shared_strings_file = self.zip.open(shared_strings_path) if shared_strings_path else None
+        self.shared_strings_events = iterparse(self.shared_strings_file) if self.shared_strings_file else None
+        self.bold_styles = self.__read_bold_styles(styles_path) if styles_path else set()
+
+    @staticmethod
+    def __resolve(target: str) -> str:
+        """Получение пути файла внутри архива по ссылке из workbook.xml.rels"""
+        if target.startswith('/'):
+            return target.lstrip('/')
+        return f'xl/{target}'
+
+    def __read_workbook(self) -> tuple[dict[str, str], str | None, str | None]:
+        """Получение путей к листам по их названиям, а также путей к общим строкам и стилям"""
+        rels = fromstring(self.zip.read('xl/_rels/workbook.xml.rels'))
+        targets: dict[str, str] = {}
+        shared_strings_path = None
+        styles_path = None
+        for rel in rels.iter(f'{{{PACKAGE_REL_NS}}}Relationship'):
+            path = self.__resolve(rel.get('Target'))
+            targets[rel.get('Id')] = path
+            if rel.get('Type').endswith('/sharedStrings'):
+                shared_strings_path = path
+            elif rel.get('Type').endswith('/styles'):
+                styles_path = path
+
+        workbook = fromstring(self.zip.read('xl/workbook.xml'))
+        sheet_paths = {sheet.get('name'): targets[sheet.get(f'{{{REL_NS}}}id')]
+                       for sheet in workbook.iter(f'{{{MAIN_NS}}}sheet')}
+        return sheet_paths, shared_strings_path, styles_path
+
+    @staticmethod
+    def __text(element) -> str | None:
+        """Текст строки: простой текст и текст всех фрагментов с форматированием, как в openpyxl"""
+        snippets = []
+        plain = element.find(TEXT_TAG)
+        if plain is not None and plain.text is not None:
+            snippets.append(plain.text)
+        for run in element.iter(RUN_TAG):
+            text = run.find(TEXT_TAG)
+            if text is not None and text.text is not None:
+                snippets.append(text.text)
+        if plain is None and not snippets:
+            return None
+        return ''.join(snippets)
+
+    def __shared_string(self, index: int) -> str:
+        """
+        Общая строка по номеру. Таблица общих строк разбирается только до нужной строки: строки первого листа
+        (титула) идут в её начале, поэтому для чтения одного титула остальная таблица не разбирается
+        """
+        while index >= len(self.shared_strings) and self.shared_strings_events is not None:
+            for _, element in self.shared_strings_events:
+                if element.tag == SHARED_STRING_TAG:
+                    text = self.__text(element) or ''
+                    self.shared_strings.append(text.replace('x005F_', ''))
+                    element.clear()
+                    break
+            else:
+                self.shared_strings_events = None
+        return self.shared_strings[index]
+
+    def __read_bold_styles(self, path: str) -> set[int]:
+        """Получение номеров стилей ячеек, у которых жирный шрифт"""
+        styles = fromstring(self.zip.read(path))
+        bold_fonts = set()
+        fonts = styles.find(f'{{{MAIN_NS}}}fonts')
+        for ind, font in enumerate(fonts if fonts is not None else []):
+            bold = font.find(f'{{{MAIN_NS}}}b')
+            # Тег без атрибута val означает жирный шрифт
+            if bold is not None and bold.get('val', 'true').lower() in ('true', '1'):
+                bold_fonts.add(ind)
+
+        bold_styles = set()
+        cell_xfs = styles.find(f'{{{MAIN_NS}}}cellXfs')
+        for ind, xf in enumerate(cell_xfs if cell_xfs is not None else []):
+            if int(xf.get('fontId', 0)) in bold_fonts:
+                bold_styles.add(ind)
+        return bold_styles
+
+    @staticmethod
+    def __column_index(coordinate: str) -> int:
+        """Номер столбца (с нуля) по адресу ячейки, например AB12 -> 27"""
+        col = 0
+        for char in coordinate:
+            if char.isdigit():
+                break
+            col = col * 26 + ord(char) - 64
+        return col - 1
+
+    @staticmethod
+    def __cast_number(value: str) -> int | float:
+        """Превращение числа из строки в int или float, как это делает openpyxl"""
+        if '.' in value or 'E' in value or 'e' in value:
+            return float(value)
+        return int(value)
+
+    def __cell_value(self, cell):
+        data_type = cell.get('t', 'n')
+        if data_type == 'inlineStr':
+            inline = cell.find(INLINE_STRING_TAG)
+            return self.__text(inline) if inline is not None else None
+
+        formula = cell.find(FORMULA_TAG)
+        if formula is not None and formula.text:
+            return '=' + formula.text
+        value = cell.findtext(VALUE_TAG)
+        if value is None:
+            return None
+        if data_type == 's':
+            return self.__shared_string(int(value))
+        if data_type == 'n':
+            return self.__cast_number(value)
+        if data_type == 'b':
+            return bool(int(value))
+        return value
+
+    def iter_rows(self, sheet_name: str, min_row: int = 1, max_row: int | None = None) -> Iterator[Row]:
+        path = self.sheet_paths[sheet_name]
+        next_row = min_row
+        with self.zip.open(path) as file:
+            for _, element in iterparse(file):
+                if element.tag != ROW_TAG:
+                    continue
+                row_num = int(element.get('r', next_row))
+                if row_num < min_row:
+                    element.clear()
+                    continue
+                if max_row is not None and row_num > max_row:
+                    break
+
+                # Пропущенные в XML пустые строки возвращаются пустыми, как в openpyxl
+                while next_row < row_num:
+                    yield [], 0
+                    next_row += 1
+
+                values = []
+                bold = 0
+                for cell in element.iter(CELL_TAG):
+                    coordinate = cell.get('r')
+                    col = self.__column_index(coordinate) if coordinate else len(values)
+                    if col > len(values):
+                        values.extend([None] * (col - len(values)))
+                    values.append(self.__cell_value(cell))
+                    if int(cell.get('s', 0)) in self.bold_styles:
+                        bold |= 1 << col
+                element.clear()
+                yield values, bold
+                next_row = row_num + 1
+
+    def close(self):
+        if self.shared_strings_file is not None:
+            self.shared_strings_file.close()
+        self.zip.close()
+
+
+# Папка, в которой хранятся уже разобранные листы файлов xls
+XLS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'umo_curriculum', 'xls')
+
+# Подпись составного документа OLE2, в котором хранятся файлы Excel 97-2003
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+# Номера секторов, которые означают конец цепочки и свободный сектор
+OLE_END_OF_CHAIN = 0xFFFFFFFE
+OLE_MAX_SECTOR = 0xFFFFFFFA
+
+# Типы записей BIFF8, которые нужны для чтения значений ячеек и жирности шрифта
+BIFF_EOF = 0x000A
+BIFF_CONTINUE = 0x003C
+BIFF_FONT = 0x0031
+BIFF_XF = 0x00E0
+BIFF_BOUNDSHEET = 0x0085
+BIFF_SST = 0x00FC
+BIFF_LABELSST = 0x00FD
+BIFF_LABEL = 0x0204
+BIFF_NUMBER = 0x0203
+BIFF_RK = 0x027E
+BIFF_MULRK = 0x00BD
+BIFF_BLANK = 0x0201
+BIFF_MULBLANK = 0x00BE
+BIFF_BOOLERR = 0x0205
+BIFF_FORMULA = 0x0006
+BIFF_STRING = 0x0207
+
+
+def read_ole_stream(data: bytes, names: tuple[str, ...] = ('Workbook', 'Book')) -> bytes:
+    """Получение потока с книгой из составного документа OLE2 (файла xls)"""
+    if data[:8] != OLE_SIGNATURE:
+        raise ValueError('Файл не является документом Excel 97-2003')
+    sector_size = 1 << struct.unpack_from('<H', data, 0x1E)[0]
+    mini_sector_size = 1 << struct.unpack_from('<H', data, 0x20)[0]
+    first_dir, _, mini_cutoff, first_mini_fat, _, first_difat, difat_count = struct.unpack_from('<7I', data, 0x30)
+    ids_in_sector = sector_size // 4
+
+    def sector(num: int) -> bytes:
+        offset = (num + 1) * sector_size
+        return data[offset:offset + sector_size]
+
+    def read_chain(start: int, table: list[int], read: Callable[[int], bytes]) -> bytes:
+        chunks = []
+        # Ограничение на длину цепочки защищает от зацикливания в повреждённом файле
+        while start < OLE_MAX_SECTOR and len(chunks) <= len(table):
+            chunks.append(read(start))
+            start = table[start]
+        return b''.join(chunks)
+
+    # Таблица размещения секторов собирается из секторов, перечисленных в DIFAT
+    difat = list(struct.unpack_from('<109I', data, 0x4C))
+    num = first_difat
+    for _ in range(difat_count):
+        if num >= OLE_MAX_SECTOR:
+            break
+        ids = struct.unpack(f'<{ids_in_sector}I', sector(num))
+        difat.extend(ids[:-1])
+        num = ids[-1]
+    fat: list[int] = []
+    for num in difat:
+        if num < OLE_MAX_SECTOR:
+            fat.extend(struct.unpack(f'<{ids_in_sector}I', sector(num)))
+
+    directory = read_chain(first_dir, fat, sector)
+    entries = {}
+    for offset in range(0, len(directory), 128):
+        name_size = struct.unpack_from('<H', directory, offset + 64)[0]
+        name = directory[offset:offset + max(name_size - 2, 0)].decode('utf-16-le')
+        start, size = struct.unpack_from('<2I', directory, offset + 116)
+        entries.setdefault(name, (directory[offset + 66], start, size))
+
+    for name in names:
+        if name not in entries or entries[name][0] != 2:
+            continue
+        _, start, size = entries[name]
+        if size >= mini_cutoff:
+            return read_chain(start, fat, sector)[:size]
+        # Маленькие потоки хранятся в мини-секторах внутри потока корневой записи
+        _, root_start, _ = next(entry for entry in entries.values() if entry[0] == 5)
+        mini_stream = read_chain(root_start, fat, sector)
+        mini_fat_data = read_chain(first_mini_fat, fat, sector)
+        mini_fat = list(struct.unpack(f'<{len(mini_fat_data) // 4}I', mini_fat_data))
+        return read_chain(start, mini_fat, lambda num: mini_stream[num * mini_sector_size:
+                                                                  (num + 1) * mini_sector_size])[:size]
+    raise ValueError('В файле нет листов Excel')
+
+
+def iter_biff_records(stream: bytes, pos: int = 0) -> Iterator[tuple[int, bytes]]:
+    """Последовательно возвращает тип и данные записей BIFF до конца книги или листа"""
+    while pos + 4 <= len(stream):
+        record_type, size = struct.unpack_from('<HH', stream, pos)
+        yield record_type, stream[pos + 4:pos + 4 + size]
+        if record_type == BIFF_EOF:
+            return
+        pos += 4 + size
+
+
+def rk_value(rk: int) -> int | float:
+    """Расшифровка числа в сжатом формате RK"""
+    if rk & 2:
+        value = struct.unpack('<i', struct.pack('<I', rk & 0xFFFFFFFC))[0] >> 2
+    else:
+        value = struct.unpack('<d', struct.pack('<Q', (rk & 0xFFFFFFFC) << 32))[0]
+    return value / 100 if rk & 1 else value
+
+
+def biff_string(data: bytes, pos: int, size_bytes: int = 2) -> str:
+    """Чтение строки Unicode из записи BIFF8, длина которой занимает size_bytes байт"""
+    count = int.from_bytes(data[pos:pos + size_bytes], 'little')
+    flags = data[pos + size_bytes]
+    pos += size_bytes + 1
+    if flags & 0x08:
+        pos += 2
+    if flags & 0x04:
+        pos += 4
+    if flags & 0x01:
+        return data[pos:pos + count * 2].decode('utf-16-le')
+    return data[pos:pos + count].decode('latin-1')
+
+
+class SharedStrings:
+    """
+    Чтение таблицы общих строк (SST). Таблица разбита на записи CONTINUE, и если строка
+    переходит в следующую запись, её символы продолжаются после нового байта флагов
+    """
+
+    # segments - данные записи SST и всех следующих за ней записей CONTINUE
+    def __init__(self, segments: list[bytes]):
+        self.segments = segments
+        self.seg = 0
+        self.pos = 8
+
+    def __read(self, size: int) -> bytes:
+        chunks = []
+        while size:
+            if self.pos >= len(self.segments[self.seg]):
+                self.seg += 1
+                self.pos = 0
+            chunk = self.segments[self.seg][self.pos:self.pos + size]
+            self.pos += len(chunk)
+            size -= len(chunk)
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def __read_chars(self, count: int, wide: bool) -> str:
+        text = []
+        while count:
+            segment = self.segments[self.seg]
+            if self.pos >= len(segment):
+                self.seg += 1
+                segment = self.segments[self.seg]
+                wide = bool(segment[0] & 0x01)
+                self.pos = 1
+            char_size = 2 if wide else 1
+            available = min(count, (len(segment) - self.pos) // char_size)
+            raw = segment[self.pos:self.pos + available * char_size]
+            text.append(raw.decode('utf-16-le' if wide else 'latin-1'))
+            self.pos += available * char_size
+            count -= available
+        return ''.join(text)
+
+    def read_all(self) -> list[str]:
+        unique = struct.unpack_from('<I', self.segments[0], 4)[0]
+        strings = []
+        for _ in range(unique):
+            count, flags = struct.unpack('<HB', self.__read(3))
+            runs = struct.unpack('<H', self.__read(2))[0] if flags & 0x08 else 0
+            ext_size = struct.unpack('<I', self.__read(4))[0] if flags & 0x04 else 0
+            strings.append(self.__read_chars(count, bool(flags & 0x01)))
+            # Форматирование фрагментов и фонетические данные не нужны
+            self.__read(runs * 4 + ext_size)
+        return strings
+
+
+class XlsReader(PlanReader):
+    """
+    Чтение файлов Excel 97-2003 (xls, формат BIFF8) без сторонних библиотек.
+    Все листы расшифровываются за один проход по книге, а результат сохраняется в папку cache_dir
+    по хэшу содержимого файла, поэтому каждый файл расшифровывается только один раз
+    """
+
+    # Версия формата сохранённых листов, при изменении чтения старые записи не используются
+    CACHE_VERSION = 1
+
+    # cache_dir - папка для сохранения разобранных листов, None - не сохранять
+    def __init__(self, file_path: str, cache_dir: str | None = XLS_CACHE_DIR):
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        cache_path = None
+        if cache_dir is not None:
+            key = hashlib.sha256(data).hexdigest()
+            cache_path = os.path.join(cache_dir, f'{key}.v{self.CACHE_VERSION}.pickle')
+        self.sheets: dict[str, list[Row]] | None = self.__load_cache(cache_path)
+        if self.sheets is None:
+            self.sheets = self.__decode(read_ole_stream(data))
+            self.__save_cache(cache_path)
+
+    @staticmethod
+    def __load_cache(cache_path: str | None) -> dict[str, list[Row]] | None:
+        if cache_path is None or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def __save_cache(self, cache_path: str | None):
+        if cache_path is None:
+            return
+        # Запись через временный файл, чтобы параллельные процессы не прочитали недописанный файл
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                pickle.dump(self.sheets, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Без сохранения файл просто будет расшифрован заново при следующем чтении
+            pass
+
+    @classmethod
+    def __decode(cls, stream: bytes) -> dict[str, list[Row]]:
+        """Расшифровка всех листов книги: глобальные записи, затем записи каждого листа"""
+        sheet_offsets: dict[str, int] = {}
+        shared_strings: list[str] = []
+        bold_fonts: list[bool] = []
+        bold_styles: list[bool] = []
+        sst_segments: list[bytes] | None = None
+        for record_type, data in iter_biff_records(stream):
+            if record_type == BIFF_CONTINUE and sst_segments is not None:
+                sst_segments.append(data)
+                continue
+            if sst_segments is not None:
+                shared_strings = SharedStrings(sst_segments).read_all()
+                sst_segments = None
+
+            if record_type == BIFF_BOUNDSHEET:
+                sheet_offsets[biff_string(data, 6, 1)] = struct.unpack_from('<I', data)[0]
+            elif record_type == BIFF_SST:
+                sst_segments = [data]
+            elif record_type == BIFF_FONT:
+                # Шрифта с номером 4 в файле нет, номера после него сдвинуты на один
+                if len(bold_fonts) == 4:
+                    bold_fonts.append(False)
+                bold_fonts.append(struct.unpack_from('<H', data, 6)[0] >= 700)
+            elif record_type == BIFF_XF:
+                font = struct.unpack_from('<H', data)[0]
+                bold_styles.append(font < len(bold_fonts) and bold_fonts[font])
+        return {name: cls.__decode_sheet(stream, offset, shared_strings, bold_styles)
+                for name, offset in sheet_offsets.items()}
+
+    @staticmethod
+    def __decode_sheet(stream: bytes, offset: int, shared_strings: list[str], bold_styles: list[bool]) -> list[Row]:
+        """Получение строк листа в виде списков значений и масок жирности, начиная со строки 1"""
+        cells: dict[int, dict[int, tuple[object, int]]] = {}
+        formula_cell = None
+
+        def add(row: int, col: int, value, style: int):
+            cells.setdefault(row, {})[col] = (value, style)
+
+        for record_type, data in iter_biff_records(stream, offset):
+            if record_type in (BIFF_LABELSST, BIFF_LABEL, BIFF_NUMBER, BIFF_RK,
+                               BIFF_BLANK, BIFF_BOOLERR, BIFF_FORMULA):
+                row, col, style = struct.unpack_from('<3H', data)
+                if record_type == BIFF_LABELSST:
+                    add(row, col, shared_strings[struct.unpack_from('<I', data, 6)[0]], style)
+                elif record_type == BIFF_LABEL:
+                    add(row, col, biff_string(data, 6), style)
+                elif record_type == BIFF_NUMBER:
+                    add(row, col, struct.unpack_from('<d', data, 6)[0], style)
+                elif record_type == BIFF_RK:
+                    add(row, col, rk_value(struct.unpack_from('<I', data, 6)[0]), style)
+                elif record_type == BIFF_BOOLERR:
+                    add(row, col, bool(data[6]) if data[7] == 0 else None, style)
+                elif record_type == BIFF_FORMULA:
+                    # Сохраняется результат формулы, строковый результат лежит в следующей записи STRING
+                    if data[12:14] != b'\xff\xff':
+                        add(row, col, struct.unpack_from('<d', data, 6)[0], style)
+                    elif data[6] == 0:
+                        formula_cell = (row, col, style)
+                    elif data[6] == 1:
+                        add(row, col, bool(data[8]), style)
+                    else:
+                        add(row, col, None, style)
+                else:
+                    add(row, col, None, style)
+            elif record_type == BIFF_MULRK:
+                row, col = struct.unpack_from('<2H', data)
+                for pos in range(4, len(data) - 2, 6):
+                    style, rk = struct.unpack_from('<HI', data, pos)
+                    add(row, col, rk_value(rk), style)
+                    col += 1
+            elif record_type == BIFF_MULBLANK:
+                row, col = struct.unpack_from('<2H', data)
+                for pos in range(4, len(data) - 2, 2):
+                    add(row, col, None, struct.unpack_from('<H', data, pos)[0])
+                    col += 1
+            elif record_type == BIFF_STRING and formula_cell is not None:
+                add(formula_cell[0], formula_cell[1], biff_string(data, 0), formula_cell[2])
+                formula_cell = None
+
+        rows: list[Row] = []
+        for row_num in range(max(cells, default=-1) + 1):
+            row_cells = cells.get(row_num, {})
+            values = [None] * (max(row_cells, default=-1) + 1)
+            bold = 0
+            for col, (value, style) in row_cells.items():
+                values[col] = value
+                if style < len(bold_styles) and bold_styles[style]:
+                    bold |= 1 << col
+            rows.append((values, bold))
+        return rows
+
+    def iter_rows(self, sheet_name: str, min_row: int = 1, max_row: int | None = None) -> Iterator[Row]:
+        rows = self.sheets[sheet_name]
+        for values, bold in rows[min_row - 1:max_row]:
+            yield list(values), bold
+
+
+# Доступные способы чтения файлов
+READERS = {
+    'xlsx': XlsxReader,
+    'openpyxl': OpenpyxlReader,
+    'xls': XlsReader,
+}
+# Способ чтения по умолчанию
+DEFAULT_READER = 'xlsx'
+# Способы чтения по умолчанию для файлов с другими расширениями
+EXTENSION_READERS = {
+    '.xls': 'xls',
+}
+
+
+def open_reader(file_path: str, reader: str | None = None, **options) -> PlanReader:
+    """Открывает файл с планом выбранным способом чтения. По умолчанию способ выбирается по расширению файла"""
+    if reader is None:
+        reader = EXTENSION_READERS.get(os.path.splitext(file_path)[1].lower(), DEFAULT_READER)
+    return READERS[reader](file_path, **options)
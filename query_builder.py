@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+# Все формы контроля семестра S через запятую, в порядке их номеров
+CONTROL_FORMS = (
+    "(SELECT GROUP_CONCAT(SCF_CF.name, ', ') FROM SemesterControlForm SCF"
+    " JOIN ControlForm SCF_CF ON SCF.control_form_id = SCF_CF.id WHERE SCF.semester_id = S.id)"
+)
+
+# Все столбцы, которые можно выбрать для вывода: заголовок, выражение SQL и имя столбца
+# в материализованной таблице AllDataFlat. Порядок совпадает с порядком столбцов представления All_data
+COLUMNS: list[tuple[str, str, str]] = [
+    ('Направление', 'P.name', 'name'),
+    ('Кафедра', 'C.name', 'cafedra'),
+    ('Факультет', 'F.name', 'facultet'),
+    ('Профиль', 'P.profile', 'profile'),
+    ('Код специальности', 'P.cod', 'cod'),
+    ('Квалификация', 'K.name', 'kvalik'),
+    ('Форма обучения', 'E.name', 'edu_form'),
+    ('Год начала', 'P.start_year', 'start_year'),
+    ('Стандарт ФГОС', 'P.standart', 'standart'),
+    ('База', 'P.baza', 'baza'),
+    ('В плане', 'D.in_plan', 'in_plan'),
+    ('Индекс дисциплины', 'D.ind', 'ind'),
+    ('Дисциплина', 'D.name', 'discipline'),
+    ('Экспертное', 'D.total_hours_expert', 'total_hours_expert'),
+    ('По плану', 'D.total_hours_plan', 'total_hours_plan'),
+    ('С преподавателем', 'D.total_hours_with_teacher', 'total_hours_with_teacher'),
+    ('ИП', 'D.total_hours_ip', 'total_hours_ip'),
+    ('СР', 'D.total_hours_sr', 'total_hours_sr'),
+    ('ПАтт', 'D.total_hours_patt', 'total_hours_patt'),
+    ('Обяз. часть', 'D.required_important_hours', 'required_important_hours'),
+    ('Вар. часть', 'D.required_not_important_hours', 'required_not_important_hours'),
+    ('Семестр', 'S.num', 'semester'),
+    ('Всего', 'S.total', 'total'),
+    ('Лек', 'S.lek', 'lek'),
+    ('Лаб', 'S.lab', 'lab'),
+    ('Пр', 'S.pr', 'pr'),
+    ('Крп', 'S.krp', 'krp'),
+    ('ИП', 'S.ip', 'ip'),
+    ('СР', 'S.sr', 'sr'),
+    ('Конс', 'S.cons', 'cons'),
+    ('ПАтт', 'S.patt', 'patt'),
+    ('Форма контроля', CONTROL_FORMS, 'control_form'),
+]
+
+# Объявленные типы столбцов из COLUMNS в схеме БД по их именам в AllDataFlat, по ним задаются типы при экспорте
+COLUMN_TYPES: dict[str, str] = {
+    **dict.fromkeys(('name', 'cafedra', 'facultet', 'profile', 'cod', 'kvalik', 'edu_form', 'standart', 'baza',
+                     'ind', 'discipline', 'control_form'), 'TEXT'),
+    **dict.fromkeys(('start_year', 'total_hours_expert', 'total_hours_plan', 'total_hours_with_teacher',
+                     'total_hours_ip', 'total_hours_sr', 'total_hours_patt', 'required_important_hours',
+                     'required_not_important_hours', 'semester', 'total', 'lek', 'lab', 'pr', 'krp', 'ip', 'sr',
+                     'cons', 'patt'), 'INTEGER'),
+    'in_plan': 'BOOL',
+}
+
+
+# Соединение таблиц, то же что и в представлении All_data. Соединение с ControlForm по основной форме
+# контроля оставляет только семестры, в которых есть хотя бы одна форма контроля
+FROM_CLAUSE = '''
+    FROM Plan P
+         LEFT JOIN Cafedra C ON P.cafedra_id = C.id
+         LEFT JOIN Facultet F ON P.facultet_id = F.id
+         LEFT JOIN Kvalik K ON P.kvalik_id = K.id
+         LEFT JOIN EduForm E ON P.edu_form_id = E.id
+         JOIN Discipline D ON P.id = D.plan_id
+         JOIN Semester S ON D.id = S.discipline_id
+         JOIN ControlForm CF ON S.control_form_id = CF.id'''
+
+# Материализованная таблица, в которой уже соединены все таблицы
+FLAT_TABLE = 'AllDataFlat'
+
+# Ключ строки результата для соединения таблиц и для материализованной таблицы: строка - это семестр
+# дисциплины. Семестры получают id по порядку дисциплин, поэтому строки по ключу идут по дисциплинам и семестрам
+ROW_KEY = {False: 'S.id', True: 'semester_id'}
+
+# Выражения для условий отбора: в запросе с соединением таблиц и в материализованной таблице
+FILTER_COLUMNS = {
+    'facultet': ('F.name', 'facultet'),
+    'start_year': ('P.start_year', 'start_year'),
+    'cod': ('P.cod', 'cod'),
+    'semester': ('S.num', 'semester'),
+    # Для формы контроля - id семестра, так как у семестра может быть несколько форм контроля.
+    # Имя столбца указано с таблицей, чтобы в подзапросе его не перекрыл SemesterControlForm.semester_id
+    'control_form': ('S.id', f'{FLAT_TABLE}.semester_id'),
+}
+
+
+@dataclass
+class QueryFilter:
+    """Класс с условиями отбора строк. Условия со значением None не применяются"""
+    # Факультет
+    facultet: str | None = None
+    # Год начала обучения
+    start_year: int | None = None
+    # Начало кода специальности
+    cod: str | None = None
+    # Номера первого и последнего семестров включительно
+    sem_from: int | None = None
+    sem_to: int | None = None
+    # Название формы контроля
+    control_form: str | None = None
+
+    def where(self, flat: bool = False) -> tuple[str, list]:
+        """
+        Получение условия WHERE и значений его параметров.
+        flat - условие для материализованной таблицы, а не для соединения таблиц
+        """
+        column = {name: columns[flat] for name, columns in FILTER_COLUMNS.items()}
+        conditions: list[str] = []
+        params: list = []
+        if self.facultet is not None:
+            conditions.append(f"{column['facultet']} = ?")
+            params.append(self.facultet)
+        if self.start_year is not None:
+            conditions.append(f"{column['start_year']} = ?")
+            params.append(self.start_year)
+        if self.cod:
+            conditions.append(f"{column['cod']} LIKE ? || '%'")
+            params.append(self.cod)
+        if self.sem_from is not None:
+            conditions.append(f"{column['semester']} >= ?")
+            params.append(self.sem_from)
+        if self.sem_to is not None:
+            conditions.append(f"{column['semester']} <= ?")
+            params.append(self.sem_to)
+        if self.control_form is not None:
+            # Семестр подходит, если среди его форм контроля есть нужная
+            conditions.append(f"""EXISTS (SELECT 1 FROM SemesterControlForm SCF
+                 JOIN ControlForm SCF_CF ON SCF.control_form_id = SCF_CF.id
+                 WHERE SCF.semester_id = {column['control_form']} AND SCF_CF.name = ?)""")
+            params.append(self.control_form)
+
+        if not conditions:
+            return '', params
+        return '\n    WHERE ' + ' AND '.join(conditions), params
+
+
+def key_columns(expressions: Iterable[str]) -> str:
+    """
+    Столбцы ключа строки для постраничного чтения моделью таблицы: выражения с именами key0, key1, ...
+    Ключ должен быть уникальным и без NULL, строки показываются упорядоченными по нему
+    """
+    return ', '.join(f'{expression} AS key{i}' for i, expression in enumerate(expressions))
+
+
+def column_types(columns: list[int]) -> list[str]:
+    """Объявленные типы выбранных столбцов (по их номерам в COLUMNS)"""
+    return [COLUMN_TYPES[COLUMNS[col][2]] for col in columns]
+
+
+def build_query(columns: list[int], query_filter: QueryFilter | None = None,
+                flat: bool = False, keys: bool = False) -> tuple[str, list]:
+    """
+    Получение запроса, который возвращает только выбранные столбцы (по их номерам в COLUMNS)
+    и только строки, подходящие под условия отбора. Возвращает текст запроса и значения его параметров.
+    flat - читать из материализованной таблицы AllDataFlat без соединения таблиц.
+    keys - добавить после выбранных столбцов ключ строки ROW_KEY для постраничного чтения
+    """
+    select = ', '.join(f'{COLUMNS[col][2 if flat else 1]} AS c{i}' for i, col in enumerate(columns))
+    if keys:
+        select += f', {key_columns([ROW_KEY[flat]])}'
+    where, params = (query_filter or QueryFilter()).where(flat)
+    from_clause = f'\n    FROM {FLAT_TABLE}' if flat else FROM_CLAUSE
+    return f'SELECT {select}{from_clause}{where}', params
@@ -0,0 +1,148 @@
+import re
+from functools import lru_cache
+
+from query_builder import key_columns
+
+# Полнотекстовый индекс FTS5 по дисциплинам, rowid совпадает с Discipline.id.
+# В индексе хранятся не сами названия, а их основы (см. normalize), поэтому поиск не зависит от падежа и числа
+SEARCH_TABLE = 'DisciplineSearch'
+# Столбцы индекса и их веса при ранжировании: совпадение в названии дисциплины важнее совпадения в профиле
+SEARCH_COLUMNS: list[tuple[str, float]] = [
+    ('name', 10.0),
+    ('ind', 5.0),
+    ('plan_name', 2.0),
+    ('profile', 1.0),
+]
+# Заголовки столбцов результата поиска
+SEARCH_HEADERS = ['Направление', 'Профиль', 'Год начала', 'Индекс дисциплины', 'Дисциплина']
+
+WORD = re.compile(r'\w+')
+VOWELS = 'аеиоуыэюя'
+
+# Окончания из алгоритма стемминга Snowball для русского языка. Окончания первой группы
+# удаляются только после букв 'а' или 'я', второй - после любых букв
+PERFECTIVE_GERUND = (('в', 'вши', 'вшись'), ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'))
+ADJECTIVE = ((), ('ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем', 'им', 'ым', 'ом',
+                  'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю', 'ая', 'яя', 'ою', 'ею'))
+PARTICIPLE = (('ем', 'нн', 'вш', 'ющ', 'щ'), ('ивш', 'ывш', 'ующ'))
+REFLEXIVE = ((), ('ся', 'сь'))
+VERB = (('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет', 'ют', 'ны', 'ть', 'ешь', 'нно'),
+        ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй', 'ил', 'ыл', 'им', 'ым', 'ен',
+         'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'))
+NOUN = ((), ('а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и', 'ией', 'ей', 'ой', 'ий',
+             'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю',
+             'ия', 'ья', 'я'))
+DERIVATIONAL = ((), ('ост', 'ость'))
+SUPERLATIVE = ((), ('ейш', 'ейше'))
+
+
+def region_start(word: str, start: int = 0) -> int:
+    """Начало области после первой гласной, за которой идёт согласная (область R1 в Snowball)"""
+    for index in range(start + 1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            return index + 1
+    return len(word)
+
+
+def remove_ending(word: str, start: int, endings: tuple[tuple[str, ...], tuple[str, ...]]) -> str | None:
+    """
+    Удаляет самое длинное окончание из endings, целиком лежащее после позиции start.
+    Возвращает слово без окончания или None, если ни одно окончание не подошло
+    """
+    best = 0
+    for group, ending_list in enumerate(endings):
+        for ending in ending_list:
+            if len(ending) <= best or not word.endswith(ending):
+                continue
+            stem_length = len(word) - len(ending)
+            # Окончания первой группы должны стоять после 'а' или 'я', которые остаются в основе
+            if group == 0 and (stem_length - 1 < start or word[stem_length - 1] not in 'ая'):
+                continue
+            if stem_length >= start:
+                best = len(ending)
+    return word[:-best] if best else None
+
+
+# Названия дисциплин состоят из небольшого набора слов, поэтому основы повторно не вычисляются
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Основа русского слова по алгоритму Snowball: 'технологии', 'технологический' -> 'технолог'"""
+    word = word.lower().replace('ё', 'е')
+    # Область RV начинается после первой гласной, окончания ищутся только в ней
+    rv = next((index + 1 for index, letter in enumerate(word) if letter in VOWELS), len(word))
+    if rv >= len(word):
+        return word
+    r2 = region_start(word, region_start(word))
+
+    result = remove_ending(word, rv, PERFECTIVE_GERUND)
+    if result is None:
+        word = remove_ending(word, rv, REFLEXIVE) or word
+        result = remove_ending(word, rv, ADJECTIVE)
+        if result is not None:
+            result = remove_ending(result, rv, PARTICIPLE) or result
+        else:
+            result = remove_ending(word, rv, VERB) or remove_ending(word, rv, NOUN)
+    word = result or word
+
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+    word = remove_ending(word, r2, DERIVATIONAL) or word
+    if word.endswith('нн'):
+        word = word[:-1]
+    else:
+        superlative = remove_ending(word, rv, SUPERLATIVE)
+        if superlative is not None:
+            word = superlative[:-1] if superlative.endswith('нн') else superlative
+        elif word.endswith('ь') and len(word) - 1 >= rv:
+            word = word[:-1]
+    return word
+
+
+def normalize(text: str | None, stemmed: bool = True) -> str:
+    """
+    Текст для индекса и поиска: слова в нижнем регистре через пробел, с stemmed - их основы.
+    Индексы дисциплин ('ОГСЭ.01') не сокращаются, так как это не слова русского языка
+    """
+    if not text:
+        return ''
+    words = WORD.findall(str(text).lower().replace('ё', 'е'))
+    return ' '.join(stem(word) if stemmed else word for word in words)
+
+
+def match_expression(text: str) -> str | None:
+    """
+    Выражение FTS5 MATCH для поисковой строки: все слова должны встретиться, каждое слово ищется
+    как начало основы, поэтому находятся и другие формы слова, и недописанные слова.
+    None - в строке нет ни одного слова
+    """
+    words = WORD.findall(text.lower().replace('ё', 'е'))
+    if not words:
+        return None
+    # Основы берутся в кавычки, чтобы слова вроде AND или NOT не считались операторами FTS5
+    return ' '.join(f'"{stem(word)}"*' for word in words)
+
+
+def build_search_query(text: str, limit: int | None = 200, keys: bool = False) -> tuple[str, list] | None:
+    """
+    Запрос поиска дисциплин: самые подходящие дисциплины всех планов по убыванию релевантности (bm25).
+    limit - максимальное количество строк, None - без ограничения (для постраничного чтения моделью таблицы).
+    keys - добавить ключ строки в том же порядке, что и сортировка, для постраничного чтения.
+    Возвращает текст запроса и значения параметров или None, если искать нечего
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return None
+    weights = ', '.join(str(weight) for _, weight in SEARCH_COLUMNS)
+    # Ключ повторяет порядок сортировки и дополняется id дисциплины, чтобы быть уникальным
+    order = (f'bm25({SEARCH_TABLE}, {weights})', "COALESCE(P.name, '')", "COALESCE(D.ind, '')", 'D.id')
+    key = f', {key_columns(order)}' if keys else ''
+    sql = f'''
+    SELECT P.name, P.profile, P.start_year, D.ind, D.name{key}
+    FROM {SEARCH_TABLE}
+         JOIN Discipline D ON D.id = {SEARCH_TABLE}.rowid
+         JOIN Plan P ON P.id = D.plan_id
+    WHERE {SEARCH_TABLE} MATCH ?
+    ORDER BY bm25({SEARCH_TABLE}, {weights}), P.name, D.ind'''
+    if limit is None:
+        return sql, [expression]
+    return sql + '\n    LIMIT ?', [expression, limit]
@@ -0,0 +1,37 @@
+import pytest
+
+from classes import ControlForm, Discipline, PlanHours, RequiredHours, Semester, TotalHours
+
+
+def make_discipline(hours: int | None) -> Discipline:
+    semester = Semester(1, hours, hours, None, None, None, None, None, None, None, [ControlForm.EKZ])
+    return Discipline(True, 'ОП.01', 'Практика', TotalHours(hours, hours, None, None, None, None),
+                      RequiredHours(hours, None), [semester])
+
+
+@pytest.mark.parametrize('hours', [0, -1, 32767, 40000, PlanHours.MAX_HOURS, PlanHours.MIN_HOURS])
+def test_hours_round_trip(hours):
+    """Большие и отрицательные часы хранятся без искажений и не путаются с пустым значением"""
+    discipline = PlanHours([make_discipline(hours)])[0]
+
+    assert discipline.total_hours.plan == hours
+    assert discipline.total_hours.with_teacher is None
+    assert discipline.semesters[0].total == hours
+    assert discipline.semesters[0].lab is None
+
+
+@pytest.mark.parametrize('hours', [PlanHours.MAX_HOURS + 1, PlanHours.EMPTY, 1.5, '12'])
+def test_invalid_hours(hours):
+    with pytest.raises(ValueError):
+        PlanHours([make_discipline(hours)])
+
+
+def test_semester_with_single_control_form():
+    """Семестр, созданный с одной формой контроля вместо списка, как до появления нескольких форм"""
+    semester = Semester(1, 36, 36, None, None, None, None, None, None, None, ControlForm.EKZ)
+    empty = Semester(2, 36, 36, None, None, None, None, None, None, None, ControlForm.NO)
+
+    assert semester.control_forms == [ControlForm.EKZ]
+    assert semester.control_form is ControlForm.EKZ
+    assert empty.control_forms == []
+    assert empty.control_form is ControlForm.NO
@@ -0,0 +1,92 @@
+import os
+import threading
+
+import pytest
+
+from connection import ConnectionManager
+from database import PlanDatabase
+from plan_parse import open_plan
+
+PLAN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Plans', '9',
+                         'Б_38.02.07_2021_123_обн -.plx.xlsx')
+
+
+def test_second_database_object_does_not_wait(tmp_path):
+    """Право на запись берётся на время транзакции, поэтому второй объект с той же БД открывается сразу"""
+    db_path = str(tmp_path / 'plans.sqlite')
+    first = PlanDatabase(db_path)
+    second = PlanDatabase(db_path)
+    second.validate()
+    first.validate()
+    second.close()
+    first.close()
+
+
+def test_writes_from_two_threads(tmp_path):
+    """Запись из другого потока ждёт окончания текущей транзакции, а не получает ошибку"""
+    db_path = str(tmp_path / 'plans.sqlite')
+    PlanDatabase(db_path).close()
+    errors = []
+
+    def write():
+        try:
+            db = PlanDatabase(db_path)
+            for _ in range(20):
+                db.validate()
+            db.close()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_error_in_nested_block_rolls_back_outer_work(tmp_path):
+    """Вложенные блоки и методы записи не фиксируют транзакцию: ошибка откатывает всю работу внешнего блока"""
+    db = PlanDatabase(str(tmp_path / 'plans.sqlite'))
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO Plan (id, name) VALUES (1, 'Первый')")
+            db.update_source_files([])
+            db.drop_tables()
+            with db.transaction():
+                raise RuntimeError
+
+    assert db.conn.execute('SELECT COUNT(*) FROM Plan').fetchone()[0] == 0
+    assert db.conn.execute("SELECT COUNT(*) FROM ControlForm").fetchone()[0] > 0
+    db.close()
+
+
+def test_writers_with_separate_connections(tmp_path):
+    """
+    Объекты с разными ConnectionManager (как импорт из консоли во время импорта в окне) не делят блокировку потока,
+    поэтому id планов, дисциплин и семестров не должны совпадать из-за записи другого соединения
+    """
+    db_path = str(tmp_path / 'plans.sqlite')
+    PlanDatabase(db_path).close()
+    plan = open_plan(PLAN_PATH, cache=None)
+    errors = []
+
+    def write():
+        try:
+            db = PlanDatabase(db_path, connections=ConnectionManager(db_path))
+            for _ in range(5):
+                db.insert_plans([plan])
+            db.close()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    db = PlanDatabase(db_path)
+    counts = db.conn.execute('SELECT COUNT(*), COUNT(DISTINCT plan_id) FROM Discipline').fetchone()
+    assert counts == (10 * len(plan.disciplines), 10)
+    db.close()
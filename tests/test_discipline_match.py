@@ -0,0 +1,53 @@
+import math
+import os
+
+import pytest
+
+from database import PlanDatabase
+from discipline_match import DisciplineIndex, plans_in_folders
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """БД с двумя планами: в первом две дисциплины 'Физика', во втором 'Физика' и 'Химия'"""
+    pytest.importorskip('numpy')
+    db = PlanDatabase(str(tmp_path / 'plans.sqlite'))
+    with db.transaction() as conn:
+        conn.executemany('INSERT INTO Plan (id, name) VALUES (?, ?)', [(1, 'Первый'), (2, 'Второй')])
+        conn.executemany('''
+            INSERT INTO Discipline (id, plan_id, name, ind, total_hours_plan, total_hours_ip) VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(1, 1, 'Физика', 'ОУД.01', 40, None), (2, 1, 'Физика', 'ОУД.02', None, None),
+              (3, 2, 'Физика', 'ОУД.01', 30, 4), (4, 2, 'Химия', 'ОУД.03', 20, None)])
+        conn.executemany('INSERT INTO SourceFile (path, size, mtime, hash, plan_id) VALUES (?, 0, 0, ?, ?)', [
+            (os.path.join(str(tmp_path), '9', 'first.plx.xlsx'), 'a', 1),
+            (os.path.join(str(tmp_path), '11', 'second.plx.xlsx'), 'b', 2),
+        ])
+    yield db.conn
+    db.close()
+
+
+def test_matrix_keeps_empty_hours(conn):
+    """Пустые часы не превращаются в ноль: ячейка, в которой все значения пустые, остаётся пустой"""
+    index = DisciplineIndex(conn)
+    matrix = index.matrix(['total_hours_plan', 'total_hours_ip'])
+    physics, chemistry = index.names.index('Физика'), index.names.index('Химия')
+    first, second = index.plan_ids.index(1), index.plan_ids.index(2)
+
+    assert matrix[physics, first, 0] == 40
+    assert math.isnan(matrix[physics, first, 1])
+    assert list(matrix[physics, second]) == [30, 4]
+    assert math.isnan(matrix[chemistry, first, 0])
+
+
+def test_compare_skips_plans_without_hours(conn):
+    """Часы ИП по физике есть только во втором плане, поэтому сравнивать их не с чем"""
+    index = DisciplineIndex(conn)
+
+    assert index.compare('total_hours_ip', min_plans=2) == []
+    assert index.compare('total_hours_plan', min_plans=2)[0]['values'] == [40.0, 30.0]
+
+
+def test_plans_in_folders(conn, tmp_path):
+    assert plans_in_folders(conn, [str(tmp_path / '9'), str(tmp_path / '11')]) == [1, 2]
+    assert plans_in_folders(conn, [str(tmp_path / '11')]) == [2]
+    assert plans_in_folders(conn, [str(tmp_path / '5')]) == []
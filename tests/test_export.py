@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+import export
+from export import export_rows, iter_query_rows
+from query_builder import key_columns
+
+
+def test_parquet_column_empty_in_first_batch(tmp_path, monkeypatch):
+    """Столбец, пустой во всей первой части, не должен получать тип по этой части"""
+    pq = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(export, 'BATCH_SIZE', 2)
+    rows = [('Физика', None), ('Химия', None), ('История', 4), ('Право', 6), ('Экономика', None)]
+    file_path = tmp_path / 'result.parquet'
+
+    count = export_rows(str(file_path), ['Дисциплина', 'ИП'], iter(rows), types=['TEXT', 'INTEGER'])
+
+    table = pq.read_table(file_path)
+    assert count == len(rows)
+    assert str(table.schema.field('ИП').type) == 'int64'
+    assert table.column('ИП').to_pylist() == [None, None, 4, 6, None]
+
+
+def test_parquet_without_types_stores_strings(tmp_path, monkeypatch):
+    """Столбец без объявленного типа сохраняется строками, даже если в нём значения разных типов"""
+    pq = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(export, 'BATCH_SIZE', 2)
+    rows = [('', None), ('', None), (3, 'зачёт'), (4.5, None)]
+    file_path = tmp_path / 'result.parquet'
+
+    export_rows(str(file_path), ['Было', 'Стало'], rows)
+
+    table = pq.read_table(file_path)
+    assert table.column('Было').to_pylist() == ['', '', '3', '4.5']
+    assert table.column('Стало').to_pylist() == [None, None, 'зачёт', None]
+
+
+def test_parquet_empty_result(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    file_path = tmp_path / 'result.parquet'
+
+    assert export_rows(str(file_path), ['Год начала', 'В плане'], [], types=['INTEGER', 'BOOL']) == 0
+
+    table = pq.read_table(file_path)
+    assert table.num_rows == 0
+    assert [str(field.type) for field in table.schema] == ['int64', 'bool']
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'xlsx'])
+def test_row_key_is_not_exported(tmp_path, file_format):
+    """Ключ строки из запроса для модели таблицы идёт после показываемых столбцов и в файл не попадает"""
+    if file_format == 'xlsx':
+        pytest.importorskip('openpyxl')
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE Item (name TEXT, profile TEXT, year INTEGER, id INTEGER)')
+    conn.executemany('INSERT INTO Item VALUES (?, ?, ?, ?)', [('Физика', 'Базовый', 2021, 15),
+                                                               ('Химия', None, 2022, 16)])
+    sql = f"SELECT name, profile, year, {key_columns(['id'])} FROM Item"
+    file_path = tmp_path / f'result.{file_format}'
+
+    count = export_rows(str(file_path), ['Дисциплина', 'Профиль', 'Год'], iter_query_rows(conn, sql, []))
+
+    if file_format == 'csv':
+        lines = [line.split(';') for line in file_path.read_text(encoding='utf-8-sig').splitlines()]
+    else:
+        import openpyxl
+        lines = list(openpyxl.load_workbook(file_path).active.iter_rows(values_only=True))
+    assert count == 2
+    assert [len(line) for line in lines] == [3, 3, 3]
@@ -0,0 +1,37 @@
+import os
+
+from plan_cache import CACHE_ENV, PLAN_CACHE_DIR, default_cache
+from plan_import import parse_plan_file
+from plan_parse import open_plan
+
+PLAN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Plans', 'Plan.xlsx')
+
+
+def test_plan_does_not_use_cache_by_default():
+    """План, открытый без указания хранилища, разбирается заново и ничего не сохраняет"""
+    plan = open_plan(PLAN_PATH)
+
+    assert plan.cache is None
+    assert 'open' in plan.timings
+
+
+def test_default_cache_settings(monkeypatch, tmp_path):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    assert default_cache().cache_dir == PLAN_CACHE_DIR
+
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+    assert default_cache().cache_dir == str(tmp_path)
+
+    for value in ('0', 'off', 'False'):
+        monkeypatch.setenv(CACHE_ENV, value)
+        assert default_cache() is None
+
+
+def test_import_without_cache(monkeypatch):
+    """Если хранилище отключено переменной окружения, импорт разбирает файлы без него"""
+    monkeypatch.setattr('plan_import.DEFAULT_CACHE', None)
+
+    result = parse_plan_file(PLAN_PATH, use_cache=True)
+
+    assert result.ok
+    assert result.plan.cache is None
@@ -0,0 +1,29 @@
+import os
+import shutil
+
+from plan_diff import diff_archive
+
+PLANS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Plans')
+# Один и тот же план после 11 и после 9 классов: код, профиль, год и форма обучения совпадают, база разная
+BASE_11 = os.path.join(PLANS_DIR, '11', 'Б_38.02.07_2021_12.osf.xls')
+BASE_9 = os.path.join(PLANS_DIR, '9', 'Б_38.02.07_2021_123_обн -.plx.xlsx')
+
+
+def test_archive_pairs_revisions_of_one_plan(tmp_path):
+    """Две версии одного плана сравниваются между собой"""
+    shutil.copy(BASE_9, tmp_path / 'Б_38.02.07_2021_123.plx.xlsx')
+    shutil.copy(BASE_9, tmp_path / 'Б_38.02.07_2021_123_обн.plx.xlsx')
+
+    diffs = list(diff_archive(str(tmp_path), use_cache=False))
+
+    assert len(diffs) == 1
+    assert diffs[0].ok and diffs[0].is_empty
+    assert os.path.basename(diffs[0].new_path) == 'Б_38.02.07_2021_123_обн.plx.xlsx'
+
+
+def test_archive_does_not_pair_different_bases(tmp_path):
+    """Планы на базе основного и среднего общего образования - разные планы, а не версии одного"""
+    shutil.copy(BASE_11, tmp_path)
+    shutil.copy(BASE_9, tmp_path)
+
+    assert list(diff_archive(str(tmp_path), use_cache=False)) == []
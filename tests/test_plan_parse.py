@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from classes import ControlForm
+from plan_parse import Plan
+
+PLANS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Plans')
+# Планы со столбцом КП и без него, с порядком СР/Конс и Конс/СР внутри семестра
+PLAN_FILES = (
+    'Plan.xlsx',
+    os.path.join('9', 'ИСиП_П_09.02.07_2021_1234_обн.plx.xlsx'),
+    os.path.join('9', 'Б_38.02.07_2021_123_обн -.plx.xlsx'),
+    os.path.join('9', 'У_38.02.01_2021_123_обн.plx.xlsx'),
+    os.path.join('9', 'Ф_38.02.06_2021_123 -.plx.xlsx'),
+)
+
+
+@pytest.mark.parametrize('file_name', PLAN_FILES)
+def test_hours_are_consistent(file_name):
+    """Часы семестров в сумме дают часы по плану, а виды занятий - часы семестра"""
+    plan = Plan(os.path.join(PLANS_DIR, file_name), cache=None)
+
+    for discipline in plan.disciplines:
+        if discipline.semesters and discipline.total_hours.plan is not None:
+            assert sum(semester.total for semester in discipline.semesters) == discipline.total_hours.plan
+        for semester in discipline.semesters:
+            parts = (semester.lek, semester.lab, semester.pr, semester.krp, semester.ip, semester.sr,
+                     semester.cons, semester.patt)
+            assert semester.total == sum(part or 0 for part in parts)
+
+
+def test_columns_without_course_project():
+    """Без столбца КП общие часы, объём ОП и семестры сдвинуты на один столбец влево"""
+    plan = Plan(os.path.join(PLANS_DIR, '9', 'Ф_38.02.06_2021_123 -.plx.xlsx'), cache=None)
+    discipline = next(iter(plan.disciplines))
+
+    assert (discipline.ind, discipline.name) == ('БОУД.01', 'Литература')
+    total = discipline.total_hours
+    assert (total.expert, total.plan, total.with_teacher, total.ip, total.sr, total.patt) == (166, 166, 156, None, 6, 4)
+    assert (discipline.required.important, discipline.required.not_important) == (166, None)
+    first = discipline.semesters[0]
+    assert (first.num, first.total, first.lek, first.sr, first.cons) == (1, 70, 68, 2, None)
+
+
+def test_row_shorter_than_control_form_columns():
+    """Строка дисциплины, которая заканчивается до столбцов форм контроля, читается без форм контроля"""
+    plan = Plan(os.path.join(PLANS_DIR, 'Plan.xlsx'), cache=None, lazy=True)
+    row = ['+', 'ОП.01', 'Физика']
+
+    assert plan._Plan__get_control_forms(row, Plan.CONTROL_FORM_COLS) == {}
+    assert plan._Plan__get_control_forms(row + ['12'], Plan.CONTROL_FORM_COLS) == {1: [ControlForm.EKZ],
+                                                                                  2: [ControlForm.EKZ]}
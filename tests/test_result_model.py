@@ -0,0 +1,54 @@
+import pytest
+
+from connection import ConnectionManager
+from database import PlanDatabase
+
+QtCore = pytest.importorskip('PyQt6.QtCore')
+
+from interface.ResultTableModel import ResultTableModel  # noqa: E402
+
+# Строки таблицы: ключ идёт в обратном порядке вставки, чтобы порядок строк в файле БД не совпадал с порядком показа
+ROWS = [(f'строка {number}', 1000 - number) for number in range(1234)]
+SQL = 'SELECT name, id AS key0 FROM Item'
+
+
+@pytest.fixture
+def connections(tmp_path):
+    db_path = str(tmp_path / 'plans.sqlite')
+    PlanDatabase(db_path).close()
+    manager = ConnectionManager(db_path)
+    with manager.writer() as conn:
+        conn.execute('CREATE TABLE Item (name TEXT, id INTEGER)')
+        conn.executemany('INSERT INTO Item (name, id) VALUES (?, ?)', ROWS)
+        conn.commit()
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    yield manager
+    manager.close()
+    del app
+
+
+def cells(model: ResultTableModel, rows) -> list[str]:
+    return [model.data(model.index(row, 0)) for row in rows]
+
+
+def test_rows_are_ordered_by_key(connections):
+    """Строки показываются по возрастанию ключа, страницы идут подряд без пропусков и повторов"""
+    model = ResultTableModel(connections, SQL, [], ['Название'])
+    expected = [name for name, _ in sorted(ROWS, key=lambda row: row[1])]
+
+    assert model.rowCount() == len(ROWS)
+    assert cells(model, range(len(ROWS))) == expected
+
+
+def test_jump_to_far_page(connections):
+    """Переход сразу к последней странице находит её начало без чтения страниц перед ней"""
+    model = ResultTableModel(connections, SQL, [], ['Название'])
+    expected = [name for name, _ in sorted(ROWS, key=lambda row: row[1])]
+    last = len(ROWS) - 1
+
+    assert cells(model, [last, model.PAGE_SIZE, 0]) == [expected[last], expected[model.PAGE_SIZE], expected[0]]
+
+
+def test_query_without_key(connections):
+    with pytest.raises(ValueError):
+        ResultTableModel(connections, 'SELECT name FROM Item', [], ['Название'])
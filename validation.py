@@ -0,0 +1,111 @@
+import sqlite3
+from dataclasses import dataclass
+
+from query_builder import key_columns
+
+# Таблица найденных нарушений: по строке на каждое нарушение правила в дисциплине или в её семестре
+VALIDATION_TABLE = 'ValidationFinding'
+# Виды занятий семестра, из которых складываются его часы
+SEMESTER_PARTS = ('lek', 'lab', 'pr', 'krp', 'ip', 'sr', 'cons', 'patt')
+# Заголовки столбцов списка нарушений
+FINDING_HEADERS = ['Направление', 'Профиль', 'Год начала', 'Индекс дисциплины', 'Дисциплина', 'Семестр',
+                   'Нарушение', 'Ожидалось', 'Получено']
+# Объявленные типы столбцов списка нарушений для экспорта
+FINDING_TYPES = ['TEXT', 'TEXT', 'INTEGER', 'TEXT', 'TEXT', 'INTEGER', 'TEXT', 'INTEGER', 'INTEGER']
+
+
+def sum_expression(alias: str, columns: tuple[str, ...]) -> str:
+    """Сумма столбцов, в которой пустые значения считаются нулём"""
+    return ' + '.join(f'COALESCE({alias}.{column}, 0)' for column in columns)
+
+
+def any_expression(alias: str, columns: tuple[str, ...]) -> str:
+    """Условие 'заполнен хотя бы один из столбцов': строки без разбивки по видам часов не проверяются"""
+    return f"COALESCE({', '.join(f'{alias}.{column}' for column in columns)}) IS NOT NULL"
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """
+    Правило проверки часов. sql выбирает одним запросом все нарушения в дисциплинах, отобранных
+    условием {condition} по таблице Discipline D: id плана, id дисциплины, номер семестра
+    (NULL для правил по всей дисциплине), ожидаемое и фактическое значение
+    """
+    name: str
+    title: str
+    sql: str
+
+
+RULES = (
+    ValidationRule('semester_total', 'Сумма часов по семестрам не равна часам по плану', '''
+        SELECT D.plan_id, D.id, NULL, D.total_hours_plan, SUM(S.total)
+        FROM Discipline D
+             JOIN Semester S ON S.discipline_id = D.id
+        WHERE {condition}
+        GROUP BY D.id
+        HAVING D.total_hours_plan IS NOT NULL AND SUM(S.total) != D.total_hours_plan'''),
+    ValidationRule('semester_parts', 'Сумма часов по видам занятий не равна часам семестра', f'''
+        SELECT D.plan_id, D.id, S.num, S.total, {sum_expression('S', SEMESTER_PARTS)}
+        FROM Discipline D
+             JOIN Semester S ON S.discipline_id = D.id
+        WHERE {{condition}} AND S.total IS NOT NULL AND {any_expression('S', SEMESTER_PARTS)}
+              AND S.total != {sum_expression('S', SEMESTER_PARTS)}'''),
+)
+RULE_NAMES = tuple(rule.name for rule in RULES)
+
+
+def check_disciplines(cursor: sqlite3.Cursor, condition: str, params: list):
+    """
+    Проверяет все правила для дисциплин, отобранных условием condition, и записывает их нарушения
+    вместо прежних. Каждое правило - один запрос INSERT ... SELECT по всем выбранным дисциплинам сразу
+    """
+    cursor.execute(f'DELETE FROM {VALIDATION_TABLE} WHERE discipline_id IN '
+                   f'(SELECT D.id FROM Discipline D WHERE {condition})', params)
+    for rule in RULES:
+        cursor.execute(f'''
+            INSERT INTO {VALIDATION_TABLE} (plan_id, discipline_id, semester_num, expected, actual, rule)
+            SELECT *, ? FROM ({rule.sql.format(condition=condition)})
+        ''', [rule.name, *params])
+
+
+def build_findings_query(rule: str | None = None, limit: int | None = None,
+                         keys: bool = False) -> tuple[str, list]:
+    """
+    Запрос списка нарушений по столбцам FINDING_HEADERS, упорядоченного по планам и дисциплинам.
+    rule - имя правила из RULE_NAMES, None - все правила. limit - максимальное количество строк,
+    None - без ограничения (для постраничного чтения моделью таблицы). keys - добавить ключ строки
+    в том же порядке, что и сортировка, для постраничного чтения
+    """
+    titles = ' '.join('WHEN ? THEN ?' for _ in RULES)
+    params: list = [value for item in RULES for value in (item.name, item.title)]
+    # Нарушения правил по всей дисциплине идут перед нарушениями по её семестрам
+    order = ('F.plan_id', 'F.discipline_id', 'COALESCE(F.semester_num, 0)', 'F.rowid')
+    key = f', {key_columns(order)}' if keys else ''
+    sql = f'''
+    SELECT P.name, P.profile, P.start_year, D.ind, D.name, F.semester_num,
+           CASE F.rule {titles} ELSE F.rule END, F.expected, F.actual{key}
+    FROM {VALIDATION_TABLE} F
+         JOIN Discipline D ON D.id = F.discipline_id
+         JOIN Plan P ON P.id = F.plan_id'''
+    if rule is not None:
+        sql += '\n    WHERE F.rule = ?'
+        params.append(rule)
+    sql += f"\n    ORDER BY {', '.join(order)}"
+    if limit is not None:
+        sql += '\n    LIMIT ?'
+        params.append(limit)
+    return sql, params
+
+
+def summarize_findings(conn: sqlite3.Connection) -> list[tuple[ValidationRule, int, int]]:
+    """Количество нарушений и планов с нарушениями по каждому правилу"""
+    counts = {name: (findings, plans) for name, findings, plans in conn.execute(f'''
+        SELECT rule, COUNT(*), COUNT(DISTINCT plan_id) FROM {VALIDATION_TABLE} GROUP BY rule
+    ''')}
+    return [(rule, *counts.get(rule.name, (0, 0))) for rule in RULES]
+
+
+def count_findings(conn: sqlite3.Connection, rule: str | None = None) -> tuple[int, int]:
+    """Количество нарушений правила rule (None - всех правил) и количество планов, в которых они есть"""
+    where, params = ('WHERE rule = ?', [rule]) if rule is not None else ('', [])
+    return conn.execute(f'SELECT COUNT(*), COUNT(DISTINCT plan_id) FROM {VALIDATION_TABLE} {where}', params).fetchone()